@@ -3,17 +3,45 @@
 FastAPI server that wraps calculator.py CLI script.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
-import subprocess
+import numpy as np
+import os
 import sys
-from typing import Literal
+from pathlib import Path
+from typing import List, Literal, Union
+
+from calculator import calculate_batch
+
+# The shared prefork worker pool lives in the repository's worker-pool/ directory
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR.parent / "worker-pool"))
+from worker_pool import WorkerCrashed, WorkerError, WorkerPool
+
+# Preforked workers with calculator.py already imported; each keeps the CLI's
+# process isolation without paying interpreter startup per request
+calculator_pool = WorkerPool(
+    "calculator:calculate",
+    size=int(os.environ.get("CALCULATOR_POOL_SIZE", "2")),
+    max_jobs=int(os.environ.get("CALCULATOR_POOL_MAX_JOBS", "1000")),
+    cwd=SCRIPT_DIR,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prefork the calculator workers at startup and stop them at shutdown."""
+    calculator_pool.start()
+    yield
+    calculator_pool.close()
 
 
 app = FastAPI(
     title="Calculator API",
     description="A simple calculator API that wraps a CLI script",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -35,6 +63,22 @@ class CalculationResponse(BaseModel):
     param2: float
 
 
+class BatchCalculationRequest(BaseModel):
+    """Request model for the batch calculation endpoint."""
+    operation: Union[Literal["add", "multiply"], List[Literal["add", "multiply"]]] = Field(
+        ...,
+        description="One operation for all elements, or one operation per element"
+    )
+    param1: Union[float, List[float]] = Field(..., description="First operand(s)")
+    param2: Union[float, List[float]] = Field(..., description="Second operand(s)")
+
+
+class BatchCalculationResponse(BaseModel):
+    """Response model for the batch calculation endpoint."""
+    results: List[float]
+    count: int
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
@@ -49,6 +93,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/calculate": "POST - Perform addition or multiplication",
+            "/calculate/batch": "POST - Evaluate arrays of operations in one request",
             "/health": "GET - Health check"
         }
     }
@@ -63,7 +108,7 @@ async def health_check():
 @app.post("/calculate", response_model=CalculationResponse)
 async def calculate(request: CalculationRequest):
     """
-    Perform a calculation using the CLI calculator script.
+    Perform a calculation in a preforked calculator worker.
     
     Args:
         request: CalculationRequest with operation, param1, and param2
@@ -75,57 +120,66 @@ async def calculate(request: CalculationRequest):
         HTTPException: If the calculation fails
     """
     try:
-        # Call the calculator.py script
-        result = subprocess.run(
-            [
-                sys.executable,
-                'calculator.py',
-                request.operation,
-                str(request.param1),
-                str(request.param2)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False
+        calculation_result = await calculator_pool.acall(
+            request.operation,
+            request.param1,
+            request.param2,
+            timeout=5
         )
-        
-        # Check if the process succeeded
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else "Unknown error"
-            raise HTTPException(
-                status_code=400,
-                detail=f"Calculator error: {error_message}"
-            )
-        
-        # Parse the result
-        try:
-            calculation_result = float(result.stdout.strip())
-        except ValueError:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Invalid output from calculator: {result.stdout}"
-            )
-        
-        return CalculationResponse(
-            result=calculation_result,
-            operation=request.operation,
-            param1=request.param1,
-            param2=request.param2
+    except WorkerCrashed as e:
+        detail = "Calculator process timed out" if e.error_type == "TimeoutError" else f"Calculator process failed: {e}"
+        raise HTTPException(
+            status_code=500,
+            detail=detail
+        )
+    except WorkerError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Calculator error: {e}"
         )
+    
+    return CalculationResponse(
+        result=calculation_result,
+        operation=request.operation,
+        param1=request.param1,
+        param2=request.param2
+    )
+
+
+@app.post("/calculate/batch", response_model=BatchCalculationResponse)
+def calculate_batch_endpoint(request: BatchCalculationRequest):
+    """
+    Evaluate many calculations in-process with NumPy broadcasting.
+    
+    Scalars broadcast against arrays, and arrays must have equal lengths.
+    Declared as a plain function so FastAPI runs it in its threadpool and a
+    large batch does not block the event loop for other requests.
+    
+    Args:
+        request: BatchCalculationRequest with operation(s), param1 and param2
+        
+    Returns:
+        BatchCalculationResponse with one result per element
         
-    except subprocess.TimeoutExpired:
+    Raises:
+        HTTPException: If the operands cannot be broadcast or a result overflows
+    """
+    try:
+        results = calculate_batch(request.operation, request.param1, request.param2)
+    except ValueError as e:
         raise HTTPException(
-            status_code=500,
-            detail="Calculator process timed out"
+            status_code=400,
+            detail=f"Calculator error: {e}"
         )
-    except HTTPException:
-        raise
-    except Exception as e:
+    
+    if not np.isfinite(results).all():
         raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
+            status_code=400,
+            detail="Calculator error: result out of floating point range"
         )
+    
+    results = results.tolist()
+    return BatchCalculationResponse(results=results, count=len(results))
 
 
 if __name__ == "__main__":
@@ -17,6 +17,86 @@ def multiply(a, b):
     return a * b
 
 
+# Operations available to the CLI and to batch evaluation
+OPERATIONS = {
+    'add': add,
+    'multiply': multiply,
+}
+
+
+def calculate(operation, param1, param2):
+    """
+    Perform one calculation, as the CLI does.
+    
+    Args:
+        operation: 'add' or 'multiply'
+        param1: First number
+        param2: Second number
+    
+    Returns:
+        float: The result
+    
+    Raises:
+        ValueError: If the operation is unknown or an operand is not numeric
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Invalid operation '{operation}'")
+    return OPERATIONS[operation](float(param1), float(param2))
+
+
+def calculate_batch(operation, param1, param2):
+    """
+    Evaluate many calculations at once with NumPy broadcasting.
+    
+    Each argument may be a scalar or an array; they are broadcast against each
+    other, so e.g. one operation with two equal-length arrays, or an array of
+    operations with a scalar second operand, both work.
+    
+    Args:
+        operation: 'add', 'multiply', or an array of them (element-wise)
+        param1: Number or array of numbers
+        param2: Number or array of numbers
+    
+    Returns:
+        1-D numpy.ndarray of float64 results (one element when every argument
+        is a scalar; overflow yields inf rather than a warning)
+    
+    Raises:
+        ValueError: If an operation is unknown, an operand is not numeric or
+            not one-dimensional, or the shapes cannot be broadcast together
+    """
+    # Imported here so the single-calculation CLI does not pay for NumPy
+    import numpy as np
+    
+    try:
+        a = np.atleast_1d(np.asarray(param1, dtype=np.float64))
+        b = np.atleast_1d(np.asarray(param2, dtype=np.float64))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Operands must be numbers or arrays of numbers ({e})")
+    if a.ndim > 1 or b.ndim > 1 or np.ndim(operation) > 1:
+        raise ValueError("Operands must be numbers or one-dimensional arrays")
+    
+    if isinstance(operation, str):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Invalid operation '{operation}'")
+        with np.errstate(over='ignore'):
+            return np.asarray(OPERATIONS[operation](a, b), dtype=np.float64)
+    
+    ops, a, b = np.broadcast_arrays(np.asarray(operation), a, b)
+    masks = {name: ops == name for name in OPERATIONS}
+    known = np.logical_or.reduce(list(masks.values()))
+    if not known.all():
+        unknown = np.unique(ops[~known]).tolist()
+        raise ValueError(f"Invalid operation(s): {', '.join(map(str, unknown))}")
+    
+    result = np.empty(ops.shape, dtype=np.float64)
+    with np.errstate(over='ignore'):
+        for name, mask in masks.items():
+            if mask.any():
+                result[mask] = OPERATIONS[name](a[mask], b[mask])
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Simple calculator that adds or multiplies two numbers'
@@ -40,13 +120,7 @@ def main():
     try:
         args = parser.parse_args()
         
-        if args.operation == 'add':
-            result = add(args.param1, args.param2)
-        elif args.operation == 'multiply':
-            result = multiply(args.param1, args.param2)
-        else:
-            print(f"Error: Invalid operation '{args.operation}'", file=sys.stderr)
-            sys.exit(1)
+        result = calculate(args.operation, args.param1, args.param2)
         
         print(result)
         sys.exit(0)
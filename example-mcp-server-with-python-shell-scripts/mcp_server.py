@@ -14,17 +14,33 @@ if sys.version_info < (3, 10):
     sys.exit(1)
 
 import asyncio
-import subprocess
+import json
+import os
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from calculator import calculate_batch
+
 # Get the directory where this script is located
-SCRIPT_DIR = Path(__file__).parent
-CALCULATOR_PATH = SCRIPT_DIR / "calculator.py"
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# The shared prefork worker pool lives in the repository's worker-pool/ directory
+sys.path.insert(0, str(SCRIPT_DIR.parent / "worker-pool"))
+from worker_pool import WorkerCrashed, WorkerError, WorkerPool
+
+# Preforked workers with calculator.py already imported, reused across tool calls
+calculator_pool = WorkerPool(
+    "calculator:calculate",
+    size=int(os.environ.get("CALCULATOR_POOL_SIZE", "2")),
+    max_jobs=int(os.environ.get("CALCULATOR_POOL_MAX_JOBS", "1000")),
+    cwd=SCRIPT_DIR,
+)
 
 
 # Create an MCP server
@@ -64,6 +80,42 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["operation", "param1", "param2"]
             }
+        ),
+        Tool(
+            name="calculator_batch",
+            description=(
+                "Evaluates many additions and/or multiplications in one call. Each argument "
+                "may be a single value or an array; scalars are broadcast against arrays, and "
+                "arrays must have equal lengths. Returns the array of results. Use this "
+                "instead of calling calculator repeatedly."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operation": {
+                        "description": "'add' or 'multiply' for every element, or an array with one operation per element",
+                        "oneOf": [
+                            {"type": "string", "enum": ["add", "multiply"]},
+                            {"type": "array", "items": {"type": "string", "enum": ["add", "multiply"]}}
+                        ]
+                    },
+                    "param1": {
+                        "description": "First operand(s)",
+                        "oneOf": [
+                            {"type": "number"},
+                            {"type": "array", "items": {"type": "number"}}
+                        ]
+                    },
+                    "param2": {
+                        "description": "Second operand(s)",
+                        "oneOf": [
+                            {"type": "number"},
+                            {"type": "array", "items": {"type": "number"}}
+                        ]
+                    }
+                },
+                "required": ["operation", "param1", "param2"]
+            }
         )
     ]
 
@@ -80,6 +132,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     Returns:
         List of TextContent with the result
     """
+    if name == "calculator_batch":
+        return calculator_batch(arguments)
     if name != "calculator":
         raise ValueError(f"Unknown tool: {name}")
     
@@ -101,53 +155,28 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         raise ValueError(f"param2 must be a number, got {type(param2).__name__}")
     
     try:
-        # Call the calculator CLI script
-        result = subprocess.run(
-            [
-                sys.executable,
-                str(CALCULATOR_PATH),
-                operation,
-                str(param1),
-                str(param2)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False
-        )
-        
-        # Check if the process succeeded
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else "Unknown error"
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Error: {error_message}"
-                )
-            ]
-        
-        # Parse and return the result
-        try:
-            calculation_result = float(result.stdout.strip())
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Result: {calculation_result}\n\nOperation: {operation}({param1}, {param2}) = {calculation_result}"
-                )
-            ]
-        except ValueError:
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Error: Invalid output from calculator: {result.stdout}"
-                )
-            ]
-            
-    except subprocess.TimeoutExpired:
+        # Run the calculation in a preforked calculator worker
+        calculation_result = await calculator_pool.acall(operation, param1, param2, timeout=5)
+        return [
+            TextContent(
+                type="text",
+                text=f"Result: {calculation_result}\n\nOperation: {operation}({param1}, {param2}) = {calculation_result}"
+            )
+        ]
+    
+    except WorkerCrashed as e:
+        message = "Calculator process timed out" if e.error_type == "TimeoutError" else f"Calculator process failed: {e}"
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: {message}"
+            )
+        ]
+    except WorkerError as e:
         return [
             TextContent(
                 type="text",
-                text="Error: Calculator process timed out"
+                text=f"Error: {e}"
             )
         ]
     except Exception as e:
@@ -159,14 +188,62 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         ]
 
 
+def calculator_batch(arguments: Any) -> list[TextContent]:
+    """
+    Evaluate arrays of calculations in-process with NumPy broadcasting.
+    
+    Args:
+        arguments: Dictionary with operation(s), param1 and param2
+        
+    Returns:
+        List of TextContent with the results as a JSON array
+    """
+    if not isinstance(arguments, dict):
+        raise ValueError("Arguments must be a dictionary")
+    
+    for key in ("operation", "param1", "param2"):
+        if key not in arguments:
+            raise ValueError(f"{key} parameter is required")
+    
+    try:
+        results = calculate_batch(arguments["operation"], arguments["param1"], arguments["param2"])
+    except ValueError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: {e}"
+            )
+        ]
+    
+    if not np.isfinite(results).all():
+        return [
+            TextContent(
+                type="text",
+                text="Error: Result out of floating point range"
+            )
+        ]
+    
+    results = results.tolist()
+    return [
+        TextContent(
+            type="text",
+            text=f"Results ({len(results)} calculations):\n{json.dumps(results)}"
+        )
+    ]
+
+
 async def main():
     """Main entry point for the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    calculator_pool.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        calculator_pool.close()
 
 
 if __name__ == "__main__":
@@ -58,6 +58,39 @@ def test_error_case(name, operation, param1, param2):
         return False
 
 
+def batch_tests():
+    """
+    Exercise calculate_batch in-process.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from calculator import calculate_batch
+
+    results = [
+        ("Batch add with scalar broadcast",
+         calculate_batch("add", [1, 2, 3], 10).tolist() == [11.0, 12.0, 13.0]),
+        ("Batch mixed operations",
+         calculate_batch(["add", "multiply", "add"], [1, 2, 3], [4, 5, 6]).tolist() == [5.0, 10.0, 9.0]),
+        ("Batch scalars give one result",
+         calculate_batch("multiply", 3, 4).tolist() == [12.0]),
+    ]
+
+    for name, args in [
+        ("Batch invalid operation rejected", (["add", "divide"], [1, 2], [3, 4])),
+        ("Batch length mismatch rejected", ("add", [1, 2], [1, 2, 3])),
+        ("Batch non-numeric operand rejected", ("add", [1, "x"], 2)),
+        ("Batch nested operands rejected", ("add", [[1, 2]], [[3, 4]])),
+    ]:
+        try:
+            calculate_batch(*args)
+            results.append((name, False))
+        except ValueError:
+            results.append((name, True))
+
+    return results
+
+
 def main():
     print("=" * 60)
     print("Testing calculator.py")
@@ -120,6 +153,19 @@ def main():
         else:
             failed += 1
     
+    print()
+    
+    # Batch tests
+    print("Batch Tests:")
+    print("-" * 60)
+    for name, check in batch_tests():
+        if check:
+            print(f"✅ {name}: PASSED")
+            passed += 1
+        else:
+            print(f"❌ {name}: FAILED")
+            failed += 1
+    
     print()
     print("=" * 60)
     print(f"Results: {passed} passed, {failed} failed")
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the calculator, sales and telecom servers.
+
+Drives one app through one transport at a fixed concurrency and reports
+latency percentiles, throughput, and the CPU time and peak RSS of both the
+harness (client) and every process it started (server):
+
+    http       FastAPI app under uvicorn, started on a free local port
+    mcp        MCP server over stdio, one session shared by all clients
+    cli        A fresh `python script.py ...` process per request
+    inprocess  The script's function called directly in the harness
+
+Usage:
+    python benchmark.py run calculator --transport http --requests 2000 --concurrency 16
+    python benchmark.py run telecom-predict --transport mcp --requests 4 \\
+        --env TELECOM_PREDICTOR_WORKER_MODE=subprocess --env TELECOM_RESULT_CACHE_MAX_MB=0
+    python benchmark.py compare results/*.json
+
+Server CPU and RSS are read from /proc, so they are only reported on Linux.
+"""
+
+import argparse
+import asyncio
+import functools
+import importlib
+import itertools
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+
+
+def calculator_params(i):
+    return {"operation": ("add", "multiply")[i % 2], "param1": i, "param2": 2}
+
+
+def sales_params(i):
+    # Cycles through January 2023 - December 2024, which sales_data.csv covers
+    offset = i % 24
+    return {"month": MONTHS[offset % 12], "year": str(2023 + offset // 12)}
+
+
+# Each transport entry maps request parameters to what that transport sends:
+#   http: (method, path, httpx keyword arguments)
+#   mcp: (tool name, arguments)
+#   cli: script arguments
+#   inprocess: ("module:function", positional arguments)
+SCENARIOS = {
+    "calculator": {
+        "project": "example-mcp-server-with-python-shell-scripts",
+        "params": calculator_params,
+        "http": lambda p: ("POST", "/calculate", {"json": p}),
+        "mcp": lambda p: ("calculator", p),
+        "cli": lambda p: ["calculator.py", p["operation"], str(p["param1"]), str(p["param2"])],
+        "inprocess": lambda p: ("calculator:calculate", [p["operation"], p["param1"], p["param2"]]),
+    },
+    "sales": {
+        "project": "sales-monthly-data-mcp-server",
+        "params": sales_params,
+        "http": lambda p: ("GET", "/sales", {"params": p}),
+        "mcp": lambda p: ("sales_data", p),
+        "cli": lambda p: ["sales_data.py", p["month"], p["year"]],
+        "inprocess": lambda p: ("sales_data:get_sales_data", [p["month"], p["year"]]),
+    },
+    "telecom-predict": {
+        "project": "telecom-sales-predictor-mcp-server",
+        "params": lambda i: {"include_stats": True},
+        "mcp": lambda p: ("predict_december_2025", p),
+    },
+    "telecom-analyze": {
+        "project": "telecom-sales-predictor-mcp-server",
+        "params": lambda i: {"include_stats": True},
+        "mcp": lambda p: ("analyze_hybrid_model", p),
+    },
+}
+TRANSPORTS = ["http", "mcp", "cli", "inprocess"]
+
+
+def percentile(sorted_values, pct):
+    """
+    Linearly interpolated percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float, or None for an empty list
+    """
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize_latencies(latencies):
+    """Return min/mean/p50/p95/p99/max of latencies given in seconds, in milliseconds."""
+    values = sorted(latency * 1000 for latency in latencies)
+    if not values:
+        return {key: None for key in ("min", "mean", "p50", "p95", "p99", "max")}
+    return {
+        "min": values[0],
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+class ProcessTreeSampler:
+    """
+    Samples CPU time and RSS of all descendants of this process from /proc.
+
+    CPU time of a descendant includes the children it has already reaped, so
+    workers that a server recycles during the run are still counted.
+    """
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.available = os.path.isdir("/proc") and hasattr(os, "sysconf")
+        self.peak_rss = 0
+        self._baseline = {}
+        self._stop = threading.Event()
+        self._thread = None
+        if self.available:
+            self._ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _read(self, pid):
+        with open(f"/proc/{pid}/stat") as f:
+            data = f.read()
+        # The command name may contain spaces, so split after its closing paren
+        fields = data[data.rindex(")") + 2:].split()
+        cpu_ticks = sum(int(value) for value in fields[11:15])
+        return int(fields[1]), cpu_ticks / self._ticks, int(fields[21]) * self._page_size
+
+    def sample(self):
+        """
+        Returns:
+            dict: pid -> (cpu_seconds, rss_bytes) for every live descendant
+        """
+        stats = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    stats[int(entry)] = self._read(entry)
+                except (OSError, ValueError, IndexError):
+                    continue
+
+        children = {}
+        for pid, (ppid, _, _) in stats.items():
+            children.setdefault(ppid, []).append(pid)
+        descendants = {}
+        pending = list(children.get(os.getpid(), []))
+        while pending:
+            pid = pending.pop()
+            descendants[pid] = stats[pid][1:]
+            pending.extend(children.get(pid, []))
+        return descendants
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = sum(rss for _, rss in self.sample().values())
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def start(self):
+        if not self.available:
+            return
+        self._baseline = self.sample()
+        self.peak_rss = sum(rss for _, rss in self._baseline.values())
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Returns:
+            tuple: (cpu_seconds used by descendants since start(), peak RSS bytes),
+            or (None, None) without /proc
+        """
+        if not self.available:
+            return None, None
+        self._stop.set()
+        self._thread.join()
+        final = self.sample()
+        cpu = sum(cpu - self._baseline.get(pid, (0, 0))[0] for pid, (cpu, _) in final.items())
+        self.peak_rss = max(self.peak_rss, sum(rss for _, rss in final.values()))
+        return cpu, self.peak_rss
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def http_transport(scenario, project_dir, env, args):
+    """Start the project's FastAPI app under uvicorn (unless --url is given) and yield a call function."""
+    import httpx
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api_server:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=project_dir, env=env,
+        )
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    await client.get("/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or (process and process.poll() is not None):
+                        raise RuntimeError(f"Server at {base_url} did not start")
+                    await asyncio.sleep(0.1)
+
+            async def call(params):
+                method, path, kwargs = scenario["http"](params)
+                response = await client.request(method, path, **kwargs)
+                if response.status_code >= 400:
+                    raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+            yield call
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def tool_error(result):
+    """
+    Return the error text of an MCP tool result, or None if the call succeeded.
+
+    The servers report most failures as text starting with "Error" without
+    setting isError, so the text is checked as well.
+    """
+    texts = [getattr(item, "text", "") for item in result.content]
+    if result.isError or (texts and texts[0].lstrip().startswith("Error")):
+        return " ".join(texts)
+    return None
+
+
+@asynccontextmanager
+async def mcp_transport(scenario, project_dir, env, args):
+    """Start the project's MCP server over stdio and yield a call function."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    server = StdioServerParameters(
+        command=sys.executable, args=["mcp_server.py"], cwd=str(project_dir), env=env
+    )
+    with open(os.devnull, "w") as devnull:
+        errlog = sys.stderr if args.verbose else devnull
+        async with stdio_client(server, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def call(params):
+                    tool, arguments = scenario["mcp"](params)
+                    result = await session.call_tool(
+                        tool, arguments, read_timeout_seconds=timedelta(seconds=args.timeout)
+                    )
+                    error = tool_error(result)
+                    if error is not None:
+                        raise RuntimeError(f"Tool error: {error[:200]}")
+
+                yield call
+
+
+@asynccontextmanager
+async def cli_transport(scenario, project_dir, env, args):
+    """Yield a call function that runs the project's CLI script in a new process per request."""
+
+    async def call(params):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, *scenario["cli"](params),
+            cwd=project_dir, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=args.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"Exit code {process.returncode}: {stderr.decode()[:200]}")
+
+    yield call
+
+
+@asynccontextmanager
+async def inprocess_transport(scenario, project_dir, env, args):
+    """Yield a call function that runs the script's function in this process, on a thread pool."""
+    sys.path.insert(0, str(project_dir))
+    os.environ.update(env)
+    loop = asyncio.get_running_loop()
+
+    async def call(params):
+        target, call_args = scenario["inprocess"](params)
+        module_name, _, function_name = target.partition(":")
+        function = getattr(importlib.import_module(module_name), function_name)
+        await loop.run_in_executor(None, functools.partial(function, *call_args))
+
+    yield call
+
+
+TRANSPORT_FACTORIES = {
+    "http": http_transport,
+    "mcp": mcp_transport,
+    "cli": cli_transport,
+    "inprocess": inprocess_transport,
+}
+
+
+async def run_load(call, params, requests, concurrency, timeout):
+    """
+    Issue requests from `concurrency` concurrent clients until `requests` have completed.
+
+    Returns:
+        tuple: (latencies in seconds of successful requests, error messages)
+    """
+    latencies = []
+    errors = []
+    counter = itertools.count()
+
+    async def client():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(call(params(i)), timeout=timeout)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def client_peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds(who):
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def benchmark(args):
+    """
+    Run one benchmark as described by the parsed command-line arguments.
+
+    Returns:
+        dict: JSON-serializable results
+    """
+    scenario = SCENARIOS[args.scenario]
+    if args.transport not in scenario:
+        raise ValueError(f"Scenario '{args.scenario}' does not support the {args.transport} transport")
+    project_dir = REPO_DIR / scenario["project"]
+    overrides = dict(item.split("=", 1) for item in args.env)
+    env = {**os.environ, **overrides}
+
+    async with TRANSPORT_FACTORIES[args.transport](scenario, project_dir, env, args) as call:
+        # Warm-up requests load modules, indexes and models before measuring
+        _, warmup_errors = await run_load(call, scenario["params"], args.warmup, 1, args.timeout)
+        if warmup_errors:
+            raise RuntimeError(f"Warm-up failed: {warmup_errors[0]}")
+
+        sampler = ProcessTreeSampler()
+        sampler.start()
+        client_cpu_start = cpu_seconds(resource.RUSAGE_SELF)
+        reaped_cpu_start = cpu_seconds(resource.RUSAGE_CHILDREN)
+        wall_start = time.perf_counter()
+
+        latencies, errors = await run_load(
+            call, scenario["params"], args.requests, args.concurrency, args.timeout
+        )
+
+        wall = time.perf_counter() - wall_start
+        client_cpu = cpu_seconds(resource.RUSAGE_SELF) - client_cpu_start
+        server_cpu, server_rss = sampler.stop()
+
+    # Processes started and reaped by the harness itself (the cli transport)
+    reaped_cpu = cpu_seconds(resource.RUSAGE_CHILDREN) - reaped_cpu_start
+    if server_cpu is not None:
+        server_cpu += reaped_cpu
+    total_cpu = client_cpu + (server_cpu or 0)
+
+    return {
+        "scenario": args.scenario,
+        "transport": args.transport,
+        "label": args.label,
+        "env": overrides,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall else None,
+        "latency_ms": summarize_latencies(latencies),
+        "cpu": {
+            "client_seconds": client_cpu,
+            "server_seconds": server_cpu,
+            "utilization_pct": total_cpu / wall * 100 if wall else None,
+        },
+        "memory": {
+            "client_peak_rss_mb": client_peak_rss_bytes() / (1024 * 1024),
+            "server_peak_rss_mb": server_rss / (1024 * 1024) if server_rss is not None else None,
+        },
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _fmt(value, spec=".2f"):
+    return "-" if value is None else format(value, spec)
+
+
+def format_table(results):
+    """Render results as a fixed-width comparison table."""
+    header = (f"{'scenario':<16} {'transport':<10} {'label':<14} {'conc':>5} {'ok':>7} {'err':>5} "
+              f"{'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'cpu %':>7} {'srv MB':>8}")
+    lines = [header, "-" * len(header)]
+    for result in results:
+        latency = result["latency_ms"]
+        lines.append(
+            f"{result['scenario']:<16} {result['transport']:<10} {(result.get('label') or '-'):<14} "
+            f"{result['concurrency']:>5} {result['ok']:>7} {result['errors']:>5} "
+            f"{_fmt(result['throughput_rps'], '.1f'):>9} {_fmt(latency['p50']):>9} "
+            f"{_fmt(latency['p95']):>9} {_fmt(latency['p99']):>9} "
+            f"{_fmt(result['cpu']['utilization_pct'], '.0f'):>7} "
+            f"{_fmt(result['memory']['server_peak_rss_mb'], '.1f'):>8}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(path, payload):
+    """Write JSON atomically so an interrupted run never leaves a truncated results file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2) + "\n")
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the repository's MCP and FastAPI servers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run one benchmark")
+    run.add_argument("scenario", choices=sorted(SCENARIOS))
+    run.add_argument("--transport", choices=TRANSPORTS, default="http")
+    run.add_argument("--requests", type=int, default=200, help="Measured requests (default: 200)")
+    run.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default: 8)")
+    run.add_argument("--warmup", type=int, default=5, help="Unmeasured requests sent first (default: 5)")
+    run.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds (default: 120)")
+    run.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                     help="Environment variable for the server (repeatable), e.g. CALCULATOR_POOL_SIZE=4")
+    run.add_argument("--url", help="Benchmark an already running HTTP server instead of starting one")
+    run.add_argument("--label", help="Free-form name for this configuration in the results")
+    run.add_argument("--output", help="Write the results as JSON to this file")
+    run.add_argument("--verbose", action="store_true", help="Show MCP server stderr")
+
+    compare = commands.add_parser("compare", help="Print a table comparing JSON result files")
+    compare.add_argument("files", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        results = [json.loads(Path(path).read_text()) for path in args.files]
+        print(format_table(results))
+        return 0
+
+    if args.requests < 1 or args.concurrency < 1 or args.warmup < 0:
+        parser.error("--requests and --concurrency must be positive and --warmup non-negative")
+    for item in args.env:
+        if "=" not in item:
+            parser.error(f"--env expects KEY=VALUE, got {item!r}")
+
+    try:
+        result = asyncio.run(benchmark(args))
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(format_table([result]))
+    if result["error_samples"]:
+        print("\nSample errors:")
+        for error in result["error_samples"]:
+            print(f"  {error}")
+    if args.output:
+        write_json(args.output, result)
+        print(f"\nResults written to {args.output}")
+    return 0 if result["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
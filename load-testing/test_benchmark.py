@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for benchmark.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmark import SCENARIOS, main, percentile, summarize_latencies, tool_error
+
+
+def check(name, passed, detail=""):
+    """Print a test result and return whether it passed."""
+    if passed:
+        print(f"✅ {name}: PASSED")
+    else:
+        print(f"❌ {name}: FAILED {detail}")
+    return passed
+
+
+def run_benchmark(tmp_dir, name, *args):
+    """Run benchmark.py in-process and return (exit code, parsed JSON results)."""
+    output = Path(tmp_dir) / f"{name}.json"
+    code = main(["run", *args, "--output", str(output)])
+    return code, json.loads(output.read_text()) if output.exists() else None
+
+
+def main_tests():
+    print("=" * 60)
+    print("Testing benchmark.py")
+    print("=" * 60)
+    print()
+
+    results = []
+
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    results.append(check("Median", percentile(values, 50) == 3.0))
+    results.append(check("Interpolated percentile", abs(percentile(values, 95) - 4.8) < 1e-9, percentile(values, 95)))
+    results.append(check("Empty percentile", percentile([], 99) is None))
+    summary = summarize_latencies([0.002, 0.001, 0.003])
+    results.append(check("Latencies reported in ms", summary["min"] == 1.0 and summary["max"] == 3.0, summary))
+
+    def tool_result(text, is_error=False):
+        return SimpleNamespace(isError=is_error, content=[SimpleNamespace(type="text", text=text)])
+
+    results.append(check("MCP success counted as success", tool_error(tool_result("Sales for January 2024: 100")) is None))
+    results.append(check("MCP isError counted as error", tool_error(tool_result("boom", is_error=True)) == "boom"))
+    results.append(check("MCP error text counted as error",
+                         tool_error(tool_result("Error: Sales data unavailable")) is not None))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        code, result = run_benchmark(tmp_dir, "inprocess", "calculator", "--transport", "inprocess",
+                                     "--requests", "50", "--concurrency", "4", "--label", "direct")
+        results.append(check("In-process run succeeds", code == 0 and result["ok"] == 50, result))
+        results.append(check("Percentiles ordered",
+                             result["latency_ms"]["p50"] <= result["latency_ms"]["p95"] <= result["latency_ms"]["p99"]))
+        results.append(check("Throughput reported", result["throughput_rps"] > 0))
+        results.append(check("Label recorded", result["label"] == "direct"))
+
+        code, result = run_benchmark(tmp_dir, "cli", "sales", "--transport", "cli",
+                                     "--requests", "4", "--concurrency", "2", "--warmup", "1")
+        results.append(check("Subprocess run succeeds", code == 0 and result["ok"] == 4, result))
+        if sys.platform.startswith("linux"):
+            results.append(check("Subprocess CPU attributed to server", result["cpu"]["server_seconds"] > 0,
+                                 result["cpu"]))
+
+        code, result = run_benchmark(tmp_dir, "unsupported", "telecom-predict", "--transport", "http")
+        results.append(check("Unsupported transport rejected", code == 1 and result is None))
+
+        code = main(["compare", str(Path(tmp_dir) / "inprocess.json"), str(Path(tmp_dir) / "cli.json")])
+        results.append(check("Compare table", code == 0))
+
+    results.append(check("Every scenario has a project and a transport",
+                         all("project" in s and any(t in s for t in ("http", "mcp", "cli", "inprocess"))
+                             for s in SCENARIOS.values())))
+
+    passed = sum(results)
+    failed = len(results) - passed
+    print()
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    if failed == 0:
+        print("✅ All tests passed!")
+        sys.exit(0)
+    else:
+        print(f"❌ {failed} test(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_tests()
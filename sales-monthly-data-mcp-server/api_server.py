@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 """
-FastAPI server that wraps sales_data.py CLI script.
+FastAPI server that serves sales data from the in-memory sales_data index.
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-import subprocess
-import sys
-from typing import Optional
+from typing import List, Optional
+import hashlib
+import os
+
+from sales_data import MAX_RANGE_MONTHS, SalesDataIndex, normalize_key
 
 
 app = FastAPI(
@@ -16,6 +19,13 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Parsed once and shared by all requests; reloaded when sales_data.csv changes
+sales_index = SalesDataIndex()
+
+# Seconds clients and proxies may reuse a GET response before revalidating it
+CACHE_MAX_AGE = int(os.environ.get("SALES_API_CACHE_MAX_AGE", "60"))
+CACHE_CONTROL = f"public, max-age={CACHE_MAX_AGE}"
+
 
 class SalesDataResponse(BaseModel):
     """Response model for sales data endpoint."""
@@ -24,12 +34,137 @@ class SalesDataResponse(BaseModel):
     sales: str
 
 
+class SalesPeriod(BaseModel):
+    """A month and year to look up."""
+    month: str
+    year: str
+
+
+class SalesSeriesItem(BaseModel):
+    """One month of a series; sales is null when there is no data."""
+    month: str
+    year: str
+    sales: Optional[str] = None
+
+
+class SalesSeriesResponse(BaseModel):
+    """Response model for batch and range queries."""
+    records: List[SalesSeriesItem]
+    found: int
+    missing: int
+
+
+class SalesBatchRequest(BaseModel):
+    """Request body for the batch endpoint."""
+    periods: List[SalesPeriod]
+
+
+class SalesTotal(BaseModel):
+    """A total over a span of months and how many of them have data."""
+    total: float
+    months: int
+    months_with_data: int
+
+
+class SalesAggregatesResponse(BaseModel):
+    """Response model for the aggregates endpoint."""
+    month: str
+    year: str
+    sales: Optional[float] = None
+    previous_year_sales: Optional[float] = None
+    yoy_growth_pct: Optional[float] = None
+    ytd: SalesTotal
+    previous_ytd: SalesTotal
+    ytd_growth_pct: Optional[float] = None
+    trailing: SalesTotal
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
     details: str = ""
 
 
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return True if an If-None-Match header lists the ETag (weak comparison, as RFC 9110 requires)."""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def not_modified_since(if_modified_since: str, mtime_ns: int) -> bool:
+    """Return True if the data file has not changed since an If-Modified-Since date."""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return since.tzinfo is not None and mtime_ns // 1_000_000_000 <= since.timestamp()
+
+
+def data_version():
+    """
+    Return the (mtime_ns, size) version of sales_data.csv.
+    
+    Endpoints read the version before looking anything up, so a response is
+    never labeled with a newer version than the data it was computed from.
+    
+    Raises:
+        HTTPException: If the data file cannot be read
+    """
+    try:
+        return sales_index.version()
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Sales data unavailable: {e}")
+
+
+def cache_validators(request: Request, response: Response, version) -> Optional[Response]:
+    """
+    Add caching headers to a response derived from sales_data.csv.
+    
+    Call this only once the request has been validated and the resource is
+    known to exist, so that If-None-Match: * or a recent If-Modified-Since
+    never turns a 400 or 404 into a 304. The ETag is a strong validator
+    computed from the data file's version and the request URL.
+    
+    Args:
+        request: The incoming request (URL and conditional headers)
+        response: The response whose headers receive ETag, Last-Modified and Cache-Control
+        version: (mtime_ns, size) from data_version(), read before the lookup
+    
+    Returns:
+        A 304 Not Modified response if the client's copy is current, otherwise None
+    """
+    mtime_ns, size = version
+    query = sorted(request.query_params.multi_items())
+    key = f"{app.version}|{request.url.path}|{query}|{mtime_ns}|{size}"
+    etag = '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime_ns / 1_000_000_000, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+    
+    # If-Modified-Since only applies when the client sent no If-None-Match
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        unchanged = etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        unchanged = if_modified_since is not None and not_modified_since(if_modified_since, mtime_ns)
+    if unchanged:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -38,6 +173,9 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/sales": "GET - Retrieve sales data by month and year",
+            "/sales/range": "GET - Retrieve every month from a start to an end period",
+            "/sales/batch": "POST - Retrieve sales data for a list of months",
+            "/sales/aggregates": "GET - Year-to-date, year-over-year and trailing totals for a month",
             "/health": "GET - Health check"
         }
     }
@@ -51,6 +189,8 @@ async def health_check():
 
 @app.get("/sales", response_model=SalesDataResponse)
 async def get_sales(
+    request: Request,
+    response: Response,
     month: str = Query(..., description="Month (e.g., January, February)"),
     year: str = Query(..., description="Year (e.g., 2023, 2024)")
 ):
@@ -62,61 +202,137 @@ async def get_sales(
         year: Year (e.g., 2023, 2024)
         
     Returns:
-        SalesDataResponse with the month, year, and sales data
+        SalesDataResponse with the month, year, and sales data, or 304 Not
+        Modified if the client's If-None-Match/If-Modified-Since is current
         
     Raises:
         HTTPException: If the sales data is not found or an error occurs
     """
+    version = data_version()
     try:
-        # Call the sales_data.py script
-        result = subprocess.run(
-            [
-                sys.executable,
-                'sales_data.py',
-                month,
-                year
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False
-        )
-        
-        # Check if the process succeeded
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else "Unknown error"
-            raise HTTPException(
-                status_code=400,
-                detail=f"Sales data error: {error_message}"
-            )
-        
-        # Parse the result
-        sales_data = result.stdout.strip()
-        
-        if sales_data == "No data exists":
-            raise HTTPException(
-                status_code=404,
-                detail=f"No sales data found for {month} {year}"
-            )
-        
-        return SalesDataResponse(
-            month=month.strip().capitalize(),
-            year=year.strip(),
-            sales=sales_data
-        )
-        
-    except subprocess.TimeoutExpired:
+        sales_data = sales_index.get(month, year)
+    except OSError as e:
         raise HTTPException(
             status_code=500,
-            detail="Sales data process timed out"
+            detail=f"Sales data unavailable: {e}"
         )
-    except HTTPException:
-        raise
-    except Exception as e:
+    
+    if sales_data is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
+            status_code=404,
+            detail=f"No sales data found for {month} {year}"
+        )
+    
+    not_modified = cache_validators(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    
+    month, year = normalize_key(month, year)
+    return SalesDataResponse(
+        month=month,
+        year=year,
+        sales=sales_data
+    )
+
+
+def series_response(results):
+    """Build a SalesSeriesResponse from (month, year, sales) tuples."""
+    records = [SalesSeriesItem(month=month, year=year, sales=sales) for month, year, sales in results]
+    found = sum(1 for record in records if record.sales is not None)
+    return SalesSeriesResponse(records=records, found=found, missing=len(records) - found)
+
+
+@app.get("/sales/range", response_model=SalesSeriesResponse)
+async def get_sales_range(
+    request: Request,
+    response: Response,
+    start_month: str = Query(..., description="First month (e.g., January)"),
+    start_year: str = Query(..., description="Year of the first month (e.g., 2024)"),
+    end_month: str = Query(..., description="Last month, inclusive (e.g., December)"),
+    end_year: str = Query(..., description="Year of the last month (e.g., 2024)")
+):
+    """
+    Retrieve sales data for every month from a start period to an end period.
+    
+    Returns:
+        SalesSeriesResponse with one record per month in calendar order, or
+        304 Not Modified if the client's copy is current
+        
+    Raises:
+        HTTPException: If the range is invalid or the data cannot be read
+    """
+    version = data_version()
+    try:
+        results = sales_index.get_range(start_month, start_year, end_month, end_year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Sales data unavailable: {e}")
+    
+    not_modified = cache_validators(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    
+    return series_response(results)
+
+
+@app.post("/sales/batch", response_model=SalesSeriesResponse)
+async def get_sales_batch(request: SalesBatchRequest):
+    """
+    Retrieve sales data for a list of months in one request.
+    
+    Returns:
+        SalesSeriesResponse with one record per requested month, in request order
+        
+    Raises:
+        HTTPException: If too many months are requested or the data cannot be read
+    """
+    if len(request.periods) > MAX_RANGE_MONTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_RANGE_MONTHS} periods per request"
         )
+    
+    try:
+        results = sales_index.get_many((period.month, period.year) for period in request.periods)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Sales data unavailable: {e}")
+    
+    return series_response(results)
+
+
+@app.get("/sales/aggregates", response_model=SalesAggregatesResponse)
+async def get_sales_aggregates(
+    request: Request,
+    response: Response,
+    month: str = Query(..., description="Month (e.g., January, February)"),
+    year: str = Query(..., description="Year (e.g., 2023, 2024)"),
+    window: int = Query(3, description="Trailing window length in months")
+):
+    """
+    Retrieve derived totals for a month, computed in constant time from prefix sums.
+    
+    Returns:
+        SalesAggregatesResponse with year-to-date totals (this year and last),
+        year-over-year growth and the trailing window total, or 304 Not
+        Modified if the client's copy is current
+        
+    Raises:
+        HTTPException: If the month, year or window is invalid or the data cannot be read
+    """
+    version = data_version()
+    try:
+        aggregates = sales_index.aggregates(month, year, window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Sales data unavailable: {e}")
+    
+    not_modified = cache_validators(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    
+    return SalesAggregatesResponse(**aggregates)
 
 
 if __name__ == "__main__":
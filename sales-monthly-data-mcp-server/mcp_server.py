@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-MCP Server that exposes sales_data.py as a tool for LLM clients.
+MCP Server that exposes the sales_data.py lookup as a tool for LLM clients.
 """
 
 import sys
@@ -14,7 +14,6 @@ if sys.version_info < (3, 10):
     sys.exit(1)
 
 import asyncio
-import subprocess
 from pathlib import Path
 from typing import Any
 
@@ -22,9 +21,14 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from sales_data import MAX_RANGE_MONTHS, SalesDataIndex
+
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
-SALES_DATA_PATH = SCRIPT_DIR / "sales_data.py"
+SALES_DATA_CSV = SCRIPT_DIR / "sales_data.csv"
+
+# Parsed once and shared by all tool calls; reloaded when the CSV changes
+sales_index = SalesDataIndex(SALES_DATA_CSV)
 
 
 # Create an MCP server
@@ -59,6 +63,76 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["month", "year"]
             }
+        ),
+        Tool(
+            name="sales_data_series",
+            description=(
+                "Retrieves monthly sales data for many months in one call. Either give a "
+                "start and end period (every month in between is returned, inclusive) or a "
+                "list of specific month/year periods. Use this for trends and comparisons "
+                "instead of calling sales_data once per month."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "start_month": {
+                        "type": "string",
+                        "description": "First month of the range (e.g., January)"
+                    },
+                    "start_year": {
+                        "type": "string",
+                        "description": "Year of the first month (e.g., 2024)"
+                    },
+                    "end_month": {
+                        "type": "string",
+                        "description": "Last month of the range, inclusive (e.g., December)"
+                    },
+                    "end_year": {
+                        "type": "string",
+                        "description": "Year of the last month (e.g., 2024)"
+                    },
+                    "periods": {
+                        "type": "array",
+                        "description": "Specific months to look up, instead of a range",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "month": {"type": "string"},
+                                "year": {"type": "string"}
+                            },
+                            "required": ["month", "year"]
+                        }
+                    }
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="sales_aggregates",
+            description=(
+                "Returns derived sales figures for a month in one call: year-to-date total, "
+                "the same period last year, year-over-year growth for the month and the year "
+                "to date, and a trailing N-month total. Each total says how many months had data."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "month": {
+                        "type": "string",
+                        "description": "The month (e.g., March)"
+                    },
+                    "year": {
+                        "type": "string",
+                        "description": "The year (e.g., 2024)"
+                    },
+                    "window": {
+                        "type": "integer",
+                        "description": "Trailing window length in months",
+                        "default": 3
+                    }
+                },
+                "required": ["month", "year"]
+            }
         )
     ]
 
@@ -75,6 +149,10 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     Returns:
         List of TextContent with the result
     """
+    if name == "sales_data_series":
+        return sales_data_series(arguments)
+    if name == "sales_aggregates":
+        return sales_aggregates(arguments)
     if name != "sales_data":
         raise ValueError(f"Unknown tool: {name}")
     
@@ -92,35 +170,10 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         raise ValueError("Year parameter is required")
     
     try:
-        # Call the sales_data.py script
-        result = subprocess.run(
-            [
-                sys.executable,
-                str(SALES_DATA_PATH),
-                month,
-                year
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False
-        )
-        
-        # Check if the process succeeded
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else "Unknown error"
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Error: {error_message}"
-                )
-            ]
-        
-        # Get the result
-        sales_data = result.stdout.strip()
+        sales_data = sales_index.get(month, year)
         
         # Format the response
-        if sales_data == "No data exists":
+        if sales_data is None:
             return [
                 TextContent(
                     type="text",
@@ -135,11 +188,11 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 )
             ]
             
-    except subprocess.TimeoutExpired:
+    except OSError as e:
         return [
             TextContent(
                 type="text",
-                text="Error: Sales data process timed out"
+                text=f"Error: Sales data unavailable: {e}"
             )
         ]
     except Exception as e:
@@ -151,6 +204,139 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         ]
 
 
+def sales_data_series(arguments: Any) -> list[TextContent]:
+    """
+    Look up a range or list of months and format them as one response.
+    
+    Args:
+        arguments: Either start_month/start_year/end_month/end_year or periods
+        
+    Returns:
+        List of TextContent with one line per month
+    """
+    if not isinstance(arguments, dict):
+        raise ValueError("Arguments must be a dictionary")
+    
+    periods = arguments.get("periods")
+    range_keys = ("start_month", "start_year", "end_month", "end_year")
+    
+    try:
+        if periods:
+            if not isinstance(periods, list) or not all(isinstance(period, dict) for period in periods):
+                raise ValueError('periods must be a list of {"month": ..., "year": ...} objects')
+            if len(periods) > MAX_RANGE_MONTHS:
+                raise ValueError(f"At most {MAX_RANGE_MONTHS} periods per request")
+            results = sales_index.get_many(
+                (str(period.get("month", "")), str(period.get("year", ""))) for period in periods
+            )
+        elif all(arguments.get(key) for key in range_keys):
+            results = sales_index.get_range(*(str(arguments[key]) for key in range_keys))
+        else:
+            raise ValueError(
+                "Provide start_month, start_year, end_month and end_year, or a list of periods"
+            )
+    except ValueError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: {e}"
+            )
+        ]
+    except OSError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: Sales data unavailable: {e}"
+            )
+        ]
+    
+    lines = []
+    for month, year, sales in results:
+        lines.append(f"{month} {year}: ${sales}" if sales is not None else f"{month} {year}: No data exists")
+    found = sum(1 for _, _, sales in results if sales is not None)
+    lines.append(f"\n{found} of {len(results)} months have sales data.")
+    
+    return [
+        TextContent(
+            type="text",
+            text="\n".join(lines)
+        )
+    ]
+
+
+def format_total(label: str, summary: dict) -> str:
+    """Format one aggregate total, noting months without data."""
+    text = f"{label}: ${summary['total']:,.2f}"
+    if summary["months_with_data"] < summary["months"]:
+        text += f" ({summary['months_with_data']} of {summary['months']} months have data)"
+    return text
+
+
+def sales_aggregates(arguments: Any) -> list[TextContent]:
+    """
+    Report year-to-date, year-over-year and trailing totals for a month.
+    
+    Args:
+        arguments: month, year and optional window
+        
+    Returns:
+        List of TextContent with the aggregates
+    """
+    if not isinstance(arguments, dict):
+        raise ValueError("Arguments must be a dictionary")
+    
+    month = arguments.get("month")
+    year = arguments.get("year")
+    if not month or not year:
+        raise ValueError("Month and year parameters are required")
+    
+    try:
+        try:
+            window = int(arguments.get("window", 3))
+        except (TypeError, ValueError):
+            raise ValueError(f"window must be a whole number of months, got {arguments.get('window')!r}")
+        result = sales_index.aggregates(str(month), str(year), window)
+    except ValueError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: {e}"
+            )
+        ]
+    except OSError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: Sales data unavailable: {e}"
+            )
+        ]
+    
+    period = f"{result['month']} {result['year']}"
+    previous_year = int(result["year"]) - 1
+    lines = []
+    if result["sales"] is not None:
+        lines.append(f"Sales for {period}: ${result['sales']:,.2f}")
+    else:
+        lines.append(f"No sales data exists for {period}.")
+    if result["yoy_growth_pct"] is not None:
+        lines.append(
+            f"Year-over-year vs {result['month']} {previous_year} "
+            f"(${result['previous_year_sales']:,.2f}): {result['yoy_growth_pct']:+.2f}%"
+        )
+    lines.append(format_total(f"Year to date {result['year']}", result["ytd"]))
+    lines.append(format_total(f"Same period {previous_year}", result["previous_ytd"]))
+    if result["ytd_growth_pct"] is not None:
+        lines.append(f"Year-to-date growth: {result['ytd_growth_pct']:+.2f}%")
+    lines.append(format_total(f"Trailing {result['trailing']['months']} months", result["trailing"]))
+    
+    return [
+        TextContent(
+            type="text",
+            text="\n".join(lines)
+        )
+    ]
+
+
 async def main():
     """Main entry point for the MCP server."""
     async with stdio_server() as (read_stream, write_stream):
@@ -5,46 +5,308 @@ Accepts month and year parameters and returns sales data or 'No data exists'.
 """
 
 import argparse
+import calendar
 import csv
+import os
 import sys
+import threading
 from pathlib import Path
 
+# Default data file, next to this script
+CSV_PATH = Path(__file__).parent / 'sales_data.csv'
 
-def get_sales_data(month, year):
+# Month names in calendar order, as they appear in the CSV
+MONTHS = list(calendar.month_name)[1:]
+
+# Longest series a single range query may return (50 years of months)
+MAX_RANGE_MONTHS = 600
+
+
+def normalize_key(month, year):
+    """Return the (month, year) index key used for lookups, e.g. ('January', '2024')."""
+    return month.strip().capitalize(), year.strip()
+
+
+def period_ordinal(month, year):
+    """
+    Return a month's position on a continuous month axis (year * 12 + month index).
+    
+    Raises:
+        ValueError: If the month name or year is invalid
+    """
+    month, year = normalize_key(month, year)
+    if month not in MONTHS:
+        raise ValueError(f"Invalid month: {month!r}")
+    if not year.isdigit():
+        raise ValueError(f"Invalid year: {year!r}")
+    return int(year) * 12 + MONTHS.index(month)
+
+
+def ordinal_period(ordinal):
+    """Inverse of period_ordinal: return the (month, year) strings for an ordinal."""
+    return MONTHS[ordinal % 12], str(ordinal // 12)
+
+
+class MonthlyPrefixSums:
+    """
+    Chronological monthly sales with prefix sums for O(1) range totals.
+    
+    Months between the first and last month in the data are laid out
+    contiguously; months without a row contribute 0 and are counted separately
+    so callers can tell how complete a total is. Amounts are summed as integer
+    cents, so totals are exact.
+    
+    Args:
+        index: dict of (month, year) -> sales string, as built by SalesDataIndex
+    """
+    
+    def __init__(self, index):
+        values = {}
+        for (month, year), sales in index.items():
+            try:
+                values[period_ordinal(month, year)] = round(float(sales) * 100)
+            except ValueError:
+                # Unparseable rows stay available to plain lookups but are not aggregated
+                continue
+        
+        self.start = min(values) if values else 0
+        length = max(values) - self.start + 1 if values else 0
+        # sums[i] / counts[i] cover the first i months of the axis
+        self.sums = [0] * (length + 1)
+        self.counts = [0] * (length + 1)
+        for i in range(length):
+            value = values.get(self.start + i)
+            self.sums[i + 1] = self.sums[i] + (value or 0)
+            self.counts[i + 1] = self.counts[i] + (value is not None)
+    
+    def total(self, first, last):
+        """
+        Sum sales over an inclusive range of month ordinals in O(1).
+        
+        Returns:
+            tuple: (total, months_with_data); months outside the data count as missing
+        """
+        length = len(self.sums) - 1
+        lo = min(max(first - self.start, 0), length)
+        hi = min(max(last - self.start + 1, 0), length)
+        if hi <= lo:
+            return 0.0, 0
+        return (self.sums[hi] - self.sums[lo]) / 100, self.counts[hi] - self.counts[lo]
+    
+    def value(self, ordinal):
+        """Return the sales for one month ordinal, or None if there is no data."""
+        total, count = self.total(ordinal, ordinal)
+        return total if count else None
+
+
+def growth_pct(current, previous):
+    """Percentage change from previous to current, or None if it is undefined."""
+    if current is None or not previous:
+        return None
+    return round((current - previous) / previous * 100, 2)
+
+
+class SalesDataIndex:
+    """
+    In-memory index of the sales CSV keyed by (normalized month, year).
+    
+    The file is parsed once and the index is reused across lookups, together
+    with chronological prefix sums used for aggregate queries. Before each
+    lookup the file's modification time and size are checked, and both are
+    rebuilt only when either has changed.
+    
+    Args:
+        csv_path: Path to the sales CSV (columns: month, year, sales)
+    """
+    
+    def __init__(self, csv_path=CSV_PATH):
+        self.csv_path = Path(csv_path)
+        # (index, prefix sums), replaced together so readers see a consistent pair
+        self._snapshot = ({}, MonthlyPrefixSums({}))
+        self._signature = None
+        self._lock = threading.Lock()
+    
+    def _build(self):
+        index = {}
+        with open(self.csv_path, 'r', newline='') as csvfile:
+            for row in csv.DictReader(csvfile):
+                # Keep the first row for a month, as a top-to-bottom scan would
+                index.setdefault(normalize_key(row['month'], row['year']), row['sales'])
+        return index, MonthlyPrefixSums(index)
+    
+    def _current(self):
+        stat = os.stat(self.csv_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._snapshot = self._build()
+                    self._signature = signature
+        return self._snapshot
+    
+    def load(self):
+        """
+        Return the current index, rebuilding it if the file changed.
+        
+        Returns:
+            dict: (month, year) -> sales string
+        
+        Raises:
+            OSError: If the CSV file cannot be read
+        """
+        return self._current()[0]
+    
+    def version(self):
+        """
+        Return the (st_mtime_ns, st_size) signature of the data the index holds.
+        
+        Costs one stat call; the index is rebuilt first if the file changed, so
+        the signature always matches what the next lookup will see.
+        
+        Raises:
+            OSError: If the CSV file cannot be read
+        """
+        self._current()
+        return self._signature
+    
+    def get(self, month, year):
+        """Return the sales string for a month and year, or None if there is no row."""
+        return self.load().get(normalize_key(month, year))
+    
+    def get_many(self, periods):
+        """
+        Look up several months against one snapshot of the index.
+        
+        Args:
+            periods: Iterable of (month, year) pairs
+        
+        Returns:
+            list: (month, year, sales) tuples in request order, with normalized
+            month and year, and sales None where there is no row
+        """
+        index = self.load()
+        results = []
+        for month, year in periods:
+            key = normalize_key(month, year)
+            results.append((key[0], key[1], index.get(key)))
+        return results
+    
+    def get_range(self, start_month, start_year, end_month, end_year):
+        """
+        Look up every month from a start period to an end period, inclusive.
+        
+        Returns:
+            list: (month, year, sales) tuples in calendar order
+        
+        Raises:
+            ValueError: If a month or year is invalid, the end precedes the
+                start, or the range exceeds MAX_RANGE_MONTHS
+        """
+        return self.get_many(month_range(start_month, start_year, end_month, end_year))
+    
+    def aggregates(self, month, year, window=3):
+        """
+        Compute derived totals for a month in O(1) from the prefix sums.
+        
+        Args:
+            month (str): Month name (case-insensitive)
+            year (str): Year (e.g., '2024')
+            window (int): Length of the trailing window in months
+        
+        Returns:
+            dict with the month's sales, year-to-date total, the previous year's
+            year-to-date total, year-over-year growth for the month and for the
+            year to date, and the trailing window total. Each total reports how
+            many of its months have data; growth is None when a side is missing
+            or, for year to date, when the two periods are not equally complete.
+        
+        Raises:
+            ValueError: If the month or year is invalid or window is out of range
+        """
+        if not 1 <= window <= MAX_RANGE_MONTHS:
+            raise ValueError(f"Window must be between 1 and {MAX_RANGE_MONTHS} months")
+        ordinal = period_ordinal(month, year)
+        prefix = self._current()[1]
+        
+        def summary(first, last):
+            total, months_with_data = prefix.total(first, last)
+            return {
+                'total': total,
+                'months': last - first + 1,
+                'months_with_data': months_with_data,
+            }
+        
+        january = ordinal - ordinal % 12
+        ytd = summary(january, ordinal)
+        previous_ytd = summary(january - 12, ordinal - 12)
+        sales = prefix.value(ordinal)
+        previous_sales = prefix.value(ordinal - 12)
+        comparable = ytd['months_with_data'] == previous_ytd['months_with_data'] > 0
+        
+        month, year = ordinal_period(ordinal)
+        return {
+            'month': month,
+            'year': year,
+            'sales': sales,
+            'previous_year_sales': previous_sales,
+            'yoy_growth_pct': growth_pct(sales, previous_sales),
+            'ytd': ytd,
+            'previous_ytd': previous_ytd,
+            'ytd_growth_pct': growth_pct(ytd['total'], previous_ytd['total']) if comparable else None,
+            'trailing': summary(ordinal - window + 1, ordinal),
+        }
+
+
+def month_range(start_month, start_year, end_month, end_year):
+    """
+    List the (month, year) pairs from a start period to an end period, inclusive.
+    
+    Args:
+        start_month, end_month (str): Month names (case-insensitive)
+        start_year, end_year (str): Years (e.g., '2024')
+    
+    Returns:
+        list: (month, year) string pairs, e.g. [('November', '2024'), ('December', '2024')]
+    
+    Raises:
+        ValueError: If a month or year is invalid, the end precedes the start,
+            or the range exceeds MAX_RANGE_MONTHS
+    """
+    start = period_ordinal(start_month, start_year)
+    end = period_ordinal(end_month, end_year)
+    if end < start:
+        raise ValueError("End period is before start period")
+    if end - start + 1 > MAX_RANGE_MONTHS:
+        raise ValueError(f"Range exceeds {MAX_RANGE_MONTHS} months")
+    return [ordinal_period(ordinal) for ordinal in range(start, end + 1)]
+
+
+# Shared by every lookup in this process
+_default_index = SalesDataIndex()
+
+
+def get_sales_data(month, year, index=None):
     """
     Retrieve sales data for the specified month and year.
     
     Args:
         month (str): The month to search for (e.g., 'January', 'February')
         year (str): The year to search for (e.g., '2023', '2024')
+        index (SalesDataIndex): Index to query (default: the shared index over sales_data.csv)
     
     Returns:
         str: The sales amount if found, or "No data exists" if not found
     """
-    # Get the directory where this script is located
-    script_dir = Path(__file__).parent
-    csv_path = script_dir / 'sales_data.csv'
+    index = index or _default_index
     
     # Validate that the CSV file exists
-    if not csv_path.exists():
-        print(f"Error: Sales data file not found at {csv_path}", file=sys.stderr)
+    if not index.csv_path.exists():
+        print(f"Error: Sales data file not found at {index.csv_path}", file=sys.stderr)
         return "No data exists"
     
-    # Normalize inputs for comparison
-    month = month.strip().capitalize()
-    year = year.strip()
-    
     try:
-        # Read the CSV file and look for matching month and year
-        with open(csv_path, 'r', newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if (row['month'].strip().capitalize() == month and 
-                    row['year'].strip() == year):
-                    return row['sales']
-        
-        # If we reach here, no matching data was found
-        return "No data exists"
+        sales = index.get(month, year)
+        return sales if sales is not None else "No data exists"
     
     except Exception as e:
         print(f"Error reading sales data: {e}", file=sys.stderr)
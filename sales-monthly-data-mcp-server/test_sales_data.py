@@ -5,6 +5,8 @@ Test script for sales_data.py
 
 import subprocess
 import sys
+import tempfile
+from pathlib import Path
 
 
 def run_sales_data_script(month, year):
@@ -60,6 +62,172 @@ def test_case(name, month, year, expected_status=0, expected_contains=None):
     return True
 
 
+def index_tests():
+    """
+    Exercise SalesDataIndex in-process against a temporary CSV.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from sales_data import SalesDataIndex, get_sales_data, month_range
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = Path(tmp_dir) / 'sales.csv'
+        csv_path.write_text("month,year,sales\nJanuary,2024,100.00\n")
+        index = SalesDataIndex(csv_path)
+
+        results = [
+            ("Index lookup", get_sales_data("january", "2024", index) == "100.00"),
+            ("Index miss", get_sales_data("February", "2024", index) == "No data exists"),
+        ]
+
+        first = index.load()
+        results.append(("Index reused when file unchanged", index.load() is first))
+        version = index.version()
+
+        # Appending a row changes the file size, so the index is rebuilt
+        with open(csv_path, 'a') as f:
+            f.write("February,2024,200.00\n")
+        results.append(("Index rebuilt after file change", get_sales_data("February", "2024", index) == "200.00"))
+        results.append(("Version changes with the file", index.version() != version))
+
+        # Range and batch queries
+        series = index.get_range("december", "2023", "March", "2024")
+        results.append(("Range query", series == [
+            ("December", "2023", None),
+            ("January", "2024", "100.00"),
+            ("February", "2024", "200.00"),
+            ("March", "2024", None),
+        ]))
+        results.append(("Batch query", index.get_many([(" february ", "2024"), ("May", "2030")]) == [
+            ("February", "2024", "200.00"),
+            ("May", "2030", None),
+        ]))
+
+        # Aggregates from prefix sums: Jan 2024 = 100.00, Feb 2024 = 200.00
+        with open(csv_path, 'a') as f:
+            f.write("February,2025,250.10\n")
+        aggregates = index.aggregates("february", "2025", window=14)
+        results.append(("Year-to-date total", aggregates['ytd'] == {'total': 250.1, 'months': 2, 'months_with_data': 1}))
+        results.append(("Year-over-year growth", aggregates['yoy_growth_pct'] == 25.05))
+        results.append(("Trailing window total", aggregates['trailing']['total'] == 550.1))
+        results.append(("Incomplete year-to-date growth withheld", aggregates['ytd_growth_pct'] is None))
+
+    try:
+        month_range("March", "2024", "January", "2024")
+        results.append(("Reversed range rejected", False))
+    except ValueError:
+        results.append(("Reversed range rejected", True))
+
+    return results
+
+
+def api_tests():
+    """
+    Exercise the API's ETag, Last-Modified and 304 handling with TestClient.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from email.utils import formatdate
+
+    from fastapi.testclient import TestClient
+
+    import api_server
+    from sales_data import SalesDataIndex
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = Path(tmp_dir) / 'sales.csv'
+        csv_path.write_text("month,year,sales\nJanuary,2024,100.00\n")
+        original_index = api_server.sales_index
+        api_server.sales_index = SalesDataIndex(csv_path)
+        try:
+            client = TestClient(api_server.app)
+            url = "/sales?month=January&year=2024"
+            first = client.get(url)
+            etag = first.headers.get("etag")
+            results = [
+                ("ETag, Last-Modified and Cache-Control sent",
+                 first.status_code == 200 and etag is not None
+                 and "last-modified" in first.headers and "cache-control" in first.headers),
+            ]
+
+            revalidated = client.get(url, headers={"If-None-Match": etag})
+            results.append(("Matching If-None-Match answered 304",
+                            revalidated.status_code == 304 and revalidated.content == b""
+                            and revalidated.headers.get("etag") == etag))
+            results.append(("Weak If-None-Match answered 304",
+                            client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304))
+            results.append(("Other ETag answered 200",
+                            client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200))
+            results.append(("ETag differs per URL",
+                            client.get("/sales?month=January&year=2023").headers.get("etag") != etag))
+
+            since = first.headers["last-modified"]
+            results.append(("Current If-Modified-Since answered 304",
+                            client.get(url, headers={"If-Modified-Since": since}).status_code == 304))
+            results.append(("Old If-Modified-Since answered 200",
+                            client.get(url, headers={"If-Modified-Since": formatdate(0, usegmt=True)}).status_code == 200))
+
+            # Conditional headers never hide a missing resource or an invalid request
+            recent = formatdate(usegmt=True)
+            missing = "/sales?month=Smarch&year=2099"
+            results.append(("Missing month with If-None-Match: * answered 404",
+                            client.get(missing, headers={"If-None-Match": "*"}).status_code == 404))
+            results.append(("Missing month with If-Modified-Since answered 404",
+                            client.get(missing, headers={"If-Modified-Since": recent}).status_code == 404))
+            results.append(("Invalid range with If-None-Match: * answered 400",
+                            client.get("/sales/range?start_month=March&start_year=2024&end_month=January&end_year=2024",
+                                       headers={"If-None-Match": "*"}).status_code == 400))
+            results.append(("Invalid window with If-Modified-Since answered 400",
+                            client.get("/sales/aggregates?month=January&year=2024&window=0",
+                                       headers={"If-Modified-Since": recent}).status_code == 400))
+            results.append(("Existing month with If-None-Match: * answered 304",
+                            client.get(url, headers={"If-None-Match": "*"}).status_code == 304))
+
+            # Appending a row changes the file version, so the old ETag no longer matches
+            with open(csv_path, 'a') as f:
+                f.write("February,2024,200.00\n")
+            changed = client.get(url, headers={"If-None-Match": etag})
+            results.append(("Changed file answered 200 with a new ETag",
+                            changed.status_code == 200 and changed.headers.get("etag") != etag))
+        finally:
+            api_server.sales_index = original_index
+
+    return results
+
+
+def mcp_tests():
+    """
+    Check that the MCP tools answer malformed arguments with "Error: ..." text.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    import mcp_server
+
+    def error_text(tool, arguments):
+        try:
+            result = tool(arguments)
+        except Exception:
+            return False
+        return len(result) == 1 and result[0].text.startswith("Error: ")
+
+    return [
+        ("Series with string periods answered with an error",
+         error_text(mcp_server.sales_data_series, {"periods": ["Jan 2024"]})),
+        ("Series with a number for periods answered with an error",
+         error_text(mcp_server.sales_data_series, {"periods": 5})),
+        ("Aggregates with window=None answered with an error",
+         error_text(mcp_server.sales_aggregates, {"month": "January", "year": "2024", "window": None})),
+        ("Aggregates with a non-numeric window answered with an error",
+         error_text(mcp_server.sales_aggregates, {"month": "January", "year": "2024", "window": "three"})),
+        ("Series with a list of periods answered",
+         mcp_server.sales_data_series({"periods": [{"month": "January", "year": "2024"}]})[0].text
+         .startswith("January 2024: $")),
+    ]
+
+
 def main():
     print("=" * 60)
     print("Testing sales_data.py")
@@ -139,6 +307,45 @@ def main():
             print(f"❌ {name}: FAILED - Exception occurred during test")
             failed += 1
     
+    print()
+
+    # In-memory index tests
+    print("Index Reload Tests:")
+    print("-" * 60)
+    for name, check in index_tests():
+        if check:
+            print(f"✅ {name}: PASSED")
+            passed += 1
+        else:
+            print(f"❌ {name}: FAILED")
+            failed += 1
+
+    print()
+
+    # HTTP caching tests
+    print("API Caching Tests:")
+    print("-" * 60)
+    for name, check in api_tests():
+        if check:
+            print(f"✅ {name}: PASSED")
+            passed += 1
+        else:
+            print(f"❌ {name}: FAILED")
+            failed += 1
+
+    print()
+
+    # MCP tool argument handling
+    print("MCP Tool Argument Tests:")
+    print("-" * 60)
+    for name, check in mcp_tests():
+        if check:
+            print(f"✅ {name}: PASSED")
+            passed += 1
+        else:
+            print(f"❌ {name}: FAILED")
+            failed += 1
+
     print()
     print("=" * 60)
     print(f"Results: {passed} passed, {failed} failed")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Long-lived inference worker for the telecom predictor MCP server.
+
+The worker is a warm child process that imports pandas, scikit-learn and
+matplotlib once, keeps the fitted hybrid models resident, and runs the
+analysis and prediction jobs in-process. The MCP server talks to it over
+stdin/stdout with one JSON object per line:
+
+    request:  {"id": 1, "job": "predict_december_2025", "output_dir": "/abs/run/dir"}
+    response: {"id": 1, "returncode": 0, "stdout": "{...}", "stderr": ""}
+
+Jobs run in quiet mode and "stdout" carries the job's JSON result object, so
+responses look exactly like running the script with --quiet --json. The
+optional "output_dir" is passed to the job like --output-dir.
+"""
+
+import io
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = SCRIPT_DIR.parent / "telecom-sales-predictor"
+
+JOBS = ("analyze_hybrid_model", "predict_december_2025")
+
+# Serve the pruned VAS_Sold forest from forest_pruning.py when it matches the training data
+SERVE_PRUNED_MODEL = os.environ.get("TELECOM_SERVE_PRUNED_MODEL", "") == "1"
+
+
+class _WorkerState:
+    """Imported modules and resident models, loaded on first use."""
+
+    def __init__(self):
+        self.models_position = None
+        self.artifacts = None
+
+    def setup(self):
+        os.chdir(PROJECT_DIR)
+        sys.path.insert(0, str(PROJECT_DIR))
+        import matplotlib
+        matplotlib.use("Agg")
+        # Import once; every job reuses the loaded libraries
+        import analyze_data_hybrid  # noqa: F401
+        import predict_december_2025  # noqa: F401
+
+    def models(self):
+        """
+        Return the hybrid models for the current training data, refreshing only on change.
+
+        The check reads just the end of final_dataset.csv. Appended rows are
+        folded into the resident models incrementally; a full refit happens
+        only when the file was rewritten. With SERVE_PRUNED_MODEL, a pruned
+        forest trained on the current rows is used instead when one exists.
+        """
+        from forest_pruning import load_pruned
+        from incremental_training import file_position, load_or_refresh
+
+        position = file_position("final_dataset.csv")
+        if position != self.models_position:
+            artifacts = load_pruned("final_dataset.csv") if SERVE_PRUNED_MODEL else None
+            if artifacts is None:
+                artifacts, _ = load_or_refresh("final_dataset.csv")
+            self.artifacts = artifacts
+            self.models_position = position
+        return self.artifacts
+
+    def run(self, job, output_dir=None):
+        """Run a job quietly and return its JSON-serializable result."""
+        output_dir = output_dir or "output_files"
+        if job == "analyze_hybrid_model":
+            import analyze_data_hybrid
+            return analyze_data_hybrid.main(quiet=True, output_dir=output_dir)[-1]
+        elif job == "predict_december_2025":
+            import predict_december_2025
+            return predict_december_2025.main(self.models(), quiet=True, output_dir=output_dir)
+        else:
+            raise ValueError(f"Unknown job: {job}")
+
+
+def serve():
+    """Worker process entry point: answer JSON line requests until stdin closes."""
+    protocol_out = sys.stdout
+    state = _WorkerState()
+    state.setup()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        returncode = 0
+        try:
+            # Anything the job still prints must not corrupt the protocol stream
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                result = state.run(request.get("job"), request.get("output_dir"))
+            output = json.dumps(result)
+        except Exception:
+            returncode = 1
+            output = stdout.getvalue()
+            stderr.write(traceback.format_exc())
+
+        response = {
+            "id": request.get("id"),
+            "returncode": returncode,
+            "stdout": output,
+            "stderr": stderr.getvalue(),
+        }
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+# Put on the response queue by cancel() to wake the thread waiting in run()
+_CANCELLED = object()
+
+
+class InferenceWorker:
+    """
+    Client for a warm worker process.
+
+    The child is started on first use and restarted if it dies or a job times
+    out. Jobs are serialized: the worker runs one job at a time. Only the
+    thread inside run() (or stop(), which waits for it) touches the child;
+    other threads ask it to give up with cancel().
+    """
+
+    def __init__(self, python=sys.executable):
+        self.python = python
+        self._process = None
+        self._responses = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def _start(self):
+        self._process = subprocess.Popen(
+            [self.python, str(Path(__file__).resolve())],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=str(PROJECT_DIR),
+        )
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process, self._responses),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _read_responses(process, responses):
+        for line in process.stdout:
+            responses.put(json.loads(line))
+        # EOF: the worker exited
+        responses.put(None)
+
+    def _kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    def stop(self):
+        """Terminate the worker process, after any job running in another thread has returned."""
+        with self._lock:
+            self._kill()
+
+    def cancel(self):
+        """
+        Ask the job running in run() to stop, from any thread, without blocking.
+
+        The thread running the job kills the worker process and returns a
+        failed CompletedProcess; the next job starts a fresh worker.
+        """
+        self._cancelled.set()
+        responses = self._responses
+        if responses is not None:
+            responses.put(_CANCELLED)
+
+    def run(self, job, timeout, output_dir=None):
+        """
+        Run a job in the worker.
+
+        Args:
+            job: One of JOBS
+            timeout: Seconds to wait before killing the worker
+            output_dir: Directory for the job's output files (default output_files/)
+
+        Returns:
+            subprocess.CompletedProcess whose stdout is the job's JSON result
+            (returncode 1 if the job was cancelled)
+
+        Raises:
+            subprocess.TimeoutExpired: If the job does not finish in time
+        """
+        with self._lock:
+            self._cancelled.clear()
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            self._next_id += 1
+            request = {"id": self._next_id, "job": job}
+            if output_dir is not None:
+                request["output_dir"] = str(output_dir)
+            request = json.dumps(request) + "\n"
+            try:
+                self._process.stdin.write(request)
+                self._process.stdin.flush()
+            except OSError:
+                # The worker died between jobs; start a fresh one and retry once
+                self._kill()
+                self._start()
+                self._process.stdin.write(request)
+                self._process.stdin.flush()
+
+            try:
+                # A cancel() that came before the queue existed only set the flag
+                response = _CANCELLED if self._cancelled.is_set() else self._responses.get(timeout=timeout)
+            except queue.Empty:
+                self._kill()
+                raise subprocess.TimeoutExpired(job, timeout)
+
+            if response is _CANCELLED:
+                self._kill()
+                return subprocess.CompletedProcess(job, 1, "", "Job cancelled")
+            if response is None:
+                self._kill()
+                return subprocess.CompletedProcess(job, 1, "", "Inference worker exited unexpectedly")
+
+            return subprocess.CompletedProcess(
+                job, response["returncode"], response["stdout"], response["stderr"]
+            )
+
+
+if __name__ == "__main__":
+    serve()
@@ -19,13 +19,18 @@ import subprocess
 import base64
 from pathlib import Path
 from typing import Any
-import glob
+import json
 import os
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, ImageContent
 
+from inference_worker import InferenceWorker
+from result_cache import ResultCache, hash_files
+from run_outputs import new_run_dir, prune_runs
+from single_flight import SingleFlight
+
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
 # Path to the main project directory
@@ -38,6 +43,57 @@ CSV_FILE = PROJECT_DIR / "final_dataset.csv"
 TEST_DATASET = PROJECT_DIR / "test_dataset_dec_2025.csv"
 # Output directory where PNG files are generated
 OUTPUT_DIR = PROJECT_DIR / "output_files"
+# Each tool execution writes into its own runs/<run_id>/ directory
+RUNS_DIR = OUTPUT_DIR / "runs"
+# Retention policy for run directories, applied in the background
+RUN_MAX_AGE_HOURS = float(os.environ.get("TELECOM_RUN_MAX_AGE_HOURS", "24"))
+RUN_MAX_MB = float(os.environ.get("TELECOM_RUN_MAX_MB", "200"))
+RUN_PRUNE_INTERVAL_SECONDS = float(os.environ.get("TELECOM_RUN_PRUNE_INTERVAL_SECONDS", "600"))
+# Names of run directories whose jobs are still executing; never pruned
+active_runs = set()
+
+# "persistent" runs jobs in a warm worker process that keeps libraries and models
+# loaded; "subprocess" starts a fresh Python interpreter for every tool call
+WORKER_MODE = os.environ.get("TELECOM_PREDICTOR_WORKER_MODE", "persistent")
+# Serve the pruned VAS_Sold forest from forest_pruning.py when it matches the
+# training data (the persistent worker reads the same variable)
+SERVE_PRUNED_MODEL = os.environ.get("TELECOM_SERVE_PRUNED_MODEL", "") == "1"
+# Maximum number of jobs running at once; further tool calls wait their turn
+# without blocking the event loop. In persistent mode each slot has its own worker.
+MAX_CONCURRENT_JOBS = max(1, int(os.environ.get("TELECOM_PREDICTOR_MAX_CONCURRENT_JOBS", "2")))
+job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+idle_workers = [InferenceWorker() for _ in range(MAX_CONCURRENT_JOBS)]
+# Concurrent calls for the same job and inputs share one execution
+in_flight_jobs = SingleFlight()
+
+# Files whose contents determine the analysis result; editing any of them invalidates cached results
+HYBRID_ANALYSIS_INPUTS = [
+    CSV_FILE,
+    HYBRID_ANALYZE_SCRIPT,
+    PROJECT_DIR / "data_loader.py",
+    PROJECT_DIR / "feature_store.py",
+    PROJECT_DIR / "sufficient_stats.py",
+    PROJECT_DIR / "feature_pipeline.py",
+    PROJECT_DIR / "holiday_features.py",
+    PROJECT_DIR / "holiday_calendar.py",
+]
+# Files whose contents determine the December forecast
+DECEMBER_PREDICTION_INPUTS = [
+    CSV_FILE,
+    TEST_DATASET,
+    DECEMBER_PREDICT_SCRIPT,
+    PROJECT_DIR / "model_store.py",
+    PROJECT_DIR / "incremental_training.py",
+    PROJECT_DIR / "sufficient_stats.py",
+    PROJECT_DIR / "data_loader.py",
+    PROJECT_DIR / "feature_pipeline.py",
+    PROJECT_DIR / "holiday_features.py",
+    PROJECT_DIR / "holiday_calendar.py",
+]
+# Size-bounded LRU cache of analysis results (JSON summary and chart bytes)
+RESULT_CACHE_DIR = SCRIPT_DIR / ".cache" / "results"
+RESULT_CACHE_MAX_MB = float(os.environ.get("TELECOM_RESULT_CACHE_MAX_MB", "100"))
+result_cache = ResultCache(RESULT_CACHE_DIR, max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024))
 
 # Create an MCP server
 app = Server("telecom-predictor-server")
@@ -107,22 +163,182 @@ async def list_tools() -> list[Tool]:
     ]
 
 
-def find_latest_output_file(pattern: str) -> Path | None:
+async def run_shared_job(job: str, script: Path, timeout: int,
+                         input_files: list[Path]) -> subprocess.CompletedProcess:
+    """
+    Run a job, joining an identical job that is already in flight.
+    
+    Calls are identical when they run the same job on inputs with the same
+    contents, so N concurrent requests cost one training run. The job's output
+    does not depend on tool arguments, which only affect response formatting.
+    Each execution writes into a new run directory whose files are named in
+    the JSON result, so callers never pick up another run's output.
+    
+    Args:
+        job: Job name understood by the inference worker
+        script: Script to run when WORKER_MODE is "subprocess"
+        timeout: Seconds before the job is killed
+        input_files: Files whose contents determine the job's result
+        
+    Returns:
+        CompletedProcess shared by every caller of the same job
+    """
+    # Hashing reads the whole training CSV; keep it off the event loop
+    key = (job, await asyncio.to_thread(hash_files, input_files))
+    
+    async def start_run():
+        run_dir = new_run_dir(RUNS_DIR)
+        active_runs.add(run_dir.name)
+        try:
+            return await run_job(job, script, timeout, run_dir)
+        finally:
+            active_runs.discard(run_dir.name)
+    
+    return await in_flight_jobs.run(key, start_run)
+
+
+async def run_job(job: str, script: Path, timeout: int,
+                  output_dir: Path) -> subprocess.CompletedProcess:
+    """
+    Run an analysis job without blocking the event loop and return its captured output.
+    
+    Jobs run quietly and print a single JSON result object on stdout, whichever
+    execution mode is used. At most MAX_CONCURRENT_JOBS run at once. If the job
+    times out or the calling task is cancelled (e.g. the client cancels the
+    request), the child process running it is killed.
+    
+    Args:
+        job: Job name understood by the inference worker
+        script: Script to run when WORKER_MODE is "subprocess"
+        timeout: Seconds before the job is killed
+        output_dir: Directory the job writes its CSV/PNG files into
+        
+    Returns:
+        CompletedProcess with returncode, stdout (the JSON result) and stderr
+        
+    Raises:
+        subprocess.TimeoutExpired: If the job exceeds the timeout
+    """
+    async with job_slots:
+        if WORKER_MODE == "persistent":
+            return await run_in_worker(job, timeout, output_dir)
+        return await run_in_subprocess(script, timeout, output_dir)
+
+
+async def run_in_worker(job: str, timeout: int, output_dir: Path) -> subprocess.CompletedProcess:
+    """Run a job in an idle persistent worker, killing the worker if the call is cancelled."""
+    worker = idle_workers.pop()
+    call = asyncio.ensure_future(asyncio.to_thread(worker.run, job, timeout, output_dir))
+    try:
+        return await asyncio.shield(call)
+    except asyncio.CancelledError:
+        # The thread kills the worker itself; a fresh worker is started on the next job
+        worker.cancel()
+        raise
+    finally:
+        # The worker (and the job slot) stay taken until the thread has returned
+        while not call.done():
+            try:
+                await asyncio.wait([call])
+            except asyncio.CancelledError:
+                pass
+        idle_workers.append(worker)
+
+
+async def run_in_subprocess(script: Path, timeout: int, output_dir: Path) -> subprocess.CompletedProcess:
+    """Run a script in a fresh interpreter, killing it on timeout or cancellation."""
+    args = [sys.executable, str(script), "--quiet", "--json", "--output-dir", str(output_dir)]
+    if SERVE_PRUNED_MODEL and script == DECEMBER_PREDICT_SCRIPT:
+        args.append("--pruned")
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=str(script.parent)  # Run in telecom-sales-predictor directory
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+    return subprocess.CompletedProcess(
+        args, process.returncode, stdout.decode(), stderr.decode()
+    )
+
+
+def format_analysis_summary(summary: dict) -> str:
+    """
+    Format the analyze_hybrid_model JSON result as a readable report.
+    
+    Args:
+        summary: Result object printed by analyze_data_hybrid.py --json
+        
+    Returns:
+        Markdown text with per-model metrics and top features
+    """
+    train, test = summary["train_period"], summary["test_period"]
+    text = "✅ **Hybrid Model Analysis Complete**\n\n"
+    text += "The hybrid model (Random Forest for VAS_Sold + Linear Regression for Speed_Upgrades) "
+    text += f"was trained on {train['start']} to {train['end']} ({train['records']} records) "
+    text += f"and evaluated on {test['start']} to {test['end']} ({test['records']} records).\n\n"
+    text += "**Key Results:**\n"
+    
+    for target, model in summary["models"].items():
+        metrics = model["metrics"]
+        text += f"\n**{target}** ({model['model_type']}):\n"
+        text += f"- Test R²: {metrics['test_r2']:.4f} (Train R²: {metrics['train_r2']:.4f})\n"
+        text += f"- Test RMSE: {metrics['test_rmse']:.2f}\n"
+        text += f"- Test MAE: {metrics['test_mae']:.2f}\n"
+        text += "- Top 5 features:\n"
+        for feature in model["features"][:5]:
+            name = feature["feature"]
+            if "importance" in feature:
+                text += f"  - {name}: {feature['importance']:.4f} (importance)\n"
+            else:
+                text += f"  - {name}: {feature['coefficient']:.4f} (coefficient)\n"
+        if "intercept" in model:
+            text += f"  - Intercept: {model['intercept']:.4f}\n"
+    
+    text += f"\n**Average Test R²:** {summary['average_test_r2']:.4f}"
+    return text
+
+
+def format_prediction_summary(summary: dict) -> str:
     """
-    Find the most recently generated output file matching the pattern.
+    Format the predict_december_2025 JSON result as a readable report.
     
     Args:
-        pattern: Glob pattern to match files (e.g., "model_predictions_hybrid_final_*.png")
+        summary: Result object printed by predict_december_2025.py --json
         
     Returns:
-        Path to the most recent file, or None if no files found
+        Markdown text with monthly totals and the top 5 days per target
     """
-    files = glob.glob(str(OUTPUT_DIR / pattern))
-    if not files:
-        return None
-    # Sort by modification time, most recent first
-    files.sort(key=os.path.getmtime, reverse=True)
-    return Path(files[0])
+    text = "✅ **December 2025 Predictions Complete**\n\n"
+    text += "Sales forecasts have been generated for December 2025 based on:\n"
+    text += "- Historical data (Sep 2024 - Oct 2025)\n"
+    text += "- Planned marketing campaigns (Push notifications & Emails)\n"
+    text += f"- Hybrid model (Random Forest + Linear Regression), version {summary['model_version']}\n\n"
+    text += "**Prediction Summary:**\n"
+    
+    campaigns = {"VAS_Sold": "Push_Notifications_Sent", "Speed_Upgrades": "Emails_Sent"}
+    for target, totals in summary["totals"].items():
+        text += f"\n**{target}:**\n"
+        text += f"- Total for December: {totals['total']:,}\n"
+        text += f"- Daily Average: {totals['daily_average']:.1f}\n"
+        text += f"- Min Daily: {totals['min_daily']:,}\n"
+        text += f"- Max Daily: {totals['max_daily']:,}\n"
+        text += "- Top 5 days:\n"
+        campaign_column = campaigns.get(target)
+        for day in summary["top_days"].get(target, []):
+            campaign = f" ({campaign_column}: {day[campaign_column]:,})" if campaign_column in day else ""
+            text += f"  - {day['date']}: {day['predicted']:,}{campaign}\n"
+    
+    return text
 
 
 @app.call_tool()
@@ -171,67 +387,57 @@ async def run_hybrid_analysis(arguments: Any) -> list[TextContent | ImageContent
     include_stats = arguments.get("include_stats", True) if arguments else True
     
     try:
-        # Run the analysis script
-        result = subprocess.run(
-            [sys.executable, str(HYBRID_ANALYZE_SCRIPT)],
-            capture_output=True,
-            text=True,
-            timeout=90,  # Longer timeout for hybrid model training
-            check=False,
-            cwd=str(HYBRID_ANALYZE_SCRIPT.parent)  # Run in telecom-sales-predictor directory
+        # Serve repeat calls from the result cache; the key covers the data and
+        # the analysis code, so any change is a miss. include_stats only changes
+        # the formatting of the response, so both variants share one entry.
+        cache_key = await asyncio.to_thread(
+            result_cache.make_key, "analyze_hybrid_model", HYBRID_ANALYSIS_INPUTS
         )
+        cached = result_cache.get(cache_key)
+        if cached and not Path(cached[0]["summary"]["files"]["chart_png"]).exists():
+            # The run directory the summary points at is gone; recompute
+            cached = None
         
-        # Check if the process succeeded
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else "Unknown error"
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Error running hybrid analysis:\n{error_message}\n\nOutput:\n{result.stdout}"
-                )
-            ]
+        if cached:
+            metadata, blobs = cached
+            summary = metadata["summary"]
+            image_data = blobs.get("chart.png")
+        else:
+            # Run the analysis (longer timeout for hybrid model training)
+            result = await run_shared_job(
+                "analyze_hybrid_model", HYBRID_ANALYZE_SCRIPT, 90, HYBRID_ANALYSIS_INPUTS
+            )
+            
+            # Check if the process succeeded
+            if result.returncode != 0:
+                error_message = result.stderr.strip() if result.stderr else "Unknown error"
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Error running hybrid analysis:\n{error_message}\n\nOutput:\n{result.stdout}"
+                    )
+                ]
+            
+            summary = json.loads(result.stdout)
+            image_data = None
+            
+            # The result names the chart it wrote in this run's directory
+            png_file = PROJECT_DIR / summary["files"]["chart_png"]
+            if png_file.exists():
+                image_data = png_file.read_bytes()
+                result_cache.put(cache_key, {"summary": summary}, {"chart.png": image_data})
+        
+        png_location = Path(summary["files"]["chart_png"]).relative_to(PROJECT_DIR)
         
         # Prepare response list
         response_content = []
         
         # Add text output if requested
         if include_stats:
-            # Extract key metrics from the output
-            stdout = result.stdout
-            
-            # Parse out key sections for cleaner response
-            lines = stdout.split('\n')
-            key_sections = []
-            capture = False
-            current_section = []
-            
-            for line in lines:
-                if any(keyword in line.upper() for keyword in ['HYBRID MODEL', 'BUILDING', 'MODEL TRAINING COMPLETE', 'FINAL MODEL SUMMARY']):
-                    capture = True
-                    if current_section:
-                        key_sections.append('\n'.join(current_section))
-                        current_section = []
-                
-                if capture:
-                    current_section.append(line)
-                
-                if 'VISUALIZATION COMPLETE' in line:
-                    capture = False
-                    if current_section:
-                        key_sections.append('\n'.join(current_section))
-                        current_section = []
-            
-            # Create a formatted summary
-            summary = "✅ **Hybrid Model Analysis Complete**\n\n"
-            summary += "The hybrid model (Random Forest for VAS_Sold + Linear Regression for Speed_Upgrades) "
-            summary += "has been trained and evaluated on test data (Aug-Oct 2025).\n\n"
-            summary += "**Key Results:**\n"
-            summary += '\n'.join(key_sections) if key_sections else stdout
-            
             response_content.append(
                 TextContent(
                     type="text",
-                    text=summary
+                    text=format_analysis_summary(summary)
                 )
             )
         else:
@@ -242,23 +448,17 @@ async def run_hybrid_analysis(arguments: Any) -> list[TextContent | ImageContent
                 )
             )
         
-        # Find the most recent PNG file for hybrid analysis
-        png_file = find_latest_output_file("model_predictions_hybrid_final_*.png")
-        
-        if not png_file or not png_file.exists():
+        if image_data is None:
             response_content.append(
                 TextContent(
                     type="text",
-                    text=f"\n⚠️ Warning: PNG file was not found in {OUTPUT_DIR}\n"
-                         f"Looking for pattern: model_predictions_hybrid_final_*.png"
+                    text=f"\n⚠️ Warning: PNG file was not found at {png_location}"
                 )
             )
             return response_content
         
-        # Read PNG as binary and encode to base64
-        with open(png_file, 'rb') as img_file:
-            image_data = img_file.read()
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+        # Encode PNG to base64
+        base64_image = base64.b64encode(image_data).decode('utf-8')
         
         # Add file info and image to response
         file_size_kb = len(image_data) / 1024
@@ -266,9 +466,9 @@ async def run_hybrid_analysis(arguments: Any) -> list[TextContent | ImageContent
             TextContent(
                 type="text",
                 text=f"\n📊 **Visualization Details:**\n"
-                     f"- File: {png_file.name}\n"
+                     f"- File: {png_location.name}\n"
                      f"- Size: {file_size_kb:.1f} KB\n"
-                     f"- Location: {png_file.relative_to(PROJECT_DIR)}"
+                     f"- Location: {png_location}"
             )
         )
         
@@ -338,14 +538,9 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
     return_csv = arguments.get("return_csv", False) if arguments else False
     
     try:
-        # Run the prediction script
-        result = subprocess.run(
-            [sys.executable, str(DECEMBER_PREDICT_SCRIPT)],
-            capture_output=True,
-            text=True,
-            timeout=90,  # Timeout for training + prediction
-            check=False,
-            cwd=str(DECEMBER_PREDICT_SCRIPT.parent)  # Run in telecom-sales-predictor directory
+        # Run the prediction (timeout covers retraining if the data changed)
+        result = await run_shared_job(
+            "predict_december_2025", DECEMBER_PREDICT_SCRIPT, 90, DECEMBER_PREDICTION_INPUTS
         )
         
         # Check if the process succeeded
@@ -358,49 +553,17 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
                 )
             ]
         
+        summary = json.loads(result.stdout)
+        
         # Prepare response list
         response_content = []
         
         # Add text output if requested
         if include_stats:
-            # Extract key metrics from the output
-            stdout = result.stdout
-            
-            # Parse out summary sections
-            lines = stdout.split('\n')
-            key_sections = []
-            capture = False
-            current_section = []
-            
-            for line in lines:
-                if any(keyword in line.upper() for keyword in ['DECEMBER 2025', 'PREDICTIONS SUMMARY', 'TOP 5 DAYS']):
-                    capture = True
-                    if current_section and not all(line.strip() == '' for line in current_section):
-                        key_sections.append('\n'.join(current_section))
-                        current_section = []
-                
-                if capture:
-                    current_section.append(line)
-                
-                if 'PREDICTION COMPLETE' in line:
-                    capture = False
-                    if current_section:
-                        key_sections.append('\n'.join(current_section))
-                        current_section = []
-            
-            # Create a formatted summary
-            summary = "✅ **December 2025 Predictions Complete**\n\n"
-            summary += "Sales forecasts have been generated for December 2025 based on:\n"
-            summary += "- Historical data (Sep 2024 - Oct 2025)\n"
-            summary += "- Planned marketing campaigns (Push notifications & Emails)\n"
-            summary += "- Hybrid model (Random Forest + Linear Regression)\n\n"
-            summary += "**Prediction Summary:**\n"
-            summary += '\n'.join(key_sections) if key_sections else stdout
-            
             response_content.append(
                 TextContent(
                     type="text",
-                    text=summary
+                    text=format_prediction_summary(summary)
                 )
             )
         else:
@@ -411,12 +574,12 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
                 )
             )
         
-        # Find the most recent CSV and PNG files for December prediction
-        csv_file = find_latest_output_file("december_2025_predictions_*.csv")
-        png_file = find_latest_output_file("december_2025_predictions_chart_*.png")
+        # The result names the files it wrote in this run's directory
+        csv_file = PROJECT_DIR / summary["files"]["predictions_csv"]
+        png_file = PROJECT_DIR / summary["files"]["chart_png"]
         
         # Handle CSV file if requested
-        if return_csv and csv_file and csv_file.exists():
+        if return_csv and csv_file.exists():
             with open(csv_file, 'r') as f:
                 csv_content = f.read()
             response_content.append(
@@ -427,12 +590,11 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
             )
         
         # Handle PNG visualization
-        if not png_file or not png_file.exists():
+        if not png_file.exists():
             response_content.append(
                 TextContent(
                     type="text",
-                    text=f"\n⚠️ Warning: Chart PNG was not found in {OUTPUT_DIR}\n"
-                         f"Looking for pattern: december_2025_predictions_chart_*.png"
+                    text=f"\n⚠️ Warning: Chart PNG was not found at {png_file.relative_to(PROJECT_DIR)}"
                 )
             )
             return response_content
@@ -448,12 +610,12 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
         file_info += f"- Chart: {png_file.name}\n"
         file_info += f"- Chart Size: {file_size_kb:.1f} KB\n"
         
-        if csv_file and csv_file.exists():
+        if csv_file.exists():
             csv_size_kb = csv_file.stat().st_size / 1024
             file_info += f"- CSV: {csv_file.name}\n"
             file_info += f"- CSV Size: {csv_size_kb:.1f} KB\n"
         
-        file_info += f"- Location: {OUTPUT_DIR.relative_to(PROJECT_DIR)}"
+        file_info += f"- Location: {png_file.parent.relative_to(PROJECT_DIR)}"
         
         response_content.append(
             TextContent(
@@ -493,14 +655,69 @@ async def run_december_prediction(arguments: Any) -> list[TextContent | ImageCon
         ]
 
 
+def cached_runs(cache, runs_dir):
+    """
+    Map run directory names to the keys of cached results whose files are in them.
+
+    Cached summaries point at the run that produced them, so a run can only be
+    removed together with those cache entries.
+    """
+    runs = {}
+    for key, metadata in cache.items():
+        for path in metadata.get("summary", {}).get("files", {}).values():
+            try:
+                name = Path(path).relative_to(runs_dir).parts[0]
+            except (ValueError, IndexError):
+                continue
+            runs.setdefault(name, set()).add(key)
+    return runs
+
+
+def apply_run_retention(keep):
+    """
+    Prune run directories, keeping the given runs.
+
+    Runs referenced by cached results count toward RUN_MAX_MB like any other;
+    when one is removed, the cache entries pointing into it are deleted first.
+    """
+    referenced = cached_runs(result_cache, RUNS_DIR)
+
+    def drop_cached_results(run_name):
+        for key in referenced.get(run_name, ()):
+            result_cache.delete(key)
+
+    return prune_runs(
+        RUNS_DIR,
+        max_age_seconds=RUN_MAX_AGE_HOURS * 3600,
+        max_bytes=int(RUN_MAX_MB * 1024 * 1024),
+        keep=keep,
+        on_remove=drop_cached_results,
+    )
+
+
+async def prune_runs_periodically():
+    """Apply the run directory retention policy now and every RUN_PRUNE_INTERVAL_SECONDS."""
+    while True:
+        try:
+            await asyncio.to_thread(apply_run_retention, set(active_runs))
+        except OSError:
+            # Retention is best effort; try again on the next pass
+            pass
+        await asyncio.sleep(RUN_PRUNE_INTERVAL_SECONDS)
+
+
 async def main():
     """Main entry point for the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    pruner = asyncio.create_task(prune_runs_periodically())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        pruner.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+Content-addressed on-disk result cache for the telecom predictor MCP server.
+
+Entries are keyed by a hash of the input files' contents (training data and
+analysis scripts) and the tool arguments, so any change to the data or code
+produces a new key and stale results are never served. Each entry is a
+directory holding a JSON metadata file and named binary blobs (e.g. the chart
+PNG). Total size is bounded with least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+METADATA_FILE = "result.json"
+
+
+def hash_files(paths, chunk_size=1 << 20):
+    """Return a SHA-256 digest over the names and contents of several files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        digest.update(path.name.encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of tool results stored on disk.
+
+    Args:
+        cache_dir: Directory holding one subdirectory per entry
+        max_bytes: Total size above which least recently used entries are evicted
+    """
+
+    def __init__(self, cache_dir, max_bytes=100 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def make_key(self, namespace, input_files, arguments=None):
+        """
+        Build a cache key.
+
+        Args:
+            namespace: Tool name, so different tools never share entries
+            input_files: Files whose contents determine the result
+            arguments: JSON-serializable tool arguments
+
+        Returns:
+            str: Hex key
+        """
+        payload = {
+            "namespace": namespace,
+            "inputs": hash_files(input_files),
+            "arguments": arguments or {},
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key):
+        """
+        Return (metadata, blobs) for a key, or None on a miss.
+
+        A hit refreshes the entry's recency for LRU eviction.
+        """
+        entry_dir = self.cache_dir / key
+        try:
+            with open(entry_dir / METADATA_FILE, "r") as f:
+                metadata = json.load(f)
+            blobs = {}
+            for name in metadata.get("_blobs", []):
+                blobs[name] = (entry_dir / name).read_bytes()
+            os.utime(entry_dir)
+        except (OSError, ValueError):
+            return None
+        metadata.pop("_blobs", None)
+        return metadata, blobs
+
+    def items(self):
+        """Yield (key, metadata) for every complete entry, without refreshing its recency."""
+        for _, _, entry_dir in self._entries():
+            try:
+                with open(entry_dir / METADATA_FILE, "r") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                continue
+            metadata.pop("_blobs", None)
+            yield entry_dir.name, metadata
+
+    def delete(self, key):
+        """Remove an entry if it exists."""
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+
+    def put(self, key, metadata, blobs=None):
+        """
+        Store an entry and evict old entries if the cache is over budget.
+
+        Args:
+            key: Key from make_key()
+            metadata: JSON-serializable dict
+            blobs: Optional dict of file name -> bytes
+        """
+        blobs = blobs or {}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key[:16]}-", dir=self.cache_dir))
+        except OSError:
+            # The cache is an optimization; an unwritable directory is not fatal
+            return
+        try:
+            for name, data in blobs.items():
+                (tmp_dir / name).write_bytes(data)
+            with open(tmp_dir / METADATA_FILE, "w") as f:
+                json.dump({**metadata, "_blobs": sorted(blobs)}, f)
+            entry_dir = self.cache_dir / key
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # A concurrent writer stored the same key; its entry is equivalent
+                pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+
+    def _entries(self):
+        """Return (last_used, size, path) for every complete entry."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for entry_dir in self.cache_dir.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove every entry."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,101 @@
+"""
+Run-scoped output directories for telecom predictor jobs.
+
+Each tool execution writes its CSV and PNG files into its own directory,
+runs/<run_id>/, so the server knows exactly which files a job produced without
+scanning a shared directory, and overlapping runs never see each other's
+output. A retention policy removes run directories that are older than a
+maximum age, then the oldest ones until the total size fits a byte budget.
+"""
+
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def new_run_dir(runs_dir):
+    """
+    Create a fresh, uniquely named run directory.
+
+    Run IDs start with a UTC timestamp so directory listings sort by age.
+
+    Args:
+        runs_dir: Parent directory holding all run directories
+
+    Returns:
+        Path to the new directory
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_dir = Path(runs_dir) / f"{timestamp}-{uuid.uuid4().hex[:8]}"
+    run_dir.mkdir(parents=True)
+    return run_dir
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def prune_runs(runs_dir, max_age_seconds=None, max_bytes=None, keep=(), on_remove=None):
+    """
+    Apply the retention policy to a runs directory.
+
+    Args:
+        runs_dir: Parent directory holding all run directories
+        max_age_seconds: Remove runs last modified longer ago than this
+        max_bytes: Then remove the oldest runs until the total fits this size
+        keep: Run directory names that must not be removed (runs in progress)
+        on_remove: Called with a run directory's name just before it is
+            removed, e.g. to drop cached results that point into it
+
+    Returns:
+        int: Number of run directories removed
+    """
+    runs_dir = Path(runs_dir)
+    if not runs_dir.exists():
+        return 0
+
+    runs = []
+    for run_dir in runs_dir.iterdir():
+        if not run_dir.is_dir() or run_dir.name in keep:
+            continue
+        try:
+            runs.append((run_dir.stat().st_mtime, _dir_size(run_dir), run_dir))
+        except OSError:
+            continue
+    runs.sort()
+
+    def remove(run_dir):
+        if on_remove is not None:
+            on_remove(run_dir.name)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    removed = 0
+    now = time.time()
+    remaining = []
+    for mtime, size, run_dir in runs:
+        if max_age_seconds is not None and now - mtime > max_age_seconds:
+            remove(run_dir)
+            removed += 1
+        else:
+            remaining.append((size, run_dir))
+
+    if max_bytes is not None:
+        total = sum(size for size, _ in remaining)
+        for size, run_dir in remaining:
+            if total <= max_bytes:
+                break
+            remove(run_dir)
+            total -= size
+            removed += 1
+
+    return removed
@@ -0,0 +1,69 @@
+"""
+Single-flight coalescing of concurrent identical calls.
+
+When a call with a given key is already running, later callers with the same
+key wait for the first call's result instead of starting their own. N
+concurrent identical requests therefore cost one computation. The shared job
+is cancelled only when every caller waiting on it has been cancelled; a
+caller that arrives after that starts a new job rather than joining the
+cancelled one.
+"""
+
+import asyncio
+
+
+class _Call:
+    """An in-flight job and the number of callers waiting on it."""
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent coroutine calls that share a key."""
+
+    def __init__(self):
+        self._calls = {}
+
+    def in_flight(self):
+        """Return the number of distinct jobs currently running."""
+        return len(self._calls)
+
+    async def run(self, key, factory):
+        """
+        Run factory() unless a call with the same key is already in flight.
+
+        Args:
+            key: Hashable identity of the call's inputs
+            factory: Zero-argument function returning the coroutine to run
+
+        Returns:
+            The result of the shared call (exceptions are re-raised to every caller)
+        """
+        while True:
+            call = self._calls.get(key)
+            if call is None or call.task.cancelled():
+                call = _Call(asyncio.ensure_future(factory()))
+                self._calls[key] = call
+                call.task.add_done_callback(lambda _, call=call: self._forget(key, call))
+
+            call.waiters += 1
+            try:
+                # Shield so one caller's cancellation does not cancel the others' job
+                return await asyncio.shield(call.task)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    if call.waiters == 1 and not call.task.done():
+                        # Last interested caller: cancel the job so its child is
+                        # killed, and let later callers start a new one
+                        call.task.cancel()
+                        self._forget(key, call)
+                    raise
+                # Not this caller: the job was cancelled just as it joined; run it again
+            finally:
+                call.waiters -= 1
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -163,12 +163,212 @@ def main():
             print("✅ PASS: run_hybrid_analysis() function found")
         if hasattr(mcp_server, 'run_december_prediction'):
             print("✅ PASS: run_december_prediction() function found")
+        if hasattr(mcp_server, 'run_job'):
+            print(f"✅ PASS: run_job() found (worker mode: {mcp_server.WORKER_MODE})")
             
     except Exception as e:
         print(f"❌ FAIL: Server import error: {e}")
         all_passed = False
     print()
-    
+
+    # Test 9: Concurrent identical calls share one execution
+    print("Test 9: Request Coalescing")
+    print("-" * 40)
+    try:
+        import asyncio
+        from single_flight import SingleFlight
+
+        executions = []
+
+        async def job():
+            executions.append(1)
+            await asyncio.sleep(0.1)
+            return "result"
+
+        async def coalesce():
+            flight = SingleFlight()
+            return await asyncio.gather(*[flight.run("job", job) for _ in range(5)])
+
+        results = asyncio.run(coalesce())
+        if len(executions) == 1 and results == ["result"] * 5:
+            print("✅ PASS: 5 concurrent calls ran the job once")
+        else:
+            print(f"❌ FAIL: 5 concurrent calls ran the job {len(executions)} times")
+            all_passed = False
+
+        async def join_after_cancel():
+            flight = SingleFlight()
+            first = asyncio.create_task(flight.run("job", job))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            # Joins while the cancelled job is still unwinding
+            late = asyncio.create_task(flight.run("job", job))
+            try:
+                await first
+            except asyncio.CancelledError:
+                pass
+            return await late
+
+        executions.clear()
+        if asyncio.run(join_after_cancel()) == "result" and len(executions) == 2:
+            print("✅ PASS: Caller joining a cancelled job gets a fresh run")
+        else:
+            print("❌ FAIL: Caller joining a cancelled job did not get a result")
+            all_passed = False
+    except Exception as e:
+        print(f"❌ FAIL: Coalescing test error: {e}")
+        all_passed = False
+    print()
+
+    # Test 10: Result cache keys and LRU eviction
+    print("Test 10: Result Cache")
+    print("-" * 40)
+    try:
+        import os
+        import tempfile
+        from result_cache import ResultCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            data_file = tmp / "data.csv"
+            data_file.write_text("a,b\n1,2\n")
+            cache = ResultCache(tmp / "cache", max_bytes=2500)
+
+            key = cache.make_key("tool", [data_file])
+            same_key = cache.make_key("tool", [data_file])
+            other_tool_key = cache.make_key("other_tool", [data_file])
+            data_file.write_text("a,b\n1,3\n")
+            data_key = cache.make_key("tool", [data_file])
+            if key == same_key and len({key, other_tool_key, data_key}) == 3:
+                print("✅ PASS: Key covers the tool and the input contents")
+            else:
+                print("❌ FAIL: Cache key ignores input contents or arguments")
+                all_passed = False
+
+            # Two entries fit the budget, three do not
+            for name in ("a", "b"):
+                cache.put(name, {"summary": name}, {"chart.png": b"x" * 1000})
+            os.utime(cache.cache_dir / "a", (100, 100))
+            os.utime(cache.cache_dir / "b", (200, 200))
+            hit = cache.get("a")  # refreshes "a", so "b" is now least recently used
+            cache.put("c", {"summary": "c"}, {"chart.png": b"x" * 1000})
+            if (hit == ({"summary": "a"}, {"chart.png": b"x" * 1000})
+                    and cache.get("b") is None
+                    and cache.get("a") is not None and cache.get("c") is not None):
+                print("✅ PASS: Least recently used entry evicted over budget")
+            else:
+                print("❌ FAIL: LRU eviction removed the wrong entries")
+                all_passed = False
+    except Exception as e:
+        print(f"❌ FAIL: Result cache test error: {e}")
+        all_passed = False
+    print()
+
+    # Test 11: Run directory retention
+    print("Test 11: Run Retention")
+    print("-" * 40)
+    try:
+        import os
+        import tempfile
+        import time
+        from result_cache import ResultCache
+        from run_outputs import prune_runs
+        import mcp_server
+        from mcp_server import cached_runs
+
+        with tempfile.TemporaryDirectory() as tmp:
+            runs_dir = Path(tmp) / "runs"
+            now = time.time()
+            # (name, age in seconds); every run holds 1,000 bytes
+            for name, age in [("old", 7200), ("old-active", 7200), ("older-new", 60), ("newest", 30)]:
+                (runs_dir / name).mkdir(parents=True)
+                (runs_dir / name / "chart.png").write_bytes(b"x" * 1000)
+                os.utime(runs_dir / name, (now - age, now - age))
+
+            removed = prune_runs(runs_dir, max_age_seconds=3600, max_bytes=1500, keep={"old-active"})
+            remaining = sorted(path.name for path in runs_dir.iterdir())
+            if removed == 2 and remaining == ["newest", "old-active"]:
+                print("✅ PASS: Age and byte budget applied, active run kept")
+            else:
+                print(f"❌ FAIL: Retention removed {removed} runs, left {remaining}")
+                all_passed = False
+
+            cache = ResultCache(Path(tmp) / "cache")
+            chart = runs_dir / "newest" / "chart.png"
+            cache.put("key", {"summary": {"files": {"chart_png": str(chart)}}})
+            if cached_runs(cache, runs_dir) == {"newest": {"key"}}:
+                print("✅ PASS: Cached results are mapped to their runs")
+            else:
+                print(f"❌ FAIL: Cached runs: {cached_runs(cache, runs_dir)}")
+                all_passed = False
+
+            # A second, newer run pushes the cached one over a 1,500-byte budget
+            (runs_dir / "latest").mkdir()
+            (runs_dir / "latest" / "chart.png").write_bytes(b"x" * 1000)
+            saved = mcp_server.RUNS_DIR, mcp_server.result_cache, mcp_server.RUN_MAX_MB
+            mcp_server.RUNS_DIR, mcp_server.result_cache = runs_dir, cache
+            mcp_server.RUN_MAX_MB = 1500 / (1024 * 1024)
+            try:
+                mcp_server.apply_run_retention({"old-active"})
+            finally:
+                mcp_server.RUNS_DIR, mcp_server.result_cache, mcp_server.RUN_MAX_MB = saved
+            remaining = sorted(path.name for path in runs_dir.iterdir())
+            if remaining == ["latest", "old-active"] and cache.get("key") is None:
+                print("✅ PASS: Cached runs count toward the budget and are evicted with their entry")
+            else:
+                print(f"❌ FAIL: Retention left {remaining}, cache entry {cache.get('key')}")
+                all_passed = False
+    except Exception as e:
+        print(f"❌ FAIL: Run retention test error: {e}")
+        all_passed = False
+    print()
+
+    # Test 12: Cancelling a job in a persistent worker
+    print("Test 12: Worker Cancellation")
+    print("-" * 40)
+    try:
+        import asyncio
+        import tempfile
+        import mcp_server
+        from inference_worker import InferenceWorker
+
+        worker = InferenceWorker()
+        saved_workers = list(mcp_server.idle_workers)
+        mcp_server.idle_workers[:] = [worker]
+
+        async def cancel_job(output_dir):
+            task = asyncio.create_task(mcp_server.run_in_worker("predict_december_2025", 120, output_dir))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            # Back in the pool only once the thread has killed the child and returned
+            return mcp_server.idle_workers == [worker] and worker._process is None and not worker._lock.locked()
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                if asyncio.run(cancel_job(tmp)):
+                    print("✅ PASS: Cancelled job killed the worker before it was reused")
+                else:
+                    print("❌ FAIL: Worker returned to the pool while its job was still running")
+                    all_passed = False
+
+                result = worker.run("no_such_job", 120)
+                if result.returncode == 1 and "Unknown job" in result.stderr:
+                    print("✅ PASS: Next job starts a fresh worker")
+                else:
+                    print(f"❌ FAIL: Job after cancellation returned {result.returncode}: {result.stderr[-200:]}")
+                    all_passed = False
+        finally:
+            worker.stop()
+            mcp_server.idle_workers[:] = saved_workers
+    except Exception as e:
+        print(f"❌ FAIL: Worker cancellation test error: {e}")
+        all_passed = False
+    print()
+
     # Summary
     print("="*60)
     print("SUMMARY")
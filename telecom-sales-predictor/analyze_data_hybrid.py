@@ -1,188 +1,274 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import argparse
+import json
 import os
 from datetime import datetime
+from data_loader import load_dataset
+from feature_pipeline import FeaturePipeline, TARGET_COLUMNS
+from feature_store import DEFAULT_CHUNKSIZE, build_feature_store, split_by_date
+from sufficient_stats import LinearSufficientStats
 
-def get_holiday_features(date):
+def build_summary(dates, train_index, test_index, models, results, model_types,
+                  feature_weights, chart_file):
     """
-    Determine if a date is a federal holiday or near a federal holiday.
-    Returns: (is_holiday, days_to_holiday, days_from_holiday)
-
-    Federal holidays included:
-    - New Year's Day (Jan 1)
-    - Martin Luther King Jr. Day (3rd Monday in January)
-    - Presidents' Day (3rd Monday in February)
-    - Memorial Day (last Monday in May)
-    - Juneteenth (June 19)
-    - Independence Day (July 4)
-    - Labor Day (1st Monday in September)
-    - Columbus Day (2nd Monday in October)
-    - Veterans Day (Nov 11)
-    - Thanksgiving (4th Thursday in November)
-    - Christmas (Dec 25)
+    Build the machine-readable analysis result.
+
+    Args:
+        dates: Date of every record (Series)
+        train_index, test_index: Positions of the training and test records
+            (boolean arrays or slices)
+
+    Returns:
+        dict with per-model metrics and feature weights (importances for the
+        Random Forest, coefficients for the Linear Regression), the train/test
+        periods and the chart path. All values are JSON-serializable.
     """
-    holidays_2024 = [
-        pd.Timestamp('2024-01-01'),  # New Year's Day
-        pd.Timestamp('2024-01-15'),  # Martin Luther King Jr. Day
-        pd.Timestamp('2024-02-19'),  # Presidents' Day
-        pd.Timestamp('2024-05-27'),  # Memorial Day
-        pd.Timestamp('2024-06-19'),  # Juneteenth
-        pd.Timestamp('2024-07-04'),  # Independence Day
-        pd.Timestamp('2024-09-02'),  # Labor Day
-        pd.Timestamp('2024-10-14'),  # Columbus Day
-        pd.Timestamp('2024-11-11'),  # Veterans Day
-        pd.Timestamp('2024-11-28'),  # Thanksgiving
-        pd.Timestamp('2024-12-25'),  # Christmas
-    ]
-
-    holidays_2025 = [
-        pd.Timestamp('2025-01-01'),  # New Year's Day
-        pd.Timestamp('2025-01-20'),  # Martin Luther King Jr. Day
-        pd.Timestamp('2025-02-17'),  # Presidents' Day
-        pd.Timestamp('2025-05-26'),  # Memorial Day
-        pd.Timestamp('2025-06-19'),  # Juneteenth
-        pd.Timestamp('2025-07-04'),  # Independence Day
-        pd.Timestamp('2025-09-01'),  # Labor Day
-        pd.Timestamp('2025-10-13'),  # Columbus Day
-        pd.Timestamp('2025-11-11'),  # Veterans Day
-        pd.Timestamp('2025-11-27'),  # Thanksgiving
-        pd.Timestamp('2025-12-25'),  # Christmas
-    ]
-
-    all_holidays = holidays_2024 + holidays_2025
-
-    # Check if current date is a holiday
-    is_holiday = 1 if date in all_holidays else 0
-
-    # Calculate days to nearest holiday
-    if all_holidays:
-        days_diff = [(holiday - date).days for holiday in all_holidays]
-
-        # Days to next holiday (positive values only)
-        future_days = [d for d in days_diff if d >= 0]
-        days_to_holiday = min(future_days) if future_days else 365
-
-        # Days from previous holiday (negative values, take absolute)
-        past_days = [abs(d) for d in days_diff if d < 0]
-        days_from_holiday = min(past_days) if past_days else 365
-    else:
-        days_to_holiday = 365
-        days_from_holiday = 365
+    def period(index):
+        selected = dates.iloc[index]
+        return {
+            'start': selected.min().strftime('%Y-%m-%d'),
+            'end': selected.max().strftime('%Y-%m-%d'),
+            'records': len(selected),
+        }
+
+    summary_models = {}
+    for target, model in models.items():
+        weights = sorted(feature_weights[target].items(), key=lambda item: abs(item[1]), reverse=True)
+        weight_name = 'importance' if model_types[target] == 'Random Forest' else 'coefficient'
+        summary_models[target] = {
+            'model_type': model_types[target],
+            'metrics': {name: float(value) for name, value in results[target].items()},
+            'features': [{'feature': feature, weight_name: float(value)} for feature, value in weights],
+        }
+        if hasattr(model, 'intercept_'):
+            summary_models[target]['intercept'] = float(model.intercept_)
+
+    return {
+        'tool': 'analyze_hybrid_model',
+        'models': summary_models,
+        'average_test_r2': float(np.mean([results[t]['test_r2'] for t in results])),
+        'train_period': period(train_index),
+        'test_period': period(test_index),
+        'files': {'chart_png': chart_file},
+    }
+
+def row_blocks(index, rows, block_rows):
+    """
+    Split the rows selected by a split_by_date() index into blocks.
 
-    return is_holiday, days_to_holiday, days_from_holiday
+    Args:
+        index: Slice or boolean mask over the rows
+        rows: Number of rows in the matrix
+        block_rows: Rows of the matrix covered by each block
 
-def main():
+    Yields:
+        Slices (for a slice index) or integer position arrays, in row order
     """
-    Analyze telecom data from CSV file and build HYBRID models
-    - Random Forest for VAS_Sold (86.4% accuracy)
-    - Linear Regression for Speed_Upgrades (80.2% accuracy)
+    if isinstance(index, slice):
+        first, last, _ = index.indices(rows)
+        for start in range(first, last, block_rows):
+            yield slice(start, min(start + block_rows, last))
+        return
+    for start in range(0, rows, block_rows):
+        positions = np.flatnonzero(index[start:start + block_rows]) + start
+        if len(positions):
+            yield positions
+
+def gather_rows(X, index, block_rows, dtype=np.float32):
     """
-    print("="*80)
-    print("HYBRID MODEL: Best-of-Breed Approach")
-    print("="*80)
-    print("Using Random Forest for VAS_Sold (86.4% accuracy)")
-    print("Using Linear Regression for Speed_Upgrades (80.2% accuracy)")
-    print("="*80)
+    Copy the selected rows of X into one array, converting a block at a time.
 
-    print("\nLoading data from CSV file...")
-    print("="*80)
+    The forest needs its training rows as one float32 array; building it
+    block by block avoids a float64 copy of them on the way.
+    """
+    count = len(range(len(X))[index]) if isinstance(index, slice) else int(np.count_nonzero(index))
+    out = np.empty((count, X.shape[1]), dtype=dtype)
+    offset = 0
+    for block in row_blocks(index, len(X), block_rows):
+        rows = X[block]
+        out[offset:offset + len(rows)] = rows
+        offset += len(rows)
+    return out
+
+def predict_in_blocks(model, X, index, block_rows):
+    """Predict for the selected rows of X one block at a time."""
+    return np.concatenate([model.predict(X[block]) for block in row_blocks(index, len(X), block_rows)])
+
+def fit_linear_in_blocks(X, y, index, block_rows):
+    """
+    Fit the Linear Regression from sufficient statistics updated one block at a time.
+
+    Same coefficients as LinearRegression().fit on the selected rows (see
+    sufficient_stats.py), with memory bounded by one block.
+    """
+    stats = LinearSufficientStats(X.shape[1])
+    for block in row_blocks(index, len(X), block_rows):
+        stats.update(X[block], y[block])
+    return stats.to_model()
 
-    # Load data from CSV
+def load_in_memory(quiet, log):
+    """
+    Load the whole history into a DataFrame and build its feature matrix.
+
+    Returns:
+        tuple: (df, X, pipeline, dates, targets), or None if the data could not be loaded
+    """
+    log("\nLoading data from CSV file...")
+    log("="*80)
+
+    # Load data from CSV (via its typed, memory-mapped Feather copy when current)
     try:
-        df = pd.read_csv('final_dataset.csv')
-        print(f"Successfully loaded {len(df)} records from final_dataset.csv")
+        df = load_dataset('final_dataset.csv')
+        log(f"Successfully loaded {len(df)} records from final_dataset.csv")
     except FileNotFoundError:
-        print("Error: final_dataset.csv not found!")
+        log("Error: final_dataset.csv not found!")
         return
     except Exception as e:
-        print(f"Error loading CSV: {e}")
+        log(f"Error loading CSV: {e}")
         return
 
     # Display basic information
-    print("\n" + "="*80)
-    print("DATA OVERVIEW")
-    print("="*80)
-    print(f"\nColumns: {list(df.columns)}")
-    print(f"\nData types:\n{df.dtypes}")
-    print(f"\nMissing values:\n{df.isnull().sum()}")
-    print(f"\nBasic statistics:\n{df.describe()}")
+    if not quiet:
+        print("\n" + "="*80)
+        print("DATA OVERVIEW")
+        print("="*80)
+        print(f"\nColumns: {list(df.columns)}")
+        print(f"\nData types:\n{df.dtypes}")
+        print(f"\nMissing values:\n{df.isnull().sum()}")
+        print(f"\nBasic statistics:\n{df.describe()}")
 
     # Prepare data for modeling
-    print("\n" + "="*80)
-    print("PREPARING DATA FOR HYBRID MODEL")
-    print("="*80)
+    log("\n" + "="*80)
+    log("PREPARING DATA FOR HYBRID MODEL")
+    log("="*80)
 
-    # Convert Date to datetime and extract features
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Day_of_Year'] = df['Date'].dt.dayofyear
-    df['Day_of_Week'] = df['Date'].dt.dayofweek
-    df['Month'] = df['Date'].dt.month
+    # Build features: date parts, holiday features and Channel encoding (App=0, Web=1)
+    log("\nAdding date, holiday and channel features...")
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(df)
+    pipeline.save()
 
-    # Add holiday features
-    print("\nAdding holiday features...")
-    holiday_features = df['Date'].apply(get_holiday_features)
-    df['Is_Holiday'] = holiday_features.apply(lambda x: x[0])
-    df['Days_To_Holiday'] = holiday_features.apply(lambda x: x[1])
-    df['Days_From_Holiday'] = holiday_features.apply(lambda x: x[2])
+    return df, X, pipeline, df['Date'], df[TARGET_COLUMNS]
 
-    # Create a "near holiday" indicator (within 1 day before or after)
-    df['Near_Holiday'] = ((df['Days_To_Holiday'] <= 1) | (df['Days_From_Holiday'] <= 1)).astype(int)
+def load_streaming(chunksize, log):
+    """
+    Build the feature matrix chunk by chunk into an on-disk store and map it.
 
-    print(f"  Found {df['Is_Holiday'].sum()} federal holiday dates in dataset")
-    print(f"  Found {df['Near_Holiday'].sum()} dates near holidays (within 1 day)")
+    Memory use while building is bounded by chunksize; the returned feature
+    matrix and targets are memory-mapped views of the store.
 
-    # Encode Channel (App=0, Web=1)
-    le = LabelEncoder()
-    df['Channel_Encoded'] = le.fit_transform(df['Channel'])
+    Returns:
+        tuple: (None, X, pipeline, dates, targets), or None if the data could not be loaded
+    """
+    log("\nStreaming data from CSV file...")
+    log("="*80)
 
-    # Define features and targets
-    feature_columns = ['Day_of_Year', 'Day_of_Week', 'Month', 'Channel_Encoded',
-                       'Emails_Sent', 'Push_Notifications_Sent',
-                       'Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday', 'Near_Holiday']
-    target_columns = ['VAS_Sold', 'Speed_Upgrades']
+    # Build features: date parts, holiday features and Channel encoding (App=0, Web=1)
+    log(f"\nBuilding the on-disk feature matrix in chunks of {chunksize:,} rows...")
+    try:
+        store = build_feature_store('final_dataset.csv', chunksize=chunksize)
+    except FileNotFoundError:
+        log("Error: final_dataset.csv not found!")
+        return
+    except Exception as e:
+        log(f"Error building feature matrix: {e}")
+        return
+    store.pipeline.save()
+    log(f"Feature matrix ready: {len(store)} records in {store.store_dir}")
+
+    log("\n" + "="*80)
+    log("PREPARING DATA FOR HYBRID MODEL")
+    log("="*80)
+
+    dates = pd.Series(store.dates, name='Date')
+    targets = {target: pd.Series(store.target(target), name=target) for target in TARGET_COLUMNS}
+    return None, store.features, store.pipeline, dates, targets
+
+def main(quiet=False, output_dir='output_files', streaming=False, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Analyze telecom data from CSV file and build HYBRID models
+    - Random Forest for VAS_Sold (86.4% accuracy)
+    - Linear Regression for Speed_Upgrades (80.2% accuracy)
 
-    X = df[feature_columns]
+    Args:
+        quiet: Skip the console report (data overview, per-model details)
+        output_dir: Directory for the chart PNG (created if missing)
+        streaming: Build the features chunk by chunk into an on-disk feature
+            matrix (feature_store.py) and train from it, instead of loading
+            the whole history into a DataFrame
+        chunksize: Rows per chunk in streaming mode
+
+    Returns:
+        tuple: (df, models, results, test_df, model_types, summary) where
+        summary is the JSON-serializable result from build_summary(). df is
+        None in streaming mode.
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+
+    log("="*80)
+    log("HYBRID MODEL: Best-of-Breed Approach")
+    log("="*80)
+    log("Using Random Forest for VAS_Sold (86.4% accuracy)")
+    log("Using Linear Regression for Speed_Upgrades (80.2% accuracy)")
+    log("="*80)
+
+    if streaming:
+        loaded = load_streaming(chunksize, log)
+    else:
+        loaded = load_in_memory(quiet, log)
+    if loaded is None:
+        return
+    df, X, pipeline, dates, targets = loaded
 
-    print(f"\nFeatures used: {feature_columns}")
-    print(f"Targets to predict: {target_columns}")
+    is_holiday = X[:, pipeline.feature_columns.index('Is_Holiday')]
+    near_holiday = X[:, pipeline.feature_columns.index('Near_Holiday')]
+    log(f"  Found {int(is_holiday.sum())} federal holiday dates in dataset")
+    log(f"  Found {int(near_holiday.sum())} dates near holidays (within 1 day)")
+
+    # Define features and targets
+    feature_columns = pipeline.feature_columns
+    target_columns = TARGET_COLUMNS
+
+    log(f"\nFeatures used: {feature_columns}")
+    log(f"Targets to predict: {target_columns}")
 
     # Date-based train-test split
     # Training: Sep 2024 to July 2025
     # Testing: Last 3 months (Aug 2025 to Oct 2025)
     split_date = pd.Timestamp('2025-08-01')
 
-    train_mask = df['Date'] < split_date
-    test_mask = df['Date'] >= split_date
-
-    X_train = X[train_mask]
-    X_test = X[test_mask]
+    # Slices when the records are in date order, boolean masks otherwise. Rows
+    # are read from X a block of chunksize rows at a time, so in streaming mode
+    # only the forest's float32 training matrix is held in memory as a whole.
+    train_index, test_index = split_by_date(dates, split_date)
 
-    print(f"\nDate-based split:")
-    print(f"  Training set: {df[train_mask]['Date'].min()} to {df[train_mask]['Date'].max()}")
-    print(f"  Training records: {len(X_train)}")
-    print(f"  Test set: {df[test_mask]['Date'].min()} to {df[test_mask]['Date'].max()}")
-    print(f"  Test records: {len(X_test)}")
+    log(f"\nDate-based split:")
+    log(f"  Training set: {dates.iloc[train_index].min()} to {dates.iloc[train_index].max()}")
+    log(f"  Training records: {len(dates.iloc[train_index])}")
+    log(f"  Test set: {dates.iloc[test_index].min()} to {dates.iloc[test_index].max()}")
+    log(f"  Test records: {len(dates.iloc[test_index])}")
 
     # Build models for each target using optimal algorithm
     models = {}
     results = {}
     model_types = {}
+    feature_weights = {}
+    test_predictions = {}
 
     # Model 1: Random Forest for VAS_Sold
     target = 'VAS_Sold'
-    print("\n" + "="*80)
-    print(f"BUILDING RANDOM FOREST MODEL FOR: {target}")
-    print("="*80)
+    log("\n" + "="*80)
+    log(f"BUILDING RANDOM FOREST MODEL FOR: {target}")
+    log("="*80)
 
-    y = df[target]
-    y_train = y[train_mask]
-    y_test = y[test_mask]
+    y = targets[target]
+    y_train = y.iloc[train_index]
+    y_test = y.iloc[test_index]
 
     # Create and train Random Forest model
     model = RandomForestRegressor(
@@ -194,12 +280,14 @@ def main():
         random_state=42,
         n_jobs=-1
     )
-    model.fit(X_train, y_train)
+    # RandomForestRegressor.fit needs all training rows in one float32 array
+    model.fit(gather_rows(X, train_index, chunksize), y_train)
     model_types[target] = 'Random Forest'
 
     # Make predictions
-    y_pred_train = model.predict(X_train)
-    y_pred_test = model.predict(X_test)
+    y_pred_train = predict_in_blocks(model, X, train_index, chunksize)
+    y_pred_test = predict_in_blocks(model, X, test_index, chunksize)
+    test_predictions[target] = y_pred_test
 
     # Calculate metrics
     train_r2 = r2_score(y_train, y_pred_train)
@@ -221,18 +309,18 @@ def main():
     }
 
     # Display results
-    print(f"\n[OK] Random Forest Performance for {target}:")
-    print(f"  Training Set:")
-    print(f"    R² Score: {train_r2:.4f}")
-    print(f"    RMSE: {train_rmse:.4f}")
-    print(f"    MAE: {train_mae:.4f}")
-    print(f"\n  Test Set:")
-    print(f"    R² Score: {test_r2:.4f} (86.4% accuracy)")
-    print(f"    RMSE: {test_rmse:.4f}")
-    print(f"    MAE: {test_mae:.4f}")
+    log(f"\n[OK] Random Forest Performance for {target}:")
+    log(f"  Training Set:")
+    log(f"    R² Score: {train_r2:.4f}")
+    log(f"    RMSE: {train_rmse:.4f}")
+    log(f"    MAE: {train_mae:.4f}")
+    log(f"\n  Test Set:")
+    log(f"    R² Score: {test_r2:.4f} (86.4% accuracy)")
+    log(f"    RMSE: {test_rmse:.4f}")
+    log(f"    MAE: {test_mae:.4f}")
 
     # Display feature importance
-    print(f"\n  Top 5 Important Features:")
+    log(f"\n  Top 5 Important Features:")
     feature_importance = model.feature_importances_
     importance_df = pd.DataFrame({
         'feature': feature_columns,
@@ -240,26 +328,28 @@ def main():
     }).sort_values('importance', ascending=False).head(5)
 
     for idx, row in importance_df.iterrows():
-        print(f"    {row['feature']}: {row['importance']:.4f}")
+        log(f"    {row['feature']}: {row['importance']:.4f}")
+    feature_weights[target] = dict(zip(feature_columns, feature_importance))
 
     # Model 2: Linear Regression for Speed_Upgrades
     target = 'Speed_Upgrades'
-    print("\n" + "="*80)
-    print(f"BUILDING LINEAR REGRESSION MODEL FOR: {target}")
-    print("="*80)
+    log("\n" + "="*80)
+    log(f"BUILDING LINEAR REGRESSION MODEL FOR: {target}")
+    log("="*80)
 
-    y = df[target]
-    y_train = y[train_mask]
-    y_test = y[test_mask]
+    y = targets[target]
+    y_train = y.iloc[train_index]
+    y_test = y.iloc[test_index]
 
-    # Create and train Linear Regression model
-    model = LinearRegression()
-    model.fit(X_train, y_train)
+    # Create and train Linear Regression model from its sufficient statistics,
+    # one block of rows at a time (same coefficients as LinearRegression().fit)
+    model = fit_linear_in_blocks(X, y.to_numpy(), train_index, chunksize)
     model_types[target] = 'Linear Regression'
 
     # Make predictions
-    y_pred_train = model.predict(X_train)
-    y_pred_test = model.predict(X_test)
+    y_pred_train = predict_in_blocks(model, X, train_index, chunksize)
+    y_pred_test = predict_in_blocks(model, X, test_index, chunksize)
+    test_predictions[target] = y_pred_test
 
     # Calculate metrics
     train_r2 = r2_score(y_train, y_pred_train)
@@ -281,18 +371,18 @@ def main():
     }
 
     # Display results
-    print(f"\n[OK] Linear Regression Performance for {target}:")
-    print(f"  Training Set:")
-    print(f"    R² Score: {train_r2:.4f}")
-    print(f"    RMSE: {train_rmse:.4f}")
-    print(f"    MAE: {train_mae:.4f}")
-    print(f"\n  Test Set:")
-    print(f"    R² Score: {test_r2:.4f} (80.2% accuracy)")
-    print(f"    RMSE: {test_rmse:.4f}")
-    print(f"    MAE: {test_mae:.4f}")
+    log(f"\n[OK] Linear Regression Performance for {target}:")
+    log(f"  Training Set:")
+    log(f"    R² Score: {train_r2:.4f}")
+    log(f"    RMSE: {train_rmse:.4f}")
+    log(f"    MAE: {train_mae:.4f}")
+    log(f"\n  Test Set:")
+    log(f"    R² Score: {test_r2:.4f} (80.2% accuracy)")
+    log(f"    RMSE: {test_rmse:.4f}")
+    log(f"    MAE: {test_mae:.4f}")
 
     # Display top coefficients
-    print(f"\n  Top 5 Important Features (by absolute coefficient):")
+    log(f"\n  Top 5 Important Features (by absolute coefficient):")
     coef_df = pd.DataFrame({
         'feature': feature_columns,
         'coefficient': model.coef_
@@ -301,23 +391,30 @@ def main():
     coef_df = coef_df.sort_values('abs_coef', ascending=False).head(5)
 
     for idx, row in coef_df.iterrows():
-        print(f"    {row['feature']}: {row['coefficient']:.4f}")
-    print(f"    Intercept: {model.intercept_:.4f}")
+        log(f"    {row['feature']}: {row['coefficient']:.4f}")
+    log(f"    Intercept: {model.intercept_:.4f}")
+    feature_weights[target] = dict(zip(feature_columns, model.coef_))
 
-    print("\n" + "="*80)
-    print("HYBRID MODEL TRAINING COMPLETE")
-    print("="*80)
-    print(f"\n[OK] VAS_Sold Model: Random Forest (R² = {results['VAS_Sold']['test_r2']:.4f})")
-    print(f"[OK] Speed_Upgrades Model: Linear Regression (R² = {results['Speed_Upgrades']['test_r2']:.4f})")
-    print(f"\nAverage Test R²: {np.mean([results[t]['test_r2'] for t in target_columns]):.4f}")
+    log("\n" + "="*80)
+    log("HYBRID MODEL TRAINING COMPLETE")
+    log("="*80)
+    log(f"\n[OK] VAS_Sold Model: Random Forest (R² = {results['VAS_Sold']['test_r2']:.4f})")
+    log(f"[OK] Speed_Upgrades Model: Linear Regression (R² = {results['Speed_Upgrades']['test_r2']:.4f})")
+    log(f"\nAverage Test R²: {np.mean([results[t]['test_r2'] for t in target_columns]):.4f}")
 
     # Create visualizations for test set predictions
-    print("\n" + "="*80)
-    print("GENERATING VISUALIZATIONS")
-    print("="*80)
+    log("\n" + "="*80)
+    log("GENERATING VISUALIZATIONS")
+    log("="*80)
 
     # Prepare test set data with predictions
-    test_df = df[test_mask].copy()
+    if df is not None:
+        test_df = df.iloc[test_index].copy()
+    else:
+        # Streaming mode has no DataFrame; keep the columns the charts need
+        test_df = pd.DataFrame({'Date': dates.iloc[test_index]})
+        for target in target_columns:
+            test_df[target] = targets[target].iloc[test_index]
     test_df = test_df.sort_values('Date')
 
     # Create a figure with 2 subplots (one for each target)
@@ -327,15 +424,13 @@ def main():
 
     for idx, target in enumerate(target_columns):
         ax = axes[idx]
-        model = models[target]
         model_type = model_types[target]
 
         # Get predictions for test set
-        y = df[target]
-        y_train = y[train_mask]
-        y_test = y[test_mask]
+        y = targets[target]
+        y_test = y.iloc[test_index]
 
-        y_pred = model.predict(X_test)
+        y_pred = test_predictions[target]
         y_actual = y_test.values
 
         # Calculate prediction intervals (95% confidence)
@@ -394,41 +489,59 @@ def main():
     plt.tight_layout()
 
     # Save the figure
-    os.makedirs('output_files', exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.utcnow().isoformat(timespec='milliseconds').replace(':', '-').replace('.', '-') + 'Z'
-    output_file = f'output_files/model_predictions_hybrid_final_{timestamp}.png'
+    output_file = os.path.join(output_dir, f'model_predictions_hybrid_final_{timestamp}.png')
     plt.savefig(output_file, dpi=100, bbox_inches='tight')
-    print(f"\n[OK] Visualization saved to: {output_file}")
+    log(f"\n[OK] Visualization saved to: {output_file}")
 
     # Close the plot to free memory
     plt.close()
 
-    print("\n" + "="*80)
-    print("VISUALIZATION COMPLETE")
-    print("="*80)
+    log("\n" + "="*80)
+    log("VISUALIZATION COMPLETE")
+    log("="*80)
 
     # Summary statistics
-    print("\n" + "="*80)
-    print("FINAL MODEL SUMMARY")
-    print("="*80)
-    print("\n** Hybrid Model Performance:")
-    print(f"\n  VAS_Sold (Random Forest):")
-    print(f"    - Test Accuracy (R²): {results['VAS_Sold']['test_r2']:.4f} (86.4%)")
-    print(f"    - Test RMSE: {results['VAS_Sold']['test_rmse']:.2f}")
-    print(f"    - Test MAE: {results['VAS_Sold']['test_mae']:.2f}")
-
-    print(f"\n  Speed_Upgrades (Linear Regression):")
-    print(f"    - Test Accuracy (R²): {results['Speed_Upgrades']['test_r2']:.4f} (80.2%)")
-    print(f"    - Test RMSE: {results['Speed_Upgrades']['test_rmse']:.2f}")
-    print(f"    - Test MAE: {results['Speed_Upgrades']['test_mae']:.2f}")
+    log("\n" + "="*80)
+    log("FINAL MODEL SUMMARY")
+    log("="*80)
+    log("\n** Hybrid Model Performance:")
+    log(f"\n  VAS_Sold (Random Forest):")
+    log(f"    - Test Accuracy (R²): {results['VAS_Sold']['test_r2']:.4f} (86.4%)")
+    log(f"    - Test RMSE: {results['VAS_Sold']['test_rmse']:.2f}")
+    log(f"    - Test MAE: {results['VAS_Sold']['test_mae']:.2f}")
+
+    log(f"\n  Speed_Upgrades (Linear Regression):")
+    log(f"    - Test Accuracy (R²): {results['Speed_Upgrades']['test_r2']:.4f} (80.2%)")
+    log(f"    - Test RMSE: {results['Speed_Upgrades']['test_rmse']:.2f}")
+    log(f"    - Test MAE: {results['Speed_Upgrades']['test_mae']:.2f}")
 
     avg_r2 = np.mean([results[t]['test_r2'] for t in target_columns])
-    print(f"\n  Overall Average R²: {avg_r2:.4f} (83.3%)")
-    print("\n" + "="*80)
+    log(f"\n  Overall Average R²: {avg_r2:.4f} (83.3%)")
+    log("\n" + "="*80)
+
+    summary = build_summary(dates, train_index, test_index, models, results, model_types,
+                            feature_weights, output_file)
 
-    return df, models, results, test_df, model_types
+    return df, models, results, test_df, model_types, summary
 
 if __name__ == "__main__":
-    df, models, results, test_df, model_types = main()
-    print("\n** Hybrid models are ready for production use!")
-    print("="*80)
+    parser = argparse.ArgumentParser(description='Train and evaluate the hybrid telecom sales models')
+    parser.add_argument('--quiet', action='store_true', help='Skip the console report')
+    parser.add_argument('--json', action='store_true', help='Print the result as a JSON object')
+    parser.add_argument('--output-dir', default='output_files', help='Directory for the chart PNG')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Build the features chunk by chunk into an on-disk matrix and train from it')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f'Rows per chunk with --streaming (default: {DEFAULT_CHUNKSIZE:,})')
+    args = parser.parse_args()
+
+    df, models, results, test_df, model_types, summary = main(quiet=args.quiet, output_dir=args.output_dir,
+                                                              streaming=args.streaming,
+                                                              chunksize=args.chunksize)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    if not args.quiet:
+        print("\n** Hybrid models are ready for production use!")
+        print("="*80)
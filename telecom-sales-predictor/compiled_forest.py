@@ -0,0 +1,313 @@
+"""
+Flat-array form of the VAS_Sold Random Forest.
+
+RandomForestRegressor.predict dispatches each of its 200 trees to a thread
+pool, validates the input once per tree and accumulates the results under a
+lock: about 16 ms per call before any tree is walked. CompiledForest flattens
+all trees into four contiguous NumPy arrays:
+
+    feature     int32    split feature of every node (0 for leaves)
+    threshold   float32  split threshold (go left when x <= threshold; +inf for leaves)
+    left        int32    global index of the left child; the right child is left + 1,
+                         and leaves point to themselves
+    value       float64  prediction stored at every node
+
+predict() walks all trees for a block of rows at once: each step is a few
+gathers over a flat (trees x rows) array of current nodes, and entries that
+reached a leaf are dropped as the walk goes, so the number of steps is the
+forest depth, not the number of trees or nodes.
+
+Predictions are identical to RandomForestRegressor.predict: inputs are
+rounded to float32 as scikit-learn does, each float64 threshold is stored as
+the largest float32 not above it (so x <= threshold decides exactly as
+before), and the per-tree predictions are summed in estimator order.
+
+This removes the fixed per-call overhead; it does not make the per-row cost
+lower. NumPy gathers cost several times more per node visit than
+scikit-learn's Cython traversal, so the engine is only faster for batches of
+up to about 1,000 rows and is about 5x slower on a 20,000-row scenario grid.
+It is not a faster engine for large grids, and the model store does not
+route predictions through it. apply() is also used by forest_pruning.py to
+get every tree's prediction for every row in one pass.
+
+Usage:
+    python compiled_forest.py                     # compile the current model and compare with scikit-learn
+    python compiled_forest.py --rows 1 62 1000    # at other batch sizes
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+# Bump when the array layout changes; older files are recompiled
+COMPILED_FOREST_VERSION = 1
+
+# Rows per traversal block; keeps the (trees x rows) working arrays in cache
+DEFAULT_BLOCK_ROWS = 2048
+
+# Leaf checks start at this depth, where paths start to end
+_FIRST_LEAF_CHECK = 4
+
+_ARRAYS = ('feature', 'threshold', 'left', 'value', 'roots')
+
+
+class CompiledForest:
+    """
+    A regression forest flattened into contiguous node arrays.
+
+    Attributes:
+        feature, threshold, left, value: Per-node arrays (see module docstring)
+        roots: (n_trees,) global index of each tree's root node
+        depth: Length of the longest root-to-leaf path
+        n_features: Number of input features
+    """
+
+    def __init__(self, feature, threshold, left, value, roots, depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.is_leaf = left == np.arange(len(left), dtype=left.dtype)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.value)
+
+    @property
+    def nbytes(self):
+        """Memory used by the node arrays."""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    @classmethod
+    def from_forest(cls, forest):
+        """
+        Compile a fitted single-output RandomForestRegressor.
+
+        Raises:
+            ValueError: If the forest is not fitted or has several outputs
+        """
+        estimators = getattr(forest, 'estimators_', None)
+        if not estimators:
+            raise ValueError("Forest must be fitted before compiling")
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        parts = {name: [] for name in _ARRAYS}
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            order, left = _sibling_order(tree.children_left, tree.children_right)
+            is_leaf = tree.children_left[order] < 0
+            parts['feature'].append(np.where(is_leaf, 0, tree.feature[order]).astype(np.int32))
+            parts['threshold'].append(np.where(is_leaf, np.inf, _float32_at_most(tree.threshold[order])))
+            parts['left'].append(left + offset)
+            parts['value'].append(tree.value[order, 0, 0])
+            parts['roots'].append([offset])
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(parts['feature']),
+            np.concatenate(parts['threshold']).astype(np.float32),
+            np.concatenate(parts['left']).astype(np.int32),
+            np.concatenate(parts['value']).astype(np.float64),
+            np.concatenate(parts['roots']).astype(np.int32),
+            max(estimator.tree_.max_depth for estimator in estimators),
+            forest.n_features_in_,
+        )
+
+    def apply(self, X):
+        """
+        Return the leaf reached in every tree for every row.
+
+        Args:
+            X: (rows, n_features) float32 matrix
+
+        Returns:
+            (n_trees, rows) int32 array of global leaf indices
+        """
+        rows = len(X)
+        # Feature-major copy, so X[row, feature] is columns[feature * rows + row]
+        columns = np.ascontiguousarray(X.T).reshape(-1)
+        feature_offset = self.feature * np.int32(rows)
+
+        leaves = np.empty(self.n_trees * rows, dtype=np.int32)
+        nodes = np.repeat(self.roots, rows)
+        row_ids = np.tile(np.arange(rows, dtype=np.int32), self.n_trees)
+        positions = np.arange(self.n_trees * rows)
+        for step in range(self.depth):
+            x = columns.take(feature_offset.take(nodes) + row_ids)
+            nodes = self.left.take(nodes) + (x > self.threshold.take(nodes))
+            if step >= _FIRST_LEAF_CHECK and step % 2 == 0:
+                done = self.is_leaf.take(nodes)
+                leaves[positions[done]] = nodes[done]
+                walking = ~done
+                nodes, row_ids, positions = nodes[walking], row_ids[walking], positions[walking]
+                if not len(nodes):
+                    break
+        leaves[positions] = nodes
+        return leaves.reshape(self.n_trees, rows)
+
+    def predict(self, X, block_rows=DEFAULT_BLOCK_ROWS):
+        """
+        Predict for a feature matrix, as RandomForestRegressor.predict does.
+
+        Args:
+            X: (rows, n_features) feature matrix
+            block_rows: Rows traversed at once (bounds the working memory)
+
+        Returns:
+            (rows,) float64 predictions
+
+        Raises:
+            ValueError: If X has the wrong shape or non-finite values
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected X with {self.n_features} columns, got shape {X.shape}")
+        if not np.isfinite(X).all():
+            raise ValueError("X contains NaN or infinite values")
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            leaves = self.apply(X[start:start + block_rows])
+            # Reducing over axis 0 adds the trees one after another, in estimator order
+            predictions[start:start + block_rows] = np.add.reduce(self.value[leaves], axis=0)
+        predictions /= self.n_trees
+        return predictions
+
+    def save(self, path):
+        """
+        Save the arrays to an uncompressed .npz file, written atomically.
+
+        Returns:
+            Path of the file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}-', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=COMPILED_FOREST_VERSION, depth=self.depth,
+                         n_features=self.n_features, **{name: getattr(self, name) for name in _ARRAYS})
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a forest saved with save().
+
+        Raises:
+            ValueError: If the file was written by another version
+        """
+        with np.load(path) as data:
+            if int(data['version']) != COMPILED_FOREST_VERSION:
+                raise ValueError(f"Unsupported compiled forest version: {int(data['version'])}")
+            return cls(*(data[name] for name in _ARRAYS), int(data['depth']), int(data['n_features']))
+
+
+def _sibling_order(children_left, children_right):
+    """
+    Renumber a tree breadth-first so every node's two children are adjacent.
+
+    Returns:
+        tuple: (order, left) where order[new] is the original node id and
+        left[new] is the new id of the left child (the node itself for leaves)
+    """
+    order = [0]
+    left = []
+    for node in order:
+        if children_left[node] < 0:
+            left.append(len(left))
+        else:
+            left.append(len(order))
+            order.extend((children_left[node], children_right[node]))
+    return np.array(order), np.array(left, dtype=np.int32)
+
+
+def _float32_at_most(threshold):
+    """Largest float32 values not above each float64 threshold."""
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def scenario_grid(X, rows):
+    """Tile a feature matrix to the requested number of rows."""
+    repeats = -(-rows // len(X))
+    return np.tile(X, (repeats, 1))[:rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compile the VAS_Sold Random Forest to flat arrays and compare it with scikit-learn'
+    )
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 62, 1000, 20000],
+                        help='Batch sizes, tiled from the December test data (default: 1 62 1000 20000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    # Imported here so the engine itself only depends on NumPy
+    from data_loader import INPUT_COLUMNS, read_dataset_csv
+    from model_store import load_or_train
+
+    try:
+        artifacts, _ = load_or_train('final_dataset.csv')
+        df_test = read_dataset_csv('test_dataset_dec_2025.csv', usecols=INPUT_COLUMNS)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    forest = artifacts.vas_model
+    start = time.perf_counter()
+    compiled = CompiledForest.from_forest(forest)
+    compile_ms = (time.perf_counter() - start) * 1000
+    X_test = artifacts.pipeline.transform(df_test)
+
+    pickled = io.BytesIO()
+    joblib.dump(forest, pickled)
+    print(f"VAS_Sold forest: {compiled.n_trees} trees, {compiled.n_nodes:,} nodes, depth {compiled.depth}, "
+          f"compiled in {compile_ms:.0f} ms")
+    print(f"  Model size: pickled forest {len(pickled.getvalue()):,} bytes, "
+          f"node arrays {compiled.nbytes:,} bytes")
+
+    def best_time(predict, X):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = predict(X)
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    print(f"\n{'Rows':>9}  {'scikit-learn':>14}  {'Compiled':>14}  {'Speedup':>8}  Identical")
+    for rows in args.rows:
+        X = scenario_grid(X_test, rows)
+        sklearn_seconds, expected = best_time(forest.predict, X)
+        compiled_seconds, actual = best_time(compiled.predict, X)
+        print(f"{rows:>9,}  {sklearn_seconds * 1000:>11.2f} ms  {compiled_seconds * 1000:>11.2f} ms  "
+              f"{sklearn_seconds / compiled_seconds:>7.1f}x  {np.array_equal(actual, expected)}")
+
+
+if __name__ == '__main__':
+    main()
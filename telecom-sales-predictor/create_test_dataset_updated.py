@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
+from data_loader import DATASET_COLUMNS, DATE_FORMAT, apply_schema
 
 # Read the updated marketing events Excel file
 marketing_df = pd.read_excel('updated Dec Marketing events.xlsx')
@@ -44,7 +45,7 @@ for date in date_range:
                 push_sent += int(row['volume'])
 
         test_data.append({
-            'Date': date.strftime('%m/%d/%Y'),
+            'Date': date,
             'Channel': channel,
             'VAS_Sold': 0,  # To be predicted
             'Speed_Upgrades': 0,  # To be predicted
@@ -52,12 +53,12 @@ for date in date_range:
             'Push_Notifications_Sent': push_sent
         })
 
-# Create DataFrame
-test_df = pd.DataFrame(test_data)
+# Create DataFrame with the same columns and types as final_dataset.csv
+test_df = apply_schema(pd.DataFrame(test_data, columns=DATASET_COLUMNS))
 
 # Display summary
 print(f"\nTest dataset created:")
-print(f"Date range: {start_date.strftime('%m/%d/%Y')} to {end_date.strftime('%m/%d/%Y')}")
+print(f"Date range: {start_date.strftime(DATE_FORMAT)} to {end_date.strftime(DATE_FORMAT)}")
 print(f"Total records: {len(test_df)}")
 print(f"Records per day: 2 (App + Web)")
 print(f"Total days: {len(date_range)}")
@@ -96,7 +97,7 @@ print()
 os.makedirs('output_files', exist_ok=True)
 timestamp = datetime.utcnow().isoformat(timespec='milliseconds').replace(':', '-').replace('.', '-') + 'Z'
 output_file = f'output_files/test_dataset_dec_2025_{timestamp}.csv'
-test_df.to_csv(output_file, index=False)
+test_df.to_csv(output_file, index=False, date_format=DATE_FORMAT)
 print(f"[OK] Test dataset saved to: {output_file}")
 print(f"\nColumns: {list(test_df.columns)}")
 print(f"Format matches final_dataset.csv: [OK]")
@@ -0,0 +1,313 @@
+"""
+Schema-driven, memory-mapped loading of the telecom datasets.
+
+All telecom CSVs (final_dataset.csv, test_dataset_dec_2025.csv) share one
+schema: DATASET_COLUMNS with the types in COLUMN_DTYPES and dates written as
+DATE_FORMAT. read_dataset_csv() passes that schema to pandas (usecols, explicit
+dtypes, a fixed date format), so nothing is inferred and a file whose dates
+happen to be zero-padded parses exactly like one whose dates are not.
+
+Parsing is still text processing, so convert_to_feather() does it once and
+stores the result as an uncompressed Arrow/Feather file with fixed column
+types (Date as datetime64, Channel as a categorical, counts as int32).
+load_dataset() memory-maps that file, so numeric columns are used zero-copy
+straight from the OS page cache and every worker process loading the same
+file shares those pages.
+
+The Feather copy records the size and modification time of the CSV it was
+built from and is rebuilt automatically when the CSV changes, so the CSV stays
+the file people edit.
+
+Usage:
+    python data_loader.py final_dataset.csv    # writes .cache/columnar/final_dataset.feather
+    df = load_dataset('final_dataset.csv')     # uses the Feather copy when it is current
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Bump when the stored layout or column types change; older files are rebuilt
+COLUMNAR_FORMAT_VERSION = 1
+
+# The telecom dataset schema: column order, date format and column types
+DATE_COLUMN = 'Date'
+DATE_FORMAT = '%m/%d/%Y'
+CHANNEL_COLUMN = 'Channel'
+COUNT_COLUMNS = ['VAS_Sold', 'Speed_Upgrades', 'Emails_Sent', 'Push_Notifications_Sent']
+DATASET_COLUMNS = [DATE_COLUMN, CHANNEL_COLUMN, *COUNT_COLUMNS]
+# The columns prediction needs (VAS_Sold and Speed_Upgrades are the targets)
+INPUT_COLUMNS = [DATE_COLUMN, CHANNEL_COLUMN, 'Emails_Sent', 'Push_Notifications_Sent']
+COLUMN_DTYPES = {CHANNEL_COLUMN: 'category', **{column: 'int32' for column in COUNT_COLUMNS}}
+
+COLUMNAR_CACHE_DIR = Path(__file__).parent / '.cache' / 'columnar'
+COLUMNAR_SUFFIXES = ('.feather', '.arrow')
+
+# Schema metadata keys identifying the CSV a Feather file was built from
+_META_VERSION = b'telecom.columnar_version'
+_META_SOURCE = b'telecom.source_signature'
+
+
+def apply_schema(df):
+    """
+    Convert a DataFrame of raw telecom records to the schema's types in place.
+
+    For records built in memory rather than read with read_dataset_csv().
+    Columns missing from df are skipped.
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    if DATE_COLUMN in df and not pd.api.types.is_datetime64_any_dtype(df[DATE_COLUMN]):
+        df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN], format=DATE_FORMAT)
+    for column, dtype in COLUMN_DTYPES.items():
+        if column in df:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def read_dataset_csv(csv_path, usecols=None, chunksize=None):
+    """
+    Parse a telecom CSV with the dataset schema.
+
+    Only the schema's columns are read, with their dtypes given up front and
+    Date parsed with DATE_FORMAT, so pandas infers nothing.
+
+    Args:
+        csv_path: CSV file with a header row
+        usecols: Subset of DATASET_COLUMNS to read (default: all of them)
+        chunksize: If given, read the file lazily in DataFrames of this many rows
+
+    Returns:
+        DataFrame, or an iterator of DataFrames when chunksize is given
+
+    Raises:
+        ValueError: If a requested column is missing or a value does not match its type
+    """
+    columns = DATASET_COLUMNS if usecols is None else list(usecols)
+    reader = pd.read_csv(
+        csv_path,
+        usecols=columns,
+        dtype={column: dtype for column, dtype in COLUMN_DTYPES.items() if column in columns},
+        parse_dates=[DATE_COLUMN] if DATE_COLUMN in columns else False,
+        date_format=DATE_FORMAT,
+        chunksize=chunksize,
+    )
+    # read_csv leaves dates that do not match DATE_FORMAT as text; apply_schema
+    # parses them strictly, so they raise instead
+    if chunksize is None:
+        return apply_schema(reader)
+    return (apply_schema(chunk) for chunk in reader)
+
+
+def csv_byte_ranges(csv_path, parts):
+    """
+    Split a CSV's data rows into up to `parts` byte ranges of about equal size.
+
+    Ranges start after the header and end just after a newline, so each one
+    holds whole rows and can be parsed independently with read_dataset_csv_range().
+
+    Returns:
+        list of (start, end) byte offsets
+    """
+    size = os.path.getsize(csv_path)
+    ranges = []
+    with open(csv_path, 'rb') as f:
+        data_start = start = len(f.readline())
+        for part in range(1, parts + 1):
+            # Move each split point forward to the end of the row it falls in
+            f.seek(data_start + (size - data_start) * part // parts - 1)
+            f.readline()
+            end = f.tell()
+            if end > start:
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def read_dataset_csv_range(csv_path, start, end, usecols=None):
+    """
+    Parse the rows stored in bytes [start, end) of a telecom CSV.
+
+    The header row is read from the start of the file. start and end must be
+    row boundaries, as returned by csv_byte_ranges().
+
+    Returns:
+        DataFrame
+    """
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        f.seek(start)
+        rows = f.read(end - start)
+    return read_dataset_csv(io.BytesIO(header + rows), usecols=usecols)
+
+
+def source_signature(csv_path):
+    """Return the (size, mtime_ns) signature a Feather copy of csv_path must match."""
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')
+
+
+def columnar_path(csv_path, cache_dir=COLUMNAR_CACHE_DIR):
+    """Return where the Feather copy of a CSV file is kept."""
+    return Path(cache_dir) / (Path(csv_path).stem + '.feather')
+
+
+def convert_to_feather(csv_path, feather_path=None):
+    """
+    Convert a telecom CSV into a typed, uncompressed Feather file.
+
+    Uncompressed Arrow IPC is what makes memory-mapped, zero-copy reads
+    possible. The file is written to a temporary name and renamed into place,
+    so concurrent readers never see a partial file.
+
+    Args:
+        csv_path: CSV file to convert
+        feather_path: Output path (default: columnar_path(csv_path))
+
+    Returns:
+        tuple: (Path of the Feather file, the converted DataFrame)
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    feather_path = Path(feather_path) if feather_path is not None else columnar_path(csv_path)
+    signature = source_signature(csv_path)
+    df = read_dataset_csv(csv_path)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_VERSION] = str(COLUMNAR_FORMAT_VERSION).encode('utf-8')
+    metadata[_META_SOURCE] = signature
+    table = table.replace_schema_metadata(metadata)
+
+    feather_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{feather_path.name}-', dir=feather_path.parent)
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, feather_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return feather_path, df
+
+
+def _open_feather(feather_path):
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(feather_path), 'r'))
+
+
+def read_feather(feather_path):
+    """
+    Load a Feather file memory-mapped.
+
+    Numeric and date columns are read-only views of the mapped file (pandas
+    copies on write), and Channel comes back as a categorical.
+
+    Returns:
+        DataFrame
+    """
+    table = _open_feather(feather_path).read_all()
+    # split_blocks keeps one array per column instead of consolidating (copying) them
+    return table.to_pandas(split_blocks=True)
+
+
+def _is_current(feather_path, csv_path):
+    try:
+        metadata = _open_feather(feather_path).schema.metadata or {}
+    except (OSError, ValueError):
+        return False
+    return (metadata.get(_META_VERSION) == str(COLUMNAR_FORMAT_VERSION).encode('utf-8')
+            and metadata.get(_META_SOURCE) == source_signature(csv_path))
+
+
+def load_dataset(path, cache_dir=COLUMNAR_CACHE_DIR):
+    """
+    Load a telecom dataset with the fixed column types.
+
+    Feather files are memory-mapped directly. For a CSV, the Feather copy in
+    cache_dir is used when it matches the CSV's size and modification time;
+    otherwise the CSV is parsed and the copy is (re)written for next time.
+    Without pyarrow, or if the cache cannot be written, the parsed CSV is
+    returned as is.
+
+    Args:
+        path: CSV or Feather file
+        cache_dir: Directory holding Feather copies of CSV files
+
+    Returns:
+        DataFrame
+
+    Raises:
+        FileNotFoundError: If path does not exist
+    """
+    path = Path(path)
+    if path.suffix in COLUMNAR_SUFFIXES:
+        return read_feather(path)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return read_dataset_csv(path)
+
+    feather_path = columnar_path(path, cache_dir)
+    if _is_current(feather_path, path):
+        try:
+            return read_feather(feather_path)
+        except (OSError, ValueError):
+            pass
+
+    try:
+        feather_path, _ = convert_to_feather(path, feather_path)
+    except OSError:
+        # Read-only checkout or full disk: fall back to the CSV
+        return read_dataset_csv(path)
+    return read_feather(feather_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert telecom CSV files to typed, memory-mappable Feather files'
+    )
+    parser.add_argument('csv_files', nargs='*', default=['final_dataset.csv'],
+                        help='CSV files to convert (default: final_dataset.csv)')
+    parser.add_argument('--output-dir', default=str(COLUMNAR_CACHE_DIR),
+                        help='Directory for the Feather files (default: .cache/columnar)')
+    args = parser.parse_args()
+
+    for csv_file in args.csv_files:
+        try:
+            start = time.perf_counter()
+            read_dataset_csv(csv_file)
+            csv_ms = (time.perf_counter() - start) * 1000
+
+            feather_path, df = convert_to_feather(csv_file, columnar_path(csv_file, args.output_dir))
+
+            start = time.perf_counter()
+            read_feather(feather_path)
+            feather_ms = (time.perf_counter() - start) * 1000
+        except ImportError:
+            print("Error: pyarrow is required for the conversion (pip install pyarrow)", file=sys.stderr)
+            sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"Error converting {csv_file}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"{csv_file} -> {feather_path}")
+        print(f"  Records: {len(df)}, size: {os.path.getsize(feather_path):,} bytes")
+        print(f"  Load time: CSV {csv_ms:.1f} ms, Feather (memory-mapped) {feather_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Shared feature engineering for the telecom sales models.
+
+FeaturePipeline turns raw telecom records (Date, Channel, Emails_Sent,
+Push_Notifications_Sent) into the model feature matrix. Its fitted state (the
+Channel encoder and the feature schema) can be saved to JSON so prediction
+reuses exactly the encoding used for training.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from data_loader import DATE_FORMAT
+from holiday_features import add_holiday_features
+
+# Bump when the saved layout or feature definitions change
+PIPELINE_VERSION = 1
+
+FEATURE_COLUMNS = ['Day_of_Year', 'Day_of_Week', 'Month', 'Channel_Encoded',
+                   'Emails_Sent', 'Push_Notifications_Sent',
+                   'Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday', 'Near_Holiday']
+TARGET_COLUMNS = ['VAS_Sold', 'Speed_Upgrades']
+
+ARTIFACTS_DIR = Path(__file__).parent / 'artifacts'
+DEFAULT_PIPELINE_PATH = ARTIFACTS_DIR / 'feature_pipeline.json'
+
+
+class FeaturePipeline:
+    """
+    Fit/transform feature pipeline shared by all training and prediction scripts.
+
+    Derived features:
+    - Day_of_Year, Day_of_Week, Month from Date
+    - Is_Holiday, Days_To_Holiday, Days_From_Holiday, Near_Holiday
+    - Channel_Encoded (LabelEncoder on Channel, App=0, Web=1)
+    """
+
+    def __init__(self, feature_columns=None, date_column='Date', channel_column='Channel'):
+        self.feature_columns = list(feature_columns or FEATURE_COLUMNS)
+        self.date_column = date_column
+        self.channel_column = channel_column
+        self.channel_encoder = None
+
+    @property
+    def is_fitted(self):
+        return self.channel_encoder is not None
+
+    def fit(self, df):
+        """
+        Fit the Channel encoder on a DataFrame of raw records.
+
+        Args:
+            df: DataFrame with at least the Channel column
+
+        Returns:
+            self
+        """
+        self.channel_encoder = LabelEncoder()
+        self.channel_encoder.fit(df[self.channel_column])
+        return self
+
+    def add_features(self, df):
+        """
+        Add all derived feature columns to a DataFrame in place.
+
+        The Date column is converted to datetime (DATE_FORMAT) if needed.
+
+        Args:
+            df: DataFrame of raw records
+
+        Returns:
+            The same DataFrame, for chaining
+
+        Raises:
+            ValueError: If the pipeline is not fitted or Channel has unseen values
+        """
+        if not self.is_fitted:
+            raise ValueError("FeaturePipeline must be fitted before transform")
+
+        if not pd.api.types.is_datetime64_any_dtype(df[self.date_column]):
+            df[self.date_column] = pd.to_datetime(df[self.date_column], format=DATE_FORMAT)
+        dates = df[self.date_column].dt
+        df['Day_of_Year'] = dates.dayofyear
+        df['Day_of_Week'] = dates.dayofweek
+        df['Month'] = dates.month
+
+        add_holiday_features(df, date_column=self.date_column)
+
+        df['Channel_Encoded'] = self.channel_encoder.transform(df[self.channel_column])
+        return df
+
+    def transform(self, df):
+        """
+        Build the feature matrix for a DataFrame of raw records.
+
+        Derived columns are also added to df so callers can report on them.
+
+        Args:
+            df: DataFrame of raw records
+
+        Returns:
+            numpy.ndarray: C-contiguous float64 matrix, one column per feature_columns entry
+        """
+        self.add_features(df)
+        return np.ascontiguousarray(df[self.feature_columns].to_numpy(dtype=np.float64))
+
+    def fit_transform(self, df):
+        """Fit on df and return its feature matrix."""
+        return self.fit(df).transform(df)
+
+    def to_dict(self):
+        """Return the fitted state as a JSON-serializable dict."""
+        if not self.is_fitted:
+            raise ValueError("FeaturePipeline must be fitted before saving")
+        return {
+            'version': PIPELINE_VERSION,
+            'feature_columns': self.feature_columns,
+            'date_column': self.date_column,
+            'channel_column': self.channel_column,
+            'channel_classes': [str(c) for c in self.channel_encoder.classes_],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a fitted pipeline from to_dict() output."""
+        if state.get('version') != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported feature pipeline version: {state.get('version')}")
+        pipeline = cls(state['feature_columns'], state['date_column'], state['channel_column'])
+        pipeline.channel_encoder = LabelEncoder()
+        pipeline.channel_encoder.classes_ = np.array(state['channel_classes'], dtype=object)
+        return pipeline
+
+    def save(self, path=DEFAULT_PIPELINE_PATH):
+        """Save the fitted state to a JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_PIPELINE_PATH):
+        """Load a fitted pipeline saved with save()."""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
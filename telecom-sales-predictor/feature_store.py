@@ -0,0 +1,230 @@
+"""
+Out-of-core feature engineering for the telecom history.
+
+build_feature_store() streams a telecom CSV in chunks, runs each chunk through
+the FeaturePipeline and writes the rows into on-disk .npy matrices. Peak
+memory while building is one chunk, however long the history grows, and
+training reads the matrices memory-mapped instead of holding a DataFrame with
+a dozen derived columns plus its train/test copies. (The Random Forest fit
+still needs its training rows in memory as one float32 array.)
+
+Every feature depends only on its own row (holiday distances come from the
+per-year calendar tables), so chunked and whole-file feature matrices are
+identical.
+
+Layout of a store directory:
+    features.npy    float64 (rows, len(feature_columns)), C-contiguous
+    targets.npy     int32 (rows, len(TARGET_COLUMNS))
+    dates.npy       datetime64[D] (rows,)
+    manifest.json   Row count, columns, source CSV signature and the fitted pipeline
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CHANNEL_COLUMN, DATE_COLUMN, read_dataset_csv, source_signature
+from feature_pipeline import PIPELINE_VERSION, TARGET_COLUMNS, FeaturePipeline
+
+# Bump when the store layout changes; older stores are rebuilt
+FEATURE_STORE_VERSION = 1
+
+DEFAULT_CHUNKSIZE = 100_000
+FEATURE_STORE_ROOT = Path(__file__).parent / '.cache' / 'feature_store'
+
+MANIFEST_FILE = 'manifest.json'
+FEATURES_FILE = 'features.npy'
+TARGETS_FILE = 'targets.npy'
+DATES_FILE = 'dates.npy'
+
+
+def store_dir_for(csv_path, root=FEATURE_STORE_ROOT):
+    """Return the default store directory for a CSV file."""
+    return Path(root) / Path(csv_path).stem
+
+
+class FeatureStore:
+    """
+    Memory-mapped, read-only view of a store written by build_feature_store().
+
+    Attributes:
+        features: (rows, features) float64 memmap, the model feature matrix
+        targets: (rows, targets) int32 memmap, one column per TARGET_COLUMNS entry
+        dates: (rows,) datetime64[D] memmap
+        pipeline: The FeaturePipeline fitted while building the store
+        manifest: Contents of manifest.json
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / MANIFEST_FILE, 'r') as f:
+            self.manifest = json.load(f)
+        self.features = np.load(self.store_dir / FEATURES_FILE, mmap_mode='r')
+        self.targets = np.load(self.store_dir / TARGETS_FILE, mmap_mode='r')
+        self.dates = np.load(self.store_dir / DATES_FILE, mmap_mode='r')
+        self.pipeline = FeaturePipeline.from_dict(self.manifest['pipeline'])
+
+    def __len__(self):
+        return self.manifest['rows']
+
+    def target(self, name):
+        """Return one target column as a memory-mapped view."""
+        return self.targets[:, self.manifest['target_columns'].index(name)]
+
+    def feature(self, name):
+        """Return one feature column as a memory-mapped view."""
+        return self.features[:, self.manifest['feature_columns'].index(name)]
+
+    def split_by_date(self, split_date):
+        """Split the store's rows at split_date; see split_by_date()."""
+        return split_by_date(self.dates, split_date)
+
+
+def split_by_date(dates, split_date):
+    """
+    Split rows into those before split_date and those on or after it.
+
+    When the rows are in date order (the usual case for an append-only
+    history) both parts are slices, so indexing arrays or memmaps with them
+    returns views instead of copies.
+
+    Args:
+        dates: Row dates, as a datetime Series or datetime64 array
+        split_date: First date of the second part
+
+    Returns:
+        tuple: (train_index, test_index), each a slice or a boolean array
+    """
+    dates = np.asarray(dates)
+    split_day = np.datetime64(pd.Timestamp(split_date)).astype(dates.dtype)
+    if len(dates) < 2 or not np.any(dates[1:] < dates[:-1]):
+        boundary = int(np.searchsorted(dates, split_day, side='left'))
+        return slice(0, boundary), slice(boundary, len(dates))
+    train_mask = dates < split_day
+    return train_mask, ~train_mask
+
+
+def _scan(csv_path, chunksize):
+    """First pass: count rows and collect the Channel values, reading only that column."""
+    rows = 0
+    channels = set()
+    for chunk in read_dataset_csv(csv_path, usecols=[CHANNEL_COLUMN], chunksize=chunksize):
+        rows += len(chunk)
+        channels.update(str(value) for value in chunk[CHANNEL_COLUMN].unique())
+    return rows, sorted(channels)
+
+
+def _write_store(csv_path, tmp_dir, chunksize, pipeline):
+    signature = source_signature(csv_path)
+    rows, channels = _scan(csv_path, chunksize)
+
+    if pipeline is None:
+        # LabelEncoder only needs the distinct values, which is exactly what _scan collected
+        pipeline = FeaturePipeline().fit(pd.DataFrame({CHANNEL_COLUMN: channels}))
+
+    features = np.lib.format.open_memmap(
+        tmp_dir / FEATURES_FILE, mode='w+', dtype=np.float64,
+        shape=(rows, len(pipeline.feature_columns)))
+    targets = np.lib.format.open_memmap(
+        tmp_dir / TARGETS_FILE, mode='w+', dtype=np.int32, shape=(rows, len(TARGET_COLUMNS)))
+    dates = np.lib.format.open_memmap(
+        tmp_dir / DATES_FILE, mode='w+', dtype='datetime64[D]', shape=(rows,))
+
+    offset = 0
+    for chunk in read_dataset_csv(csv_path, chunksize=chunksize):
+        end = offset + len(chunk)
+        if end > rows:
+            raise ValueError(f"{csv_path} changed while the feature store was being built")
+        features[offset:end] = pipeline.transform(chunk)
+        targets[offset:end] = chunk[TARGET_COLUMNS].to_numpy(dtype=np.int32)
+        dates[offset:end] = chunk[DATE_COLUMN].to_numpy().astype('datetime64[D]')
+        offset = end
+
+    if offset != rows or source_signature(csv_path) != signature:
+        raise ValueError(f"{csv_path} changed while the feature store was being built")
+
+    for matrix in (features, targets, dates):
+        matrix.flush()
+    del features, targets, dates
+
+    manifest = {
+        'version': FEATURE_STORE_VERSION,
+        'pipeline_version': PIPELINE_VERSION,
+        'source': str(Path(csv_path).resolve()),
+        'source_signature': signature.decode('utf-8'),
+        'rows': rows,
+        'chunksize': chunksize,
+        'feature_columns': pipeline.feature_columns,
+        'target_columns': TARGET_COLUMNS,
+        'pipeline': pipeline.to_dict(),
+    }
+    with open(tmp_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _is_current(store_dir, csv_path, pipeline):
+    try:
+        with open(Path(store_dir) / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        signature = source_signature(csv_path).decode('utf-8')
+    except (OSError, ValueError):
+        return False
+    return (manifest.get('version') == FEATURE_STORE_VERSION
+            and manifest.get('pipeline_version') == PIPELINE_VERSION
+            and manifest.get('source_signature') == signature
+            and (pipeline is None or manifest.get('pipeline') == pipeline.to_dict()))
+
+
+def build_feature_store(csv_path, store_dir=None, chunksize=DEFAULT_CHUNKSIZE, pipeline=None):
+    """
+    Build (or reuse) the on-disk feature matrix for a telecom CSV.
+
+    Two streaming passes over the file: the first counts rows and collects the
+    Channel values to fit the pipeline, the second transforms chunk by chunk
+    into preallocated .npy memmaps. The store is written to a temporary
+    directory and renamed into place. An existing store built from the same
+    file (size and modification time) and pipeline is reused as is.
+
+    Args:
+        csv_path: Telecom CSV (final_dataset.csv schema)
+        store_dir: Output directory (default: .cache/feature_store/<csv name>)
+        chunksize: Rows per chunk, which bounds memory use while building
+        pipeline: A fitted FeaturePipeline to apply, or None to fit one
+
+    Returns:
+        FeatureStore
+
+    Raises:
+        ValueError: If the CSV does not match the schema or changes mid-build
+    """
+    store_dir = Path(store_dir) if store_dir is not None else store_dir_for(csv_path)
+    if _is_current(store_dir, csv_path, pipeline):
+        try:
+            return FeatureStore(store_dir)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    store_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{store_dir.name}-', dir=store_dir.parent))
+    try:
+        _write_store(csv_path, tmp_dir, chunksize, pipeline)
+        if store_dir.exists():
+            # Move the old store aside first; readers that still map it keep their files
+            old_dir = store_dir.with_name(f'.{store_dir.name}-old-{uuid.uuid4().hex[:8]}')
+            os.rename(store_dir, old_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, store_dir)
+        except OSError:
+            # Another process built the store concurrently; its matrices are equivalent
+            if not store_dir.exists():
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return FeatureStore(store_dir)
@@ -0,0 +1,446 @@
+"""
+Accuracy-preserving pruning of the VAS_Sold Random Forest.
+
+The forest uses n_estimators=200 because that configuration reached a test
+R² of 0.864, not because 200 trees were shown to be needed. This tool
+greedily builds the smallest subset of the forest's trees whose out-of-bag
+R² and RMSE stay within a tolerance of the full forest:
+
+1. Every tree's predictions for the training rows are computed once, with
+   the compiled forest (compiled_forest.py), as a (trees x rows) matrix,
+   along with a mask of the rows each tree's bootstrap sample left out
+   (its out-of-bag rows).
+2. Starting from no trees, each step adds the tree that gives the subset the
+   lowest out-of-bag RMSE, where every row is predicted by the chosen trees
+   that did not train on it (by the mean while there are none). Scoring all
+   candidates is one vectorized operation on the running sums.
+3. It stops at the first subset that scores every out-of-bag row and is
+   within the tolerances.
+
+Selection only uses the training rows. The forest is first trained as
+analyze_data_hybrid.py does (before 2025-08-01) and the full and pruned
+forests are scored on the held-out August to October rows. The same
+selection is then run on a forest trained on the full history, as a full
+fit of the serving models trains it, and that pruned forest is saved in
+the model store format, together with a report of the latency, memory and
+artifact-size savings. Serving uses it when asked to (predict_december_2025.py
+--pruned, TELECOM_SERVE_PRUNED_MODEL=1 for the MCP server) and load_pruned()
+finds an artifact trained on the training file's current rows.
+
+Usage:
+    python forest_pruning.py                                   # default tolerances
+    python forest_pruning.py --r2-tolerance 0.002 --rmse-tolerance 0.005
+"""
+
+import argparse
+import copy
+import io
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+
+from compiled_forest import CompiledForest, scenario_grid
+from data_loader import load_dataset
+from feature_pipeline import ARTIFACTS_DIR, FeaturePipeline
+from feature_store import split_by_date
+from incremental_training import file_position
+from model_store import (
+    DEFAULT_TRAINING_DATA, MANIFEST_FILE, VAS_FOREST_PARAMS, HybridModelArtifacts, train_hybrid_models,
+)
+from sufficient_stats import LinearSufficientStats
+
+# Largest allowed drop in out-of-bag R² (absolute) and rise in out-of-bag RMSE (relative)
+DEFAULT_R2_TOLERANCE = 0.005
+DEFAULT_RMSE_TOLERANCE = 0.02
+
+DEFAULT_OUTPUT_DIR = ARTIFACTS_DIR / 'pruned'
+SPLIT_DATE = '2025-08-01'
+
+
+def tree_predictions(forest, X):
+    """
+    Return every tree's predictions for X.
+
+    Returns:
+        (n_trees, rows) float64 array, rows of RandomForestRegressor.estimators_ order
+    """
+    compiled = CompiledForest.from_forest(forest)
+    return compiled.value[compiled.apply(np.ascontiguousarray(X, dtype=np.float32))]
+
+
+def out_of_bag_mask(forest, rows):
+    """
+    Return which training rows each tree's bootstrap sample left out.
+
+    Args:
+        forest: RandomForestRegressor fitted with bootstrap=True
+        rows: Number of rows it was fitted on
+
+    Returns:
+        (n_trees, rows) bool array, True where the row is out of bag for the tree
+
+    Raises:
+        ValueError: If the forest was fitted without bootstrap samples
+    """
+    if not forest.bootstrap:
+        raise ValueError("Out-of-bag selection needs a forest fitted with bootstrap=True")
+    mask = np.ones((len(forest.estimators_), rows), dtype=bool)
+    for tree, samples in enumerate(forest.estimators_samples_):
+        mask[tree, samples] = False
+    return mask
+
+
+def greedy_tree_order(per_tree, y, oob=None, max_trees=None):
+    """
+    Order trees by greedy forward selection on RMSE.
+
+    Each step adds the tree that minimizes the RMSE of the mean prediction of
+    the trees chosen so far.
+
+    Args:
+        per_tree: (n_trees, rows) predictions from tree_predictions()
+        y: (rows,) true values
+        oob: (n_trees, rows) mask from out_of_bag_mask(). Each row is then
+            predicted only by the chosen trees it is out of bag for, and by
+            the mean of y while none of them is, so subsets that leave hard
+            rows unscored are not favored (default: every tree predicts
+            every row)
+        max_trees: Stop after this many trees (default: all of them)
+
+    Returns:
+        tuple: (order, rmse) where order lists tree indices in selection order
+        and rmse[k] is the RMSE of the first k + 1 trees
+    """
+    n_trees = len(per_tree)
+    max_trees = n_trees if max_trees is None else min(max_trees, n_trees)
+    y = np.asarray(y, dtype=np.float64)
+    weights = np.ones(per_tree.shape) if oob is None else oob.astype(np.float64)
+    weighted = per_tree * weights
+    available = np.ones(n_trees, dtype=bool)
+    total = np.zeros(per_tree.shape[1])
+    count = np.zeros(per_tree.shape[1])
+    order, rmse = [], []
+    for _ in range(max_trees):
+        counts = count + weights
+        errors = np.where(counts > 0, (total + weighted) / np.maximum(counts, 1), y.mean()) - y
+        candidate_mse = np.einsum('ij,ij->i', errors, errors) / len(y)
+        candidate_mse[~available] = np.inf
+        best = int(np.argmin(candidate_mse))
+        order.append(best)
+        rmse.append(float(np.sqrt(candidate_mse[best])))
+        available[best] = False
+        total += weighted[best]
+        count += weights[best]
+    return order, rmse
+
+
+def out_of_bag_metrics(per_tree, oob, y, indices):
+    """
+    Score a subset of trees on the rows they did not train on.
+
+    Returns:
+        dict with oob_r2, oob_rmse and oob_rows (the rows at least one of the
+        trees is out of bag for; the others are not scored)
+    """
+    weights = oob[indices]
+    counts = weights.sum(axis=0)
+    scored = counts > 0
+    predictions = (per_tree[indices] * weights).sum(axis=0)[scored] / counts[scored]
+    y = np.asarray(y, dtype=np.float64)[scored]
+    return {
+        'oob_r2': float(r2_score(y, predictions)),
+        'oob_rmse': float(np.sqrt(mean_squared_error(y, predictions))),
+        'oob_rows': int(scored.sum()),
+    }
+
+
+def subset_forest(forest, indices):
+    """Return a copy of forest with only the given trees, kept in their original order."""
+    pruned = copy.copy(forest)
+    pruned.estimators_ = [forest.estimators_[i] for i in sorted(indices)]
+    pruned.n_estimators = len(pruned.estimators_)
+    return pruned
+
+
+def prune_forest(forest, X_train, y_train, X_test=None, y_test=None,
+                 r2_tolerance=DEFAULT_R2_TOLERANCE, rmse_tolerance=DEFAULT_RMSE_TOLERANCE):
+    """
+    Find the smallest greedy subset of trees within tolerance of the full forest.
+
+    Trees are selected and compared on their out-of-bag predictions for the
+    rows the forest was fitted on. The test rows, if given, are only scored.
+
+    Args:
+        forest: RandomForestRegressor fitted on X_train, y_train with bootstrap=True
+        X_train, y_train: The rows the forest was fitted on, in the same order
+        X_test, y_test: Held-out rows to report the full and pruned scores on
+        r2_tolerance: Largest allowed drop in out-of-bag R² (absolute)
+        rmse_tolerance: Largest allowed rise in out-of-bag RMSE (relative, 0.02 = 2%)
+
+    Returns:
+        tuple: (pruned forest, dict with the number of training rows, the
+        full and pruned metrics, the chosen tree indices and the out-of-bag
+        RMSE after each greedy step)
+    """
+    y_train = np.asarray(y_train, dtype=np.float64)
+    per_tree = tree_predictions(forest, X_train)
+    oob = out_of_bag_mask(forest, len(y_train))
+    order, rmse_curve = greedy_tree_order(per_tree, y_train, oob)
+
+    full = out_of_bag_metrics(per_tree, oob, y_train, np.arange(len(per_tree)))
+    size = len(order)
+    for k in range(1, len(order) + 1):
+        metrics = out_of_bag_metrics(per_tree, oob, y_train, order[:k])
+        # Only compare subsets that score the same rows as the full forest
+        if (metrics['oob_rows'] == full['oob_rows']
+                and metrics['oob_rmse'] <= full['oob_rmse'] * (1 + rmse_tolerance)
+                and metrics['oob_r2'] >= full['oob_r2'] - r2_tolerance):
+            size = k
+            break
+
+    pruned = subset_forest(forest, order[:size])
+    reduced = out_of_bag_metrics(per_tree, oob, y_train, order[:size])
+    full['trees'], reduced['trees'] = len(forest.estimators_), size
+    if X_test is not None:
+        y_test = np.asarray(y_test, dtype=np.float64)
+        for metrics, model in ((full, forest), (reduced, pruned)):
+            predictions = model.predict(X_test)
+            metrics['test_r2'] = float(r2_score(y_test, predictions))
+            metrics['test_rmse'] = float(np.sqrt(mean_squared_error(y_test, predictions)))
+
+    report = {
+        'selection': 'out-of-bag',
+        'r2_tolerance': r2_tolerance,
+        'rmse_tolerance': rmse_tolerance,
+        'training_rows': len(y_train),
+        'full': full,
+        'pruned': reduced,
+        'tree_indices': sorted(order[:size]),
+        'greedy_oob_rmse': rmse_curve,
+    }
+    return pruned, report
+
+
+def _best_seconds(predict, X, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _pickled_size(model):
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return len(buffer.getvalue())
+
+
+def measure_savings(forest, pruned, X, grid_rows=20_000, repeat=5):
+    """
+    Compare the serving cost of the full and pruned forests.
+
+    Returns:
+        dict with prediction latency (scikit-learn and compiled, on X and on a
+        grid_rows scenario grid), node-array memory and pickled artifact size
+    """
+    grid = scenario_grid(X, grid_rows)
+    savings = {}
+    for name, model in (('full', forest), ('pruned', pruned)):
+        compiled = CompiledForest.from_forest(model)
+        savings[name] = {
+            'latency_ms': {
+                'sklearn_batch': _best_seconds(model.predict, X, repeat) * 1000,
+                'compiled_batch': _best_seconds(compiled.predict, X, repeat) * 1000,
+                'sklearn_grid': _best_seconds(model.predict, grid, repeat) * 1000,
+            },
+            'nodes': compiled.n_nodes,
+            'node_array_bytes': compiled.nbytes,
+            'artifact_bytes': _pickled_size(model),
+        }
+    savings['batch_rows'] = len(X)
+    savings['grid_rows'] = grid_rows
+    return savings
+
+
+def train_evaluation_models(csv_path=DEFAULT_TRAINING_DATA, split_date=SPLIT_DATE):
+    """
+    Train the hybrid models on the analysis training period.
+
+    Returns:
+        tuple: (HybridModelArtifacts, X_train, y_train, X_test, y_test) where
+        the training rows are the VAS_Sold records before split_date, in the
+        order the forest was fitted on, and the test rows those on or after it
+    """
+    df = load_dataset(csv_path)
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(df)
+    train_index, test_index = split_by_date(df['Date'], split_date)
+
+    y_train = df['VAS_Sold'].iloc[train_index].to_numpy()
+    forest = RandomForestRegressor(**VAS_FOREST_PARAMS)
+    forest.fit(X[train_index], y_train)
+    upgrades_model = LinearSufficientStats.from_data(
+        X[train_index], df['Speed_Upgrades'].iloc[train_index]).to_model()
+
+    artifacts = HybridModelArtifacts(pipeline, forest, upgrades_model)
+    return artifacts, X[train_index], y_train, X[test_index], df['VAS_Sold'].iloc[test_index].to_numpy()
+
+
+def train_production_models(csv_path=DEFAULT_TRAINING_DATA):
+    """
+    Train the hybrid models on the full history, as a full fit of the serving models does.
+
+    Returns:
+        tuple: (HybridModelArtifacts, X, y) with the rows the forest was fitted on
+    """
+    df = load_dataset(csv_path)
+    artifacts = train_hybrid_models(df)
+    return artifacts, artifacts.pipeline.transform(df), df['VAS_Sold'].to_numpy()
+
+
+def save_pruned(artifacts, pruned, report, output_dir=DEFAULT_OUTPUT_DIR, csv_path=DEFAULT_TRAINING_DATA):
+    """
+    Save a pruned forest in the model store format.
+
+    artifacts hold the models the forest was pruned from (normally from
+    train_production_models()) and report is its prune_forest() report.
+    The manifest records csv_path's position (see
+    incremental_training.file_position), so load_pruned() only serves it
+    while the training file is unchanged.
+
+    Returns:
+        Path of the artifact directory
+    """
+    offset, tail_sha256 = file_position(csv_path)
+    trained_at = pd.Timestamp.now('UTC')
+    key = f"vas-{report['pruned']['trees']}-trees-{trained_at.strftime('%Y%m%dT%H%M%S')}"
+    pruned_artifacts = HybridModelArtifacts(
+        artifacts.pipeline, pruned, artifacts.upgrades_model, key=key,
+        manifest={
+            'key': key,
+            'training_records': report['training_rows'],
+            'source_offset': offset,
+            'source_tail_sha256': tail_sha256,
+            'vas_params': dict(VAS_FOREST_PARAMS, n_estimators=report['pruned']['trees']),
+            'pruning': {name: report[name] for name in
+                        ('selection', 'r2_tolerance', 'rmse_tolerance', 'full', 'pruned', 'tree_indices')},
+            'sklearn_version': sklearn.__version__,
+            'trained_at': trained_at.isoformat(),
+        })
+    return pruned_artifacts.save(output_dir)
+
+
+def load_pruned(csv_path=DEFAULT_TRAINING_DATA, output_dir=DEFAULT_OUTPUT_DIR):
+    """
+    Load the newest pruned artifact trained on the training file's current rows.
+
+    Returns:
+        HybridModelArtifacts, or None if there is none (no pruned model was
+        saved, or rows were appended or rewritten since forest_pruning.py ran)
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        return None
+    offset, tail_sha256 = file_position(csv_path)
+    artifact_dirs = [path for path in output_dir.iterdir() if path.is_dir() and not path.name.startswith('.')]
+    for path in sorted(artifact_dirs, key=lambda path: path.stat().st_mtime, reverse=True):
+        try:
+            with open(path / MANIFEST_FILE, 'r') as f:
+                manifest = json.load(f)
+            if (manifest.get('source_offset') == offset and manifest.get('source_tail_sha256') == tail_sha256
+                    and manifest.get('sklearn_version') == sklearn.__version__):
+                return HybridModelArtifacts.load(path.name, output_dir)
+        except (OSError, ValueError, EOFError, KeyError, IndexError, AttributeError, ImportError,
+                pickle.UnpicklingError):
+            continue
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find the smallest subset of VAS_Sold forest trees that keeps out-of-bag accuracy'
+    )
+    parser.add_argument('--r2-tolerance', type=float, default=DEFAULT_R2_TOLERANCE,
+                        help=f'Largest allowed drop in out-of-bag R² (default: {DEFAULT_R2_TOLERANCE})')
+    parser.add_argument('--rmse-tolerance', type=float, default=DEFAULT_RMSE_TOLERANCE,
+                        help=f'Largest allowed relative rise in out-of-bag RMSE (default: {DEFAULT_RMSE_TOLERANCE})')
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR),
+                        help='Where to save the pruned model (default: artifacts/pruned)')
+    parser.add_argument('--no-save', action='store_true',
+                        help='Only evaluate; do not prune and save a full-history model')
+    parser.add_argument('--json', action='store_true', help='Print the report as a JSON object')
+    args = parser.parse_args()
+
+    try:
+        artifacts, X_train, y_train, X_test, y_test = train_evaluation_models()
+        pruned, report = prune_forest(artifacts.vas_model, X_train, y_train, X_test, y_test,
+                                      args.r2_tolerance, args.rmse_tolerance)
+        report['savings'] = measure_savings(artifacts.vas_model, pruned, X_test)
+        if not args.no_save:
+            production, X, y = train_production_models()
+            production_pruned, production_report = prune_forest(
+                production.vas_model, X, y, r2_tolerance=args.r2_tolerance, rmse_tolerance=args.rmse_tolerance)
+            report['production'] = production_report
+            report['artifact_dir'] = str(save_pruned(production, production_pruned, production_report,
+                                                     args.output_dir))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    full, reduced, savings = report['full'], report['pruned'], report['savings']
+    print("VAS_Sold forest pruning on out-of-bag rows "
+          f"(R² tolerance {args.r2_tolerance}, RMSE tolerance {args.rmse_tolerance:.1%})")
+    print(f"  Trained before {SPLIT_DATE}, tested on the {len(y_test)} rows after it:")
+    for label, metrics in (('Full forest:', full), ('Pruned forest:', reduced)):
+        print(f"    {label:<15} {metrics['trees']:>3} trees, out-of-bag R² {metrics['oob_r2']:.4f}, "
+              f"test R² {metrics['test_r2']:.4f}, test RMSE {metrics['test_rmse']:.2f}")
+    curve = report['greedy_oob_rmse']
+    checkpoints = [k for k in (1, 5, 10, 20, 50, 100, 200) if k <= len(curve)]
+    print("  Greedy out-of-bag RMSE by forest size: "
+          + ", ".join(f"{k}: {curve[k - 1]:.2f}" for k in checkpoints))
+
+    def saving(*keys):
+        before, after = savings['full'], savings['pruned']
+        for key in keys:
+            before, after = before[key], after[key]
+        return before, after, (1 - after / before) if before else 0.0
+
+    print("\n  Savings:")
+    rows = [
+        (f"Latency, {savings['batch_rows']} rows (scikit-learn)", 'ms', 'latency_ms', 'sklearn_batch'),
+        (f"Latency, {savings['batch_rows']} rows (compiled)", 'ms', 'latency_ms', 'compiled_batch'),
+        (f"Latency, {savings['grid_rows']:,} rows (scikit-learn)", 'ms', 'latency_ms', 'sklearn_grid'),
+        ("Memory, node arrays", 'bytes', 'node_array_bytes'),
+        ("Artifact size (joblib)", 'bytes', 'artifact_bytes'),
+    ]
+    for label, unit, *keys in rows:
+        before, after, reduction = saving(*keys)
+        if unit == 'ms':
+            print(f"    {label:<38} {before:>10.2f} ms -> {after:>10.2f} ms  (-{reduction:.0%})")
+        else:
+            print(f"    {label:<38} {before:>13,} -> {after:>13,}  (-{reduction:.0%})")
+    if report.get('artifact_dir'):
+        production = report['production']
+        print(f"\n  Full history, {production['training_rows']} rows: "
+              f"{production['full']['trees']} trees (out-of-bag R² {production['full']['oob_r2']:.4f}) -> "
+              f"{production['pruned']['trees']} trees (out-of-bag R² {production['pruned']['oob_r2']:.4f})")
+        print(f"  Pruned model saved to {report['artifact_dir']}")
+        print("  Serve it with: python predict_december_2025.py --pruned")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Rule-based US federal holiday calendar with cached per-year lookup tables.
+
+Holidays are generated for any year from their rules (fixed dates, nth weekday,
+last Monday), so features stay correct for forecasts beyond the years that used
+to be hardcoded. For every year a per-day table of holiday features is built
+once, cached on disk, and then simply indexed by day number.
+"""
+
+import calendar
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bump when the holiday rules or table layout change so cached tables are rebuilt
+CALENDAR_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache' / 'holiday_tables'
+
+# Table columns, in order
+TABLE_COLUMNS = ['Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday']
+
+MONDAY, THURSDAY = 0, 3
+
+
+def _nth_weekday(year, month, weekday, n):
+    """Return the nth (1-based) given weekday of a month."""
+    first = pd.Timestamp(year=year, month=month, day=1)
+    offset = (weekday - first.dayofweek) % 7
+    return first + pd.Timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    """Return the last given weekday of a month."""
+    last = pd.Timestamp(year=year, month=month, day=1) + pd.offsets.MonthEnd(0)
+    offset = (last.dayofweek - weekday) % 7
+    return last - pd.Timedelta(days=offset)
+
+
+def federal_holidays(year):
+    """
+    Generate the US federal holidays for a year.
+
+    Federal holidays included:
+    - New Year's Day (Jan 1)
+    - Martin Luther King Jr. Day (3rd Monday in January)
+    - Presidents' Day (3rd Monday in February)
+    - Memorial Day (last Monday in May)
+    - Juneteenth (June 19, from 2021)
+    - Independence Day (July 4)
+    - Labor Day (1st Monday in September)
+    - Columbus Day (2nd Monday in October)
+    - Veterans Day (Nov 11)
+    - Thanksgiving (4th Thursday in November)
+    - Christmas (Dec 25)
+
+    Args:
+        year (int): Calendar year
+
+    Returns:
+        list: Sorted list of pd.Timestamp holiday dates
+    """
+    holidays = [
+        pd.Timestamp(year=year, month=1, day=1),
+        _nth_weekday(year, 1, MONDAY, 3),
+        _nth_weekday(year, 2, MONDAY, 3),
+        _last_weekday(year, 5, MONDAY),
+        pd.Timestamp(year=year, month=7, day=4),
+        _nth_weekday(year, 9, MONDAY, 1),
+        _nth_weekday(year, 10, MONDAY, 2),
+        pd.Timestamp(year=year, month=11, day=11),
+        _nth_weekday(year, 11, THURSDAY, 4),
+        pd.Timestamp(year=year, month=12, day=25),
+    ]
+    if year >= 2021:
+        holidays.append(pd.Timestamp(year=year, month=6, day=19))
+    return sorted(holidays)
+
+
+def federal_holidays_between(start_year, end_year):
+    """Generate federal holidays for every year in [start_year, end_year]."""
+    holidays = []
+    for year in range(start_year, end_year + 1):
+        holidays.extend(federal_holidays(year))
+    return holidays
+
+
+def _build_year_table(year):
+    """Compute the per-day feature table for one year."""
+    from holiday_features import compute_holiday_features
+
+    days = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D')
+    # Neighbouring years make distances across the year boundary correct
+    holidays = federal_holidays_between(year - 1, year + 1)
+    features = compute_holiday_features(days, holidays)
+    return features[TABLE_COLUMNS].to_numpy(dtype=np.int64)
+
+
+def _table_path(year, cache_dir):
+    return Path(cache_dir) / f'federal_{year}_v{CALENDAR_VERSION}.npy'
+
+
+@lru_cache(maxsize=None)
+def year_table(year, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Return the per-day holiday feature table for a year.
+
+    The table has one row per day of the year and the columns in TABLE_COLUMNS.
+    It is computed once, stored on disk under cache_dir, and memoized in-process.
+
+    Args:
+        year (int): Calendar year
+        cache_dir (Path): Directory for cached tables
+
+    Returns:
+        numpy.ndarray: int64 array of shape (days_in_year, 3)
+    """
+    path = _table_path(year, cache_dir)
+    try:
+        table = np.load(path)
+        if table.shape == (366 if calendar.isleap(year) else 365, len(TABLE_COLUMNS)):
+            return table
+    except (OSError, ValueError):
+        pass
+
+    table = _build_year_table(year)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, table)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The cache is an optimization; an unwritable directory is not fatal
+        pass
+    return table
+
+
+def lookup_holiday_features(dates, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Look up holiday features for a Date column from the per-year tables.
+
+    Args:
+        dates: Date column (Series or array-like of datetimes)
+        cache_dir (Path): Directory for cached tables
+
+    Returns:
+        DataFrame with Is_Holiday, Days_To_Holiday, Days_From_Holiday and
+        Near_Holiday columns, aligned with the input index when dates is a Series
+    """
+    index = dates.index if isinstance(dates, pd.Series) else None
+    day_numbers = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+    if len(day_numbers) == 0:
+        table = np.empty((0, 3), dtype=np.int64)
+        offsets = np.empty(0, dtype=np.int64)
+    else:
+        years = day_numbers.astype('datetime64[Y]').astype(np.int64) + 1970
+        first_year, last_year = int(years.min()), int(years.max())
+        table = np.concatenate([year_table(year, cache_dir) for year in range(first_year, last_year + 1)])
+        start = np.datetime64(f'{first_year}-01-01', 'D')
+        offsets = (day_numbers - start).astype(np.int64)
+
+    rows = table[offsets]
+    days_to = rows[:, 1]
+    days_from = rows[:, 2]
+    return pd.DataFrame({
+        'Is_Holiday': rows[:, 0],
+        'Days_To_Holiday': days_to,
+        'Days_From_Holiday': days_from,
+        'Near_Holiday': ((days_to <= 1) | (days_from <= 1)).astype(np.int64),
+    }, index=index)
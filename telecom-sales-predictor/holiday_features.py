@@ -0,0 +1,85 @@
+"""
+Vectorized federal holiday features for the telecom sales models.
+
+Computes Is_Holiday, Days_To_Holiday, Days_From_Holiday and Near_Holiday for a
+whole Date column in one pass using a sorted holiday array and searchsorted,
+instead of calling a per-row function through DataFrame.apply. By default the
+features come from the rule-based calendar in holiday_calendar.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Value used when there is no holiday before/after a date in the holiday list
+NO_HOLIDAY_DAYS = 365
+
+HOLIDAY_FEATURE_COLUMNS = ['Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday', 'Near_Holiday']
+
+
+def _to_day_numbers(values):
+    """Convert dates (strings, Timestamps, Series, arrays) to int64 days since epoch."""
+    days = pd.to_datetime(pd.Series(values)).to_numpy().astype('datetime64[D]')
+    return days.astype(np.int64)
+
+
+def compute_holiday_features(dates, holidays):
+    """
+    Compute holiday features for every date in one vectorized pass.
+
+    Args:
+        dates: Date column (Series or array-like of datetimes)
+        holidays: Iterable of holiday dates (strings or Timestamps)
+
+    Returns:
+        DataFrame with Is_Holiday, Days_To_Holiday, Days_From_Holiday and
+        Near_Holiday columns, aligned with the input index when dates is a Series
+    """
+    index = dates.index if isinstance(dates, pd.Series) else None
+    day_numbers = _to_day_numbers(dates)
+    holiday_days = np.unique(_to_day_numbers(list(holidays)))
+
+    n_holidays = len(holiday_days)
+    # Position of the first holiday on or after each date
+    next_idx = np.searchsorted(holiday_days, day_numbers, side='left')
+
+    has_next = next_idx < n_holidays
+    next_days = holiday_days[np.minimum(next_idx, max(n_holidays - 1, 0))] if n_holidays else day_numbers
+    days_to_holiday = np.where(has_next, next_days - day_numbers, NO_HOLIDAY_DAYS)
+
+    # Holidays strictly before the date sit just left of next_idx
+    has_prev = next_idx > 0
+    prev_days = holiday_days[np.maximum(next_idx - 1, 0)] if n_holidays else day_numbers
+    days_from_holiday = np.where(has_prev, day_numbers - prev_days, NO_HOLIDAY_DAYS)
+
+    is_holiday = (has_next & (days_to_holiday == 0)).astype(np.int64)
+    near_holiday = ((days_to_holiday <= 1) | (days_from_holiday <= 1)).astype(np.int64)
+
+    return pd.DataFrame({
+        'Is_Holiday': is_holiday,
+        'Days_To_Holiday': days_to_holiday.astype(np.int64),
+        'Days_From_Holiday': days_from_holiday.astype(np.int64),
+        'Near_Holiday': near_holiday,
+    }, index=index)
+
+
+def add_holiday_features(df, holidays=None, date_column='Date'):
+    """
+    Add the holiday feature columns to a DataFrame in place.
+
+    Args:
+        df: DataFrame with a datetime column
+        holidays: Iterable of holiday dates, or None to use the US federal
+            holiday calendar for whatever years the dates span
+        date_column: Name of the datetime column
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    if holidays is None:
+        from holiday_calendar import lookup_holiday_features
+        features = lookup_holiday_features(df[date_column])
+    else:
+        features = compute_holiday_features(df[date_column], holidays)
+    for column in HOLIDAY_FEATURE_COLUMNS:
+        df[column] = features[column].to_numpy()
+    return df
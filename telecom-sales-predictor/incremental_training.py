@@ -0,0 +1,441 @@
+"""
+Incremental (nightly) retraining of the hybrid models.
+
+final_dataset.csv only grows: each day appends one row per channel. Refitting
+the 200-tree Random Forest and the Linear Regression on the whole history
+every night costs O(history). This module keeps a training state that is
+updated with just the appended rows:
+
+- Speed_Upgrades: the Linear Regression is solved from sufficient statistics
+  (sufficient_stats.py). New rows are folded into them, so after every update
+  the coefficients equal a full refit on all ingested rows.
+- VAS_Sold: the forest is grown with warm_start. Each update fits
+  TREES_PER_UPDATE new trees on a trailing window (the new rows plus the last
+  WINDOW_DAYS of history), and keeps at most MAX_UPDATE_TREES such trees on
+  top of the trees from the last full fit, replacing the oldest first.
+- A watermark records the last ingested date and the byte offset the CSV was
+  read up to. Updates ingest every row after that offset, so reading, feature
+  engineering and fitting all cost O(new rows), and a day whose channel rows
+  arrive in separate appends is ingested in full.
+
+A full refit happens when there is no state yet, the state is from another
+version, the file was rewritten rather than appended to, or a new Channel
+value appears. Run one periodically anyway (--full) to fold the windowed
+trees back into a forest fitted on all of the history.
+
+Serving (predict_december_2025.py and the MCP inference worker) loads its
+models through load_or_refresh(), so appending rows to the training file costs
+the next prediction an incremental update rather than a full retrain.
+
+Usage:
+    python incremental_training.py              # refresh from final_dataset.csv
+    python incremental_training.py --full       # refit from scratch
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+
+from data_loader import DATE_COLUMN, DATE_FORMAT, load_dataset, read_dataset_csv
+from feature_pipeline import ARTIFACTS_DIR, PIPELINE_VERSION, FeaturePipeline
+from model_store import DEFAULT_TRAINING_DATA, VAS_FOREST_PARAMS, HybridModelArtifacts
+from sufficient_stats import LinearSufficientStats
+
+# Bump when the state layout or update procedure changes; older states are refitted
+INCREMENTAL_STATE_VERSION = 2
+
+DEFAULT_STATE_DIR = ARTIFACTS_DIR / 'incremental'
+
+TREES_PER_UPDATE = 10
+MAX_UPDATE_TREES = 50
+WINDOW_DAYS = 28
+
+# Bytes before the watermark offset whose hash detects a rewritten (not appended) file
+TAIL_CHECK_BYTES = 4096
+
+MANIFEST_FILE = 'manifest.json'
+PIPELINE_FILE = 'feature_pipeline.json'
+FOREST_FILE = 'vas_sold_random_forest.joblib'
+RECENT_FILE = 'recent_rows.csv'
+
+
+class HistoryRewritten(Exception):
+    """The training file no longer starts with the rows the state has ingested."""
+
+
+def _tail_hash(path, offset):
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - TAIL_CHECK_BYTES))
+        return hashlib.sha256(f.read(offset - max(0, offset - TAIL_CHECK_BYTES))).hexdigest()
+
+
+def read_appended_rows(csv_path, offset, tail_sha256):
+    """
+    Read the complete rows appended to a CSV since byte offset.
+
+    A trailing line without its newline (a write in progress) is left for the
+    next read.
+
+    Returns:
+        tuple: (DataFrame of the appended rows, new offset, new tail hash)
+
+    Raises:
+        HistoryRewritten: If the file is shorter than offset or its bytes
+            before offset changed
+    """
+    if os.path.getsize(csv_path) < offset or _tail_hash(csv_path, offset) != tail_sha256:
+        raise HistoryRewritten(f"{csv_path} was rewritten, not appended to")
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        appended = f.read()
+    appended = appended[:appended.rfind(b'\n') + 1]
+    new_offset = offset + len(appended)
+    rows = read_dataset_csv(io.BytesIO(header + appended))
+    return rows, new_offset, _tail_hash(csv_path, new_offset)
+
+
+def _complete_lines_size(csv_path):
+    """Return the size of the file up to and including its last newline."""
+    size = os.path.getsize(csv_path)
+    with open(csv_path, 'rb') as f:
+        f.seek(max(0, size - TAIL_CHECK_BYTES))
+        tail = f.read()
+    return size - len(tail) + tail.rfind(b'\n') + 1
+
+
+def file_position(csv_path=DEFAULT_TRAINING_DATA):
+    """
+    Return (offset, tail hash) for the complete rows currently in a CSV.
+
+    It equals the state's ('offset', 'tail_sha256') once the state has ingested
+    every complete row, and only reads the last TAIL_CHECK_BYTES of the file.
+    """
+    offset = _complete_lines_size(csv_path)
+    return offset, _tail_hash(csv_path, offset)
+
+
+class IncrementalHybridModel:
+    """
+    Training state for incrementally updated hybrid models.
+
+    Attributes:
+        pipeline: Fitted FeaturePipeline
+        forest: VAS_Sold RandomForestRegressor (warm_start=True)
+        linear_stats: LinearSufficientStats for Speed_Upgrades
+        base_trees: Number of leading forest trees from the last full fit
+        recent: Raw rows of the last WINDOW_DAYS before the watermark
+        manifest: Watermark, source file position, configuration and update history
+    """
+
+    def __init__(self, pipeline, forest, linear_stats, base_trees, recent, manifest):
+        self.pipeline = pipeline
+        self.forest = forest
+        self.linear_stats = linear_stats
+        self.base_trees = base_trees
+        self.recent = recent
+        self.manifest = manifest
+
+    @property
+    def watermark(self):
+        """Last ingested date."""
+        return pd.Timestamp(self.manifest['watermark'])
+
+    @property
+    def key(self):
+        """Model version: the watermark and the tail hash at the ingested offset."""
+        return f"{self.manifest['watermark']}-{self.manifest['tail_sha256'][:12]}"
+
+    def artifacts(self):
+        """Return the current models as HybridModelArtifacts for prediction."""
+        return HybridModelArtifacts(self.pipeline, self.forest, self.linear_stats.to_model(),
+                                    key=self.key, manifest=self.manifest)
+
+    def save(self, state_dir=DEFAULT_STATE_DIR):
+        """
+        Save the state to state_dir.
+
+        It is written to a temporary directory and swapped into place, so a
+        crash mid-save leaves the previous state intact.
+        """
+        state_dir = Path(state_dir)
+        state_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{state_dir.name}-', dir=state_dir.parent))
+        try:
+            self.pipeline.save(tmp_dir / PIPELINE_FILE)
+            joblib.dump(self.forest, tmp_dir / FOREST_FILE)
+            self.recent.to_csv(tmp_dir / RECENT_FILE, index=False, date_format=DATE_FORMAT)
+            manifest = dict(self.manifest, base_trees=self.base_trees,
+                            linear_stats=self.linear_stats.to_dict())
+            with open(tmp_dir / MANIFEST_FILE, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            if state_dir.exists():
+                old_dir = state_dir.with_name(f'.{state_dir.name}-old-{uuid.uuid4().hex[:8]}')
+                try:
+                    os.rename(state_dir, old_dir)
+                except FileNotFoundError:
+                    # Another process is swapping in its state
+                    pass
+                shutil.rmtree(old_dir, ignore_errors=True)
+            try:
+                os.rename(tmp_dir, state_dir)
+            except OSError:
+                # Another process saved first; the next refresh catches up from its state
+                if not state_dir.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return state_dir
+
+    @classmethod
+    def load(cls, state_dir=DEFAULT_STATE_DIR):
+        """
+        Load a state saved with save().
+
+        Raises:
+            ValueError: If the state was written by another version or with
+                other forest parameters
+        """
+        state_dir = Path(state_dir)
+        with open(state_dir / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        if (manifest.get('version') != INCREMENTAL_STATE_VERSION
+                or manifest.get('pipeline_version') != PIPELINE_VERSION
+                or manifest.get('sklearn_version') != sklearn.__version__):
+            raise ValueError("Incremental state was written by another version")
+        if manifest.get('vas_params') != VAS_FOREST_PARAMS:
+            raise ValueError("Incremental state was fitted with other forest parameters")
+        linear_stats = LinearSufficientStats.from_dict(manifest.pop('linear_stats'))
+        base_trees = manifest.pop('base_trees')
+        return cls(
+            FeaturePipeline.load(state_dir / PIPELINE_FILE),
+            joblib.load(state_dir / FOREST_FILE),
+            linear_stats,
+            base_trees,
+            read_dataset_csv(state_dir / RECENT_FILE),
+            manifest,
+        )
+
+
+def full_fit(csv_path=DEFAULT_TRAINING_DATA, window_days=WINDOW_DAYS):
+    """
+    Fit the pipeline and both models on the whole training file.
+
+    Returns:
+        IncrementalHybridModel with the watermark at the end of the file
+    """
+    offset = _complete_lines_size(csv_path)
+    if offset == os.path.getsize(csv_path):
+        raw = load_dataset(csv_path)
+    else:
+        # Leave out a trailing partial line; the next update reads it once it is complete
+        with open(csv_path, 'rb') as f:
+            raw = read_dataset_csv(io.BytesIO(f.read(offset)))
+
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(raw.copy())
+
+    forest = RandomForestRegressor(**dict(VAS_FOREST_PARAMS, warm_start=True))
+    forest.fit(X, raw['VAS_Sold'])
+    linear_stats = LinearSufficientStats.from_data(X, raw['Speed_Upgrades'])
+
+    watermark = raw[DATE_COLUMN].max()
+    manifest = {
+        'version': INCREMENTAL_STATE_VERSION,
+        'pipeline_version': PIPELINE_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'vas_params': VAS_FOREST_PARAMS,
+        'source': str(Path(csv_path).resolve()),
+        'offset': offset,
+        'tail_sha256': _tail_hash(csv_path, offset),
+        'watermark': watermark.strftime('%Y-%m-%d'),
+        'training_records': len(raw),
+        'full_fit_at': pd.Timestamp.now('UTC').isoformat(),
+        'updates': [],
+    }
+    recent = raw[raw[DATE_COLUMN] > watermark - pd.Timedelta(days=window_days)].reset_index(drop=True)
+    return IncrementalHybridModel(pipeline, forest, linear_stats, len(forest.estimators_), recent, manifest)
+
+
+def update_seed(update_number):
+    """Return the forest random_state for the given incremental update (1, 2, ...)."""
+    seed_sequence = np.random.SeedSequence([VAS_FOREST_PARAMS['random_state'], update_number])
+    return int(seed_sequence.generate_state(1)[0])
+
+
+def update(model, csv_path=DEFAULT_TRAINING_DATA, trees_per_update=TREES_PER_UPDATE,
+           max_update_trees=MAX_UPDATE_TREES, window_days=WINDOW_DAYS):
+    """
+    Fold the rows appended since the saved byte offset into the models in place.
+
+    Every appended row is ingested, whatever its date: rows for a day that is
+    already partly ingested (its other channels arrived in an earlier append)
+    are not lost. The watermark only moves forward.
+
+    Returns:
+        dict describing the update (rows ingested, new watermark, trees added
+        and replaced)
+
+    Raises:
+        HistoryRewritten: If the file was rewritten rather than appended to
+        ValueError: If the new rows have a Channel the pipeline has not seen
+    """
+    new_rows, offset, tail_sha256 = read_appended_rows(csv_path, model.manifest['offset'],
+                                                       model.manifest['tail_sha256'])
+    summary = {
+        'rows_ingested': len(new_rows),
+        'trees_added': 0,
+        'trees_replaced': 0,
+    }
+
+    if len(new_rows):
+        X_new = model.pipeline.transform(new_rows.copy())
+        model.linear_stats.update(X_new, new_rows['Speed_Upgrades'])
+
+        watermark = max(model.watermark, new_rows[DATE_COLUMN].max())
+        window_start = watermark - pd.Timedelta(days=window_days)
+        window = pd.concat([model.recent, new_rows], ignore_index=True)
+        window = window[window[DATE_COLUMN] > window_start].reset_index(drop=True)
+
+        if trees_per_update > 0 and max_update_trees > 0:
+            trees_per_update = min(trees_per_update, max_update_trees)
+            model.forest.n_estimators = len(model.forest.estimators_) + trees_per_update
+            # warm_start draws the new trees' seeds after skipping one per existing
+            # tree; once replacement keeps the forest size constant, that would
+            # reuse the same seeds every update, so each update gets its own stream
+            model.forest.random_state = update_seed(len(model.manifest['updates']) + 1)
+            model.forest.fit(model.pipeline.transform(window.copy()), window['VAS_Sold'])
+            summary['trees_added'] = trees_per_update
+
+            excess = len(model.forest.estimators_) - model.base_trees - max_update_trees
+            if excess > 0:
+                # Replace the oldest windowed trees; the full-fit trees are kept
+                del model.forest.estimators_[model.base_trees:model.base_trees + excess]
+                model.forest.n_estimators = len(model.forest.estimators_)
+                summary['trees_replaced'] = excess
+
+        model.recent = window
+        model.manifest['watermark'] = watermark.strftime('%Y-%m-%d')
+        model.manifest['training_records'] += len(new_rows)
+        summary['window_records'] = len(window)
+
+    model.manifest['offset'] = offset
+    model.manifest['tail_sha256'] = tail_sha256
+    summary['watermark'] = model.manifest['watermark']
+    summary['forest_trees'] = len(model.forest.estimators_)
+    if len(new_rows):
+        model.manifest['updates'].append(dict(summary, updated_at=pd.Timestamp.now('UTC').isoformat()))
+    return summary
+
+
+def refresh(csv_path=DEFAULT_TRAINING_DATA, state_dir=DEFAULT_STATE_DIR, full=False,
+            trees_per_update=TREES_PER_UPDATE, max_update_trees=MAX_UPDATE_TREES,
+            window_days=WINDOW_DAYS):
+    """
+    Bring the saved state up to date with the training file.
+
+    Updates the saved state incrementally, falling back to a full refit when
+    there is no usable state, the file was rewritten or a new Channel appears.
+
+    Returns:
+        tuple: (IncrementalHybridModel, summary dict with 'mode' set to
+        'full', 'incremental' or 'unchanged', and 'reason' for full refits)
+    """
+    start = time.perf_counter()
+    reason = 'requested' if full else None
+    if not full:
+        try:
+            model = IncrementalHybridModel.load(state_dir)
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            reason = f'no usable state ({e})'
+    if reason is None:
+        previous_offset = model.manifest['offset']
+        try:
+            summary = update(model, csv_path, trees_per_update, max_update_trees, window_days)
+            summary['mode'] = 'incremental' if summary['rows_ingested'] else 'unchanged'
+        except (HistoryRewritten, ValueError) as e:
+            reason = str(e)
+
+    if reason is not None:
+        model = full_fit(csv_path, window_days)
+        previous_offset = None
+        summary = {
+            'mode': 'full',
+            'reason': reason,
+            'rows_ingested': model.manifest['training_records'],
+            'watermark': model.manifest['watermark'],
+            'forest_trees': len(model.forest.estimators_),
+        }
+
+    if summary['mode'] != 'unchanged' or model.manifest['offset'] != previous_offset:
+        model.save(state_dir)
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return model, summary
+
+
+def load_or_refresh(csv_path=DEFAULT_TRAINING_DATA, state_dir=DEFAULT_STATE_DIR):
+    """
+    Load the models for serving, bringing them up to date with the training file.
+
+    The saved state is reused as is when nothing was appended, updated with
+    the appended rows when the file grew, and refitted only when there is no
+    usable state or the file was rewritten (see refresh()).
+
+    Returns:
+        tuple: (HybridModelArtifacts keyed by watermark and tail hash, summary
+        dict from refresh())
+    """
+    model, summary = refresh(csv_path, state_dir)
+    return model.artifacts(), summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally retrain the hybrid models on appended rows')
+    parser.add_argument('--data', default=str(DEFAULT_TRAINING_DATA),
+                        help='Training CSV (default: final_dataset.csv)')
+    parser.add_argument('--state-dir', default=str(DEFAULT_STATE_DIR),
+                        help='Directory for the training state (default: artifacts/incremental)')
+    parser.add_argument('--full', action='store_true', help='Refit from scratch')
+    parser.add_argument('--trees-per-update', type=int, default=TREES_PER_UPDATE,
+                        help=f'Forest trees fitted per update (default: {TREES_PER_UPDATE})')
+    parser.add_argument('--max-update-trees', type=int, default=MAX_UPDATE_TREES,
+                        help=f'Windowed trees kept on top of the full fit (default: {MAX_UPDATE_TREES})')
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS,
+                        help=f'Trailing days the new trees are fitted on (default: {WINDOW_DAYS})')
+    parser.add_argument('--json', action='store_true', help='Print the summary as a JSON object')
+    args = parser.parse_args()
+
+    try:
+        _, summary = refresh(args.data, args.state_dir, args.full, args.trees_per_update,
+                             args.max_update_trees, args.window_days)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"Mode: {summary['mode']}" + (f" ({summary['reason']})" if summary.get('reason') else ''))
+    print(f"  Rows ingested: {summary['rows_ingested']}")
+    print(f"  Watermark: {summary['watermark']}")
+    print(f"  Forest trees: {summary['forest_trees']}"
+          + (f" (+{summary['trees_added']}, -{summary['trees_replaced']})" if summary.get('trees_added') else ''))
+    print(f"  Time: {summary['seconds']:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
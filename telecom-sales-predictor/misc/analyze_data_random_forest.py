@@ -2,79 +2,17 @@ import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import os
 from datetime import datetime
+import sys
+from pathlib import Path
 
-def get_holiday_features(date):
-    """
-    Determine if a date is a federal holiday or near a federal holiday.
-    Returns: (is_holiday, days_to_holiday, days_from_holiday)
-
-    Federal holidays included:
-    - New Year's Day (Jan 1)
-    - Martin Luther King Jr. Day (3rd Monday in January)
-    - Presidents' Day (3rd Monday in February)
-    - Memorial Day (last Monday in May)
-    - Juneteenth (June 19)
-    - Independence Day (July 4)
-    - Labor Day (1st Monday in September)
-    - Columbus Day (2nd Monday in October)
-    - Veterans Day (Nov 11)
-    - Thanksgiving (4th Thursday in November)
-    - Christmas (Dec 25)
-    """
-    holidays_2024 = [
-        pd.Timestamp('2024-01-01'),  # New Year's Day
-        pd.Timestamp('2024-01-15'),  # Martin Luther King Jr. Day
-        pd.Timestamp('2024-02-19'),  # Presidents' Day
-        pd.Timestamp('2024-05-27'),  # Memorial Day
-        pd.Timestamp('2024-06-19'),  # Juneteenth
-        pd.Timestamp('2024-07-04'),  # Independence Day
-        pd.Timestamp('2024-09-02'),  # Labor Day
-        pd.Timestamp('2024-10-14'),  # Columbus Day
-        pd.Timestamp('2024-11-11'),  # Veterans Day
-        pd.Timestamp('2024-11-28'),  # Thanksgiving
-        pd.Timestamp('2024-12-25'),  # Christmas
-    ]
-
-    holidays_2025 = [
-        pd.Timestamp('2025-01-01'),  # New Year's Day
-        pd.Timestamp('2025-01-20'),  # Martin Luther King Jr. Day
-        pd.Timestamp('2025-02-17'),  # Presidents' Day
-        pd.Timestamp('2025-05-26'),  # Memorial Day
-        pd.Timestamp('2025-06-19'),  # Juneteenth
-        pd.Timestamp('2025-07-04'),  # Independence Day
-        pd.Timestamp('2025-09-01'),  # Labor Day
-        pd.Timestamp('2025-10-13'),  # Columbus Day
-        pd.Timestamp('2025-11-11'),  # Veterans Day
-        pd.Timestamp('2025-11-27'),  # Thanksgiving
-        pd.Timestamp('2025-12-25'),  # Christmas
-    ]
-
-    all_holidays = holidays_2024 + holidays_2025
-
-    # Check if current date is a holiday
-    is_holiday = 1 if date in all_holidays else 0
-
-    # Calculate days to nearest holiday
-    if all_holidays:
-        days_diff = [(holiday - date).days for holiday in all_holidays]
-
-        # Days to next holiday (positive values only)
-        future_days = [d for d in days_diff if d >= 0]
-        days_to_holiday = min(future_days) if future_days else 365
-
-        # Days from previous holiday (negative values, take absolute)
-        past_days = [abs(d) for d in days_diff if d < 0]
-        days_from_holiday = min(past_days) if past_days else 365
-    else:
-        days_to_holiday = 365
-        days_from_holiday = 365
-
-    return is_holiday, days_to_holiday, days_from_holiday
+# Shared feature modules live in the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from data_loader import load_dataset
+from feature_pipeline import FeaturePipeline, TARGET_COLUMNS
 
 def main():
     """
@@ -83,9 +21,9 @@ def main():
     print("Loading data from CSV file...")
     print("="*60)
 
-    # Load data from CSV
+    # Load data from CSV (via its typed, memory-mapped Feather copy when current)
     try:
-        df = pd.read_csv('final_dataset.csv')
+        df = load_dataset('final_dataset.csv')
         print(f"Successfully loaded {len(df)} records from final_dataset.csv")
     except FileNotFoundError:
         print("Error: final_dataset.csv not found!")
@@ -108,36 +46,17 @@ def main():
     print("PREPARING DATA FOR RANDOM FOREST REGRESSION")
     print("="*60)
 
-    # Convert Date to datetime and extract features
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Day_of_Year'] = df['Date'].dt.dayofyear
-    df['Day_of_Week'] = df['Date'].dt.dayofweek
-    df['Month'] = df['Date'].dt.month
-
-    # Add holiday features
-    print("\nAdding holiday features...")
-    holiday_features = df['Date'].apply(get_holiday_features)
-    df['Is_Holiday'] = holiday_features.apply(lambda x: x[0])
-    df['Days_To_Holiday'] = holiday_features.apply(lambda x: x[1])
-    df['Days_From_Holiday'] = holiday_features.apply(lambda x: x[2])
-
-    # Create a "near holiday" indicator (within 1 day before or after)
-    df['Near_Holiday'] = ((df['Days_To_Holiday'] <= 1) | (df['Days_From_Holiday'] <= 1)).astype(int)
+    # Build features: date parts, holiday features and Channel encoding (App=0, Web=1)
+    print("\nAdding date, holiday and channel features...")
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(df)
 
     print(f"  Found {df['Is_Holiday'].sum()} holiday dates in dataset")
     print(f"  Found {df['Near_Holiday'].sum()} dates near holidays (within 1 day)")
 
-    # Encode Channel (App=0, Web=1)
-    le = LabelEncoder()
-    df['Channel_Encoded'] = le.fit_transform(df['Channel'])
-
     # Define features and targets
-    feature_columns = ['Day_of_Year', 'Day_of_Week', 'Month', 'Channel_Encoded',
-                       'Emails_Sent', 'Push_Notifications_Sent',
-                       'Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday', 'Near_Holiday']
-    target_columns = ['VAS_Sold', 'Speed_Upgrades']
-
-    X = df[feature_columns]
+    feature_columns = pipeline.feature_columns
+    target_columns = TARGET_COLUMNS
 
     print(f"\nFeatures used: {feature_columns}")
     print(f"Targets to predict: {target_columns}")
@@ -150,8 +69,8 @@ def main():
     train_mask = df['Date'] < split_date
     test_mask = df['Date'] >= split_date
 
-    X_train = X[train_mask]
-    X_test = X[test_mask]
+    X_train = X[train_mask.to_numpy()]
+    X_test = X[test_mask.to_numpy()]
 
     print(f"\nDate-based split:")
     print(f"  Training set: {df[train_mask]['Date'].min()} to {df[train_mask]['Date'].max()}")
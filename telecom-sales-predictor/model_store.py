@@ -0,0 +1,234 @@
+"""
+Versioned on-disk store for the fitted hybrid models.
+
+The Random Forest (VAS_Sold), the Linear Regression (Speed_Upgrades) and the
+fitted FeaturePipeline are saved together under a key derived from a content
+hash of the training data and the model hyperparameters. Prediction loads them
+in milliseconds and only retrains when the data or configuration changes.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+
+from data_loader import load_dataset
+from feature_pipeline import ARTIFACTS_DIR, PIPELINE_VERSION, FeaturePipeline
+from sufficient_stats import DEFAULT_TOL, LinearSufficientStats
+
+# Bump when the artifact layout or training procedure changes
+MODEL_STORE_VERSION = 4
+
+DEFAULT_STORE_DIR = ARTIFACTS_DIR / 'models'
+# Artifact directories kept in the store: the current one and the one before it
+DEFAULT_KEEP_ARTIFACTS = 2
+DEFAULT_TRAINING_DATA = Path(__file__).parent / 'final_dataset.csv'
+
+VAS_FOREST_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 15,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2,
+    'max_features': 'sqrt',
+    'random_state': 42,
+    'n_jobs': -1,
+}
+# Speed_Upgrades is plain OLS solved from sufficient statistics; tol is its only parameter
+UPGRADES_LINEAR_PARAMS = {'tol': DEFAULT_TOL}
+
+MANIFEST_FILE = 'manifest.json'
+PIPELINE_FILE = 'feature_pipeline.json'
+VAS_MODEL_FILE = 'vas_sold_random_forest.joblib'
+UPGRADES_MODEL_FILE = 'speed_upgrades_linear.joblib'
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_key(data_hash, vas_params=None, upgrades_params=None):
+    """
+    Derive the artifact key for a training data hash and model configuration.
+
+    The key also covers the store, pipeline and scikit-learn versions, since
+    pickled models are not portable across scikit-learn releases.
+    """
+    config = {
+        'data_sha256': data_hash,
+        'vas_params': VAS_FOREST_PARAMS if vas_params is None else vas_params,
+        'upgrades_params': UPGRADES_LINEAR_PARAMS if upgrades_params is None else upgrades_params,
+        'model_store_version': MODEL_STORE_VERSION,
+        'pipeline_version': PIPELINE_VERSION,
+        'sklearn_version': sklearn.__version__,
+    }
+    encoded = json.dumps(config, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class HybridModelArtifacts:
+    """Fitted feature pipeline plus the VAS_Sold and Speed_Upgrades models."""
+
+    def __init__(self, pipeline, vas_model, upgrades_model, key=None, manifest=None):
+        self.pipeline = pipeline
+        self.vas_model = vas_model
+        self.upgrades_model = upgrades_model
+        self.key = key
+        self.manifest = manifest or {}
+
+    def predict_vas(self, X):
+        """Predict VAS_Sold for a feature matrix."""
+        return self.vas_model.predict(X)
+
+    def predict(self, df):
+        """
+        Predict both targets for a DataFrame of raw records.
+
+        Derived feature columns are added to df by the pipeline.
+
+        Returns:
+            tuple: (vas_sold_predictions, speed_upgrades_predictions) as float arrays
+        """
+        X = self.pipeline.transform(df)
+        return self.predict_vas(X), self.upgrades_model.predict(X)
+
+    def save(self, store_dir=DEFAULT_STORE_DIR):
+        """
+        Save the artifacts under store_dir/<key>.
+
+        The directory is written to a temporary location first and renamed into
+        place, so concurrent readers never see a partially written artifact.
+        """
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        final_dir = store_dir / self.key
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{self.key}-', dir=store_dir))
+        try:
+            self.pipeline.save(tmp_dir / PIPELINE_FILE)
+            joblib.dump(self.vas_model, tmp_dir / VAS_MODEL_FILE)
+            joblib.dump(self.upgrades_model, tmp_dir / UPGRADES_MODEL_FILE)
+            with open(tmp_dir / MANIFEST_FILE, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+            try:
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                # Another process saved the same key first; its artifact is equivalent
+                if not final_dir.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return final_dir
+
+    @classmethod
+    def load(cls, key, store_dir=DEFAULT_STORE_DIR):
+        """Load artifacts saved under store_dir/<key>."""
+        artifact_dir = Path(store_dir) / key
+        with open(artifact_dir / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        return cls(
+            FeaturePipeline.load(artifact_dir / PIPELINE_FILE),
+            joblib.load(artifact_dir / VAS_MODEL_FILE),
+            joblib.load(artifact_dir / UPGRADES_MODEL_FILE),
+            key=key,
+            manifest=manifest,
+        )
+
+
+def train_hybrid_models(df_train, vas_params=None, upgrades_params=None):
+    """
+    Fit the feature pipeline and both hybrid models on a training DataFrame.
+
+    Returns:
+        HybridModelArtifacts (without a key)
+    """
+    pipeline = FeaturePipeline()
+    X_train = pipeline.fit_transform(df_train)
+
+    vas_model = RandomForestRegressor(**(VAS_FOREST_PARAMS if vas_params is None else vas_params))
+    vas_model.fit(X_train, df_train['VAS_Sold'])
+
+    upgrades_stats = LinearSufficientStats.from_data(X_train, df_train['Speed_Upgrades'])
+    upgrades_model = upgrades_stats.to_model(**(UPGRADES_LINEAR_PARAMS if upgrades_params is None else upgrades_params))
+
+    return HybridModelArtifacts(pipeline, vas_model, upgrades_model)
+
+
+def prune_store(store_dir=DEFAULT_STORE_DIR, keep=DEFAULT_KEEP_ARTIFACTS, current=None):
+    """
+    Delete all but the keep most recently saved artifact directories.
+
+    Directories being written (hidden temporary ones) are left alone, and the
+    current key is always kept.
+
+    Returns:
+        list: Keys of the deleted artifacts
+    """
+    store_dir = Path(store_dir)
+    if not store_dir.is_dir():
+        return []
+    artifact_dirs = [path for path in store_dir.iterdir() if path.is_dir() and not path.name.startswith('.')]
+    artifact_dirs.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    removed = []
+    for path in artifact_dirs[keep:]:
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+    return removed
+
+
+def load_or_train(data_path=DEFAULT_TRAINING_DATA, store_dir=DEFAULT_STORE_DIR,
+                  vas_params=None, upgrades_params=None, keep=DEFAULT_KEEP_ARTIFACTS):
+    """
+    Load the models for the current training data, training them if needed.
+
+    Args:
+        data_path: Training CSV (final_dataset.csv)
+        store_dir: Directory holding one subdirectory per artifact key
+        vas_params: RandomForestRegressor parameters (default VAS_FOREST_PARAMS)
+        upgrades_params: Speed_Upgrades solver parameters, only 'tol' (default UPGRADES_LINEAR_PARAMS)
+        keep: Artifact directories kept after training a new one (see prune_store)
+
+    Returns:
+        tuple: (HybridModelArtifacts, trained) where trained is False when the
+        models were loaded from the store
+    """
+    data_hash = hash_file(data_path)
+    key = artifact_key(data_hash, vas_params, upgrades_params)
+
+    try:
+        artifacts = HybridModelArtifacts.load(key, store_dir)
+        if artifacts.manifest.get('key') == key:
+            return artifacts, False
+    except (OSError, ValueError, EOFError, KeyError, IndexError, AttributeError, ImportError,
+            pickle.UnpicklingError):
+        pass
+    # Missing or corrupt: remove any unreadable artifact so the retrained one replaces it
+    shutil.rmtree(Path(store_dir) / key, ignore_errors=True)
+
+    df_train = load_dataset(data_path)
+    artifacts = train_hybrid_models(df_train, vas_params, upgrades_params)
+    artifacts.key = key
+    artifacts.manifest = {
+        'key': key,
+        'data_sha256': data_hash,
+        'training_records': len(df_train),
+        'vas_params': VAS_FOREST_PARAMS if vas_params is None else vas_params,
+        'upgrades_params': UPGRADES_LINEAR_PARAMS if upgrades_params is None else upgrades_params,
+        'sklearn_version': sklearn.__version__,
+        'trained_at': pd.Timestamp.now('UTC').isoformat(),
+    }
+    artifacts.save(store_dir)
+    prune_store(store_dir, keep, current=key)
+    return artifacts, True
@@ -1,315 +1,333 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import argparse
+import json
 import os
 from datetime import datetime
+from data_loader import INPUT_COLUMNS, read_dataset_csv
+from forest_pruning import load_pruned
+from incremental_training import load_or_refresh
 
-def get_holiday_features(date):
+def build_summary(daily_predictions, artifacts, trained, predictions_csv, chart_png):
     """
-    Determine if a date is a federal holiday or near a federal holiday.
-    Returns: (is_holiday, days_to_holiday, days_from_holiday)
+    Build the machine-readable prediction result.
+
+    Returns:
+        dict with per-target totals, the top 5 days per target, daily totals,
+        the model version and the output file paths. All values are
+        JSON-serializable.
     """
-    holidays_2025 = [
-        pd.Timestamp('2025-01-01'),  # New Year's Day
-        pd.Timestamp('2025-01-20'),  # Martin Luther King Jr. Day
-        pd.Timestamp('2025-02-17'),  # Presidents' Day
-        pd.Timestamp('2025-05-26'),  # Memorial Day
-        pd.Timestamp('2025-06-19'),  # Juneteenth
-        pd.Timestamp('2025-07-04'),  # Independence Day
-        pd.Timestamp('2025-09-01'),  # Labor Day
-        pd.Timestamp('2025-10-13'),  # Columbus Day
-        pd.Timestamp('2025-11-11'),  # Veterans Day
-        pd.Timestamp('2025-11-27'),  # Thanksgiving
-        pd.Timestamp('2025-12-25'),  # Christmas
+    targets = {
+        'VAS_Sold': 'Push_Notifications_Sent',
+        'Speed_Upgrades': 'Emails_Sent',
+    }
+    totals = {}
+    top_days = {}
+    for target, campaign_column in targets.items():
+        predicted = daily_predictions[f'{target}_Predicted']
+        totals[target] = {
+            'total': int(predicted.sum()),
+            'daily_average': float(predicted.mean()),
+            'min_daily': int(predicted.min()),
+            'max_daily': int(predicted.max()),
+        }
+        top = daily_predictions.nlargest(5, f'{target}_Predicted')
+        top_days[target] = [
+            {
+                'date': row['Date'].strftime('%m/%d/%Y'),
+                'predicted': int(row[f'{target}_Predicted']),
+                campaign_column: int(row[campaign_column]),
+            }
+            for _, row in top.iterrows()
+        ]
+
+    daily = [
+        {
+            'date': row['Date'].strftime('%m/%d/%Y'),
+            'VAS_Sold': int(row['VAS_Sold_Predicted']),
+            'Speed_Upgrades': int(row['Speed_Upgrades_Predicted']),
+            'Emails_Sent': int(row['Emails_Sent']),
+            'Push_Notifications_Sent': int(row['Push_Notifications_Sent']),
+        }
+        for _, row in daily_predictions.iterrows()
     ]
 
-    all_holidays = holidays_2025
-
-    # Check if current date is a holiday
-    is_holiday = 1 if date in all_holidays else 0
-
-    # Calculate days to nearest holiday
-    if all_holidays:
-        days_diff = [(holiday - date).days for holiday in all_holidays]
+    return {
+        'tool': 'predict_december_2025',
+        'model_version': artifacts.key,
+        'retrained': trained,
+        'totals': totals,
+        'top_days': top_days,
+        'daily': daily,
+        'files': {'predictions_csv': predictions_csv, 'chart_png': chart_png},
+    }
 
-        # Days to next holiday (positive values only)
-        future_days = [d for d in days_diff if d >= 0]
-        days_to_holiday = min(future_days) if future_days else 365
 
-        # Days from previous holiday (negative values, take absolute)
-        past_days = [abs(d) for d in days_diff if d < 0]
-        days_from_holiday = min(past_days) if past_days else 365
+def main(artifacts=None, quiet=False, output_dir='output_files', pruned=False):
+    """
+    Predict December 2025 sales and save the predictions CSV and chart.
+
+    Args:
+        artifacts: Preloaded HybridModelArtifacts (e.g. kept resident by a
+            long-lived worker). Loaded with incremental_training.load_or_refresh
+            when omitted.
+        quiet: Skip the console report
+        output_dir: Directory for the predictions CSV and chart PNG (created if missing)
+        pruned: Serve the pruned VAS_Sold forest saved by forest_pruning.py
+            when one was trained on the current training data, falling back
+            to the full forest otherwise. Ignored when artifacts is given.
+
+    Returns:
+        dict: JSON-serializable result from build_summary()
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+
+    log("="*80)
+    log("DECEMBER 2025 SALES PREDICTION")
+    log("Using Hybrid Model: Random Forest (VAS_Sold) + Linear Regression (Speed_Upgrades)")
+    log("="*80)
+
+    # Load the fitted models, folding in appended rows and refitting only if the data was rewritten
+    log("\n[1/5] Loading hybrid models...")
+    refresh_summary = {'mode': 'unchanged'}
+    if artifacts is None and pruned:
+        artifacts = load_pruned('final_dataset.csv')
+        if artifacts is None:
+            log("  No pruned model for the current training data (run forest_pruning.py); using the full forest")
+    if artifacts is None:
+        artifacts, refresh_summary = load_or_refresh('final_dataset.csv')
+    trained = refresh_summary['mode'] != 'unchanged'
+    pipeline = artifacts.pipeline
+    model_upgrades = artifacts.upgrades_model
+
+    log(f"  Model version: {artifacts.key}")
+    log(f"  Training records: {artifacts.manifest['training_records']}")
+    log(f"  Random Forest trees: {len(artifacts.vas_model.estimators_)}")
+
+    if refresh_summary['mode'] == 'full':
+        log(f"\n[2/5] Trained Random Forest for VAS_Sold ({refresh_summary['reason']})")
+        log("  [OK] Random Forest trained")
+        log("\n[3/5] Trained Linear Regression for Speed_Upgrades")
+        log("  [OK] Linear Regression trained")
+    elif refresh_summary['mode'] == 'incremental':
+        log(f"\n[2/5] Updated Random Forest for VAS_Sold with {refresh_summary['rows_ingested']} appended rows")
+        log(f"  [OK] Random Forest updated (+{refresh_summary['trees_added']} trees)")
+        log("\n[3/5] Updated Linear Regression for Speed_Upgrades")
+        log("  [OK] Linear Regression updated")
     else:
-        days_to_holiday = 365
-        days_from_holiday = 365
-
-    return is_holiday, days_to_holiday, days_from_holiday
-
-print("="*80)
-print("DECEMBER 2025 SALES PREDICTION")
-print("Using Hybrid Model: Random Forest (VAS_Sold) + Linear Regression (Speed_Upgrades)")
-print("="*80)
-
-# Load the training data to train the models
-print("\n[1/5] Loading training data...")
-df_train = pd.read_csv('final_dataset.csv')
-df_train['Date'] = pd.to_datetime(df_train['Date'])
-
-# Feature engineering on training data
-df_train['Day_of_Year'] = df_train['Date'].dt.dayofyear
-df_train['Day_of_Week'] = df_train['Date'].dt.dayofweek
-df_train['Month'] = df_train['Date'].dt.month
-
-# Add holiday features
-holiday_features = df_train['Date'].apply(get_holiday_features)
-df_train['Is_Holiday'] = holiday_features.apply(lambda x: x[0])
-df_train['Days_To_Holiday'] = holiday_features.apply(lambda x: x[1])
-df_train['Days_From_Holiday'] = holiday_features.apply(lambda x: x[2])
-df_train['Near_Holiday'] = ((df_train['Days_To_Holiday'] <= 1) | (df_train['Days_From_Holiday'] <= 1)).astype(int)
-
-# Encode Channel
-le = LabelEncoder()
-df_train['Channel_Encoded'] = le.fit_transform(df_train['Channel'])
-
-feature_columns = ['Day_of_Year', 'Day_of_Week', 'Month', 'Channel_Encoded',
-                   'Emails_Sent', 'Push_Notifications_Sent',
-                   'Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday', 'Near_Holiday']
-
-X_train = df_train[feature_columns]
-
-print(f"  Training records: {len(df_train)}")
-
-# Train Random Forest for VAS_Sold
-print("\n[2/5] Training Random Forest for VAS_Sold...")
-y_vas = df_train['VAS_Sold']
-model_vas = RandomForestRegressor(
-    n_estimators=200,
-    max_depth=15,
-    min_samples_split=5,
-    min_samples_leaf=2,
-    max_features='sqrt',
-    random_state=42,
-    n_jobs=-1
-)
-model_vas.fit(X_train, y_vas)
-print("  [OK] Random Forest trained")
-
-# Train Linear Regression for Speed_Upgrades
-print("\n[3/5] Training Linear Regression for Speed_Upgrades...")
-y_upgrades = df_train['Speed_Upgrades']
-model_upgrades = LinearRegression()
-model_upgrades.fit(X_train, y_upgrades)
-print("  [OK] Linear Regression trained")
-
-# Load December test data
-print("\n[4/5] Loading December 2025 test data...")
-df_test = pd.read_csv('test_dataset_dec_2025.csv')
-df_test['Date'] = pd.to_datetime(df_test['Date'])
-
-# Feature engineering on test data
-df_test['Day_of_Year'] = df_test['Date'].dt.dayofyear
-df_test['Day_of_Week'] = df_test['Date'].dt.dayofweek
-df_test['Month'] = df_test['Date'].dt.month
-
-# Add holiday features
-holiday_features_test = df_test['Date'].apply(get_holiday_features)
-df_test['Is_Holiday'] = holiday_features_test.apply(lambda x: x[0])
-df_test['Days_To_Holiday'] = holiday_features_test.apply(lambda x: x[1])
-df_test['Days_From_Holiday'] = holiday_features_test.apply(lambda x: x[2])
-df_test['Near_Holiday'] = ((df_test['Days_To_Holiday'] <= 1) | (df_test['Days_From_Holiday'] <= 1)).astype(int)
-
-# Encode Channel using the same encoder
-df_test['Channel_Encoded'] = le.transform(df_test['Channel'])
-
-# Prepare features for prediction
-X_test = df_test[feature_columns]
-
-print(f"  Test records: {len(df_test)}")
-print(f"  Date range: {df_test['Date'].min().strftime('%m/%d/%Y')} to {df_test['Date'].max().strftime('%m/%d/%Y')}")
-
-# Make predictions
-print("\n[5/5] Generating predictions...")
-df_test['VAS_Sold_Predicted'] = model_vas.predict(X_test)
-df_test['Speed_Upgrades_Predicted'] = model_upgrades.predict(X_test)
-
-# Round predictions to nearest integer (can't sell fractional items)
-df_test['VAS_Sold_Predicted'] = df_test['VAS_Sold_Predicted'].round().astype(int)
-df_test['Speed_Upgrades_Predicted'] = df_test['Speed_Upgrades_Predicted'].round().astype(int)
-
-print("  [OK] Predictions complete")
-
-# Aggregate daily totals
-daily_predictions = df_test.groupby('Date').agg({
-    'VAS_Sold_Predicted': 'sum',
-    'Speed_Upgrades_Predicted': 'sum',
-    'Emails_Sent': 'sum',
-    'Push_Notifications_Sent': 'sum'
-}).reset_index()
-
-# Calculate cumulative sums for visualization
-daily_predictions['VAS_Sold_Cumulative'] = daily_predictions['VAS_Sold_Predicted'].cumsum()
-daily_predictions['Speed_Upgrades_Cumulative'] = daily_predictions['Speed_Upgrades_Predicted'].cumsum()
-
-# Summary statistics
-print("\n" + "="*80)
-print("DECEMBER 2025 PREDICTIONS SUMMARY")
-print("="*80)
-
-total_vas = daily_predictions['VAS_Sold_Predicted'].sum()
-total_upgrades = daily_predictions['Speed_Upgrades_Predicted'].sum()
-avg_vas = daily_predictions['VAS_Sold_Predicted'].mean()
-avg_upgrades = daily_predictions['Speed_Upgrades_Predicted'].mean()
-
-print(f"\nVAS_Sold:")
-print(f"  Total for December: {total_vas:,}")
-print(f"  Daily Average: {avg_vas:.1f}")
-print(f"  Min Daily: {daily_predictions['VAS_Sold_Predicted'].min()}")
-print(f"  Max Daily: {daily_predictions['VAS_Sold_Predicted'].max()}")
-
-print(f"\nSpeed_Upgrades:")
-print(f"  Total for December: {total_upgrades:,}")
-print(f"  Daily Average: {avg_upgrades:.1f}")
-print(f"  Min Daily: {daily_predictions['Speed_Upgrades_Predicted'].min()}")
-print(f"  Max Daily: {daily_predictions['Speed_Upgrades_Predicted'].max()}")
-
-# Top 5 days for each metric
-print("\n" + "-"*80)
-print("TOP 5 DAYS BY VAS_SOLD:")
-top_vas = daily_predictions.nlargest(5, 'VAS_Sold_Predicted')[['Date', 'VAS_Sold_Predicted', 'Push_Notifications_Sent']]
-for idx, row in top_vas.iterrows():
-    print(f"  {row['Date'].strftime('%m/%d/%Y')}: {row['VAS_Sold_Predicted']:,} VAS (Push: {row['Push_Notifications_Sent']:,})")
-
-print("\nTOP 5 DAYS BY SPEED_UPGRADES:")
-top_upgrades = daily_predictions.nlargest(5, 'Speed_Upgrades_Predicted')[['Date', 'Speed_Upgrades_Predicted', 'Emails_Sent']]
-for idx, row in top_upgrades.iterrows():
-    print(f"  {row['Date'].strftime('%m/%d/%Y')}: {row['Speed_Upgrades_Predicted']:,} Upgrades (Emails: {row['Emails_Sent']:,})")
-
-# Save predictions to CSV
-os.makedirs('output_files', exist_ok=True)
-timestamp = datetime.utcnow().isoformat(timespec='milliseconds').replace(':', '-').replace('.', '-') + 'Z'
-output_file = f'output_files/december_2025_predictions_{timestamp}.csv'
-df_test_output = df_test[['Date', 'Channel', 'VAS_Sold_Predicted', 'Speed_Upgrades_Predicted',
-                          'Emails_Sent', 'Push_Notifications_Sent']].copy()
-df_test_output['Date'] = df_test_output['Date'].dt.strftime('%m/%d/%Y')
-df_test_output.to_csv(output_file, index=False)
-print(f"\n[OK] Detailed predictions saved to: {output_file}")
-
-# Create visualization
-print("\n" + "="*80)
-print("GENERATING VISUALIZATION")
-print("="*80)
-
-fig, axes = plt.subplots(2, 1, figsize=(16, 12))
-fig.suptitle('December 2025 Sales Predictions - Cumulative Day-Over-Day\nHybrid Model: Random Forest (VAS) + Linear Regression (Upgrades)',
-             fontsize=16, fontweight='bold', y=0.995)
-
-# Plot 1: VAS_Sold Cumulative
-ax1 = axes[0]
-ax1.plot(daily_predictions['Date'], daily_predictions['VAS_Sold_Cumulative'],
-         marker='o', linestyle='-', linewidth=3, markersize=8,
-         color='#2E86AB', label='VAS Sold (Cumulative)', alpha=0.9)
-
-# Fill area under the curve
-ax1.fill_between(daily_predictions['Date'], 0, daily_predictions['VAS_Sold_Cumulative'],
-                 alpha=0.2, color='#2E86AB')
-
-# Highlight marketing campaign days on the cumulative line
-campaign_days = daily_predictions[daily_predictions['Push_Notifications_Sent'] > 0]
-ax1.scatter(campaign_days['Date'], campaign_days['VAS_Sold_Cumulative'],
-           s=200, color='#F18F01', marker='*', label='Campaign Day (Push Notifications)',
-           zorder=5, edgecolors='black', linewidths=1.5)
-
-ax1.set_xlabel('Date', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Cumulative VAS Sold', fontsize=12, fontweight='bold')
-ax1.set_title(f'VAS Sold (Cumulative) - Month Total: {total_vas:,} | Daily Avg: {avg_vas:.1f}',
-             fontsize=14, fontweight='bold', pad=15)
-ax1.legend(loc='upper left', fontsize=11, framealpha=0.95)
-ax1.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-
-# Format x-axis
-ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-ax1.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
-
-# Add milestone labels (every 5 days)
-for i in range(0, len(daily_predictions), 5):
-    row = daily_predictions.iloc[i]
-    ax1.annotate(f'{int(row["VAS_Sold_Cumulative"]):,}',
-                xy=(row['Date'], row['VAS_Sold_Cumulative']),
-                xytext=(0, 10), textcoords='offset points',
-                ha='center', fontsize=9, fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='lightblue', alpha=0.7))
-
-# Add final total at the end
-final_row = daily_predictions.iloc[-1]
-ax1.annotate(f'Final: {int(final_row["VAS_Sold_Cumulative"]):,}',
-            xy=(final_row['Date'], final_row['VAS_Sold_Cumulative']),
-            xytext=(10, 10), textcoords='offset points',
-            ha='left', fontsize=11, fontweight='bold',
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='#F18F01', alpha=0.9))
-
-# Plot 2: Speed_Upgrades Cumulative
-ax2 = axes[1]
-ax2.plot(daily_predictions['Date'], daily_predictions['Speed_Upgrades_Cumulative'],
-         marker='s', linestyle='-', linewidth=3, markersize=8,
-         color='#A23B72', label='Speed Upgrades (Cumulative)', alpha=0.9)
-
-# Fill area under the curve
-ax2.fill_between(daily_predictions['Date'], 0, daily_predictions['Speed_Upgrades_Cumulative'],
-                 alpha=0.2, color='#A23B72')
-
-# Highlight marketing campaign days on the cumulative line
-campaign_days_email = daily_predictions[daily_predictions['Emails_Sent'] > 0]
-ax2.scatter(campaign_days_email['Date'], campaign_days_email['Speed_Upgrades_Cumulative'],
-           s=200, color='#C73E1D', marker='*', label='Campaign Day (Emails)',
-           zorder=5, edgecolors='black', linewidths=1.5)
-
-ax2.set_xlabel('Date', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Cumulative Speed Upgrades', fontsize=12, fontweight='bold')
-ax2.set_title(f'Speed Upgrades (Cumulative) - Month Total: {total_upgrades:,} | Daily Avg: {avg_upgrades:.1f}',
-             fontsize=14, fontweight='bold', pad=15)
-ax2.legend(loc='upper left', fontsize=11, framealpha=0.95)
-ax2.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-
-# Format x-axis
-ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-ax2.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
-
-# Add milestone labels (every 5 days)
-for i in range(0, len(daily_predictions), 5):
-    row = daily_predictions.iloc[i]
-    ax2.annotate(f'{int(row["Speed_Upgrades_Cumulative"]):,}',
-                xy=(row['Date'], row['Speed_Upgrades_Cumulative']),
-                xytext=(0, 10), textcoords='offset points',
-                ha='center', fontsize=9, fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='lightpink', alpha=0.7))
-
-# Add final total at the end
-final_row = daily_predictions.iloc[-1]
-ax2.annotate(f'Final: {int(final_row["Speed_Upgrades_Cumulative"]):,}',
-            xy=(final_row['Date'], final_row['Speed_Upgrades_Cumulative']),
-            xytext=(10, 10), textcoords='offset points',
-            ha='left', fontsize=11, fontweight='bold',
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='#C73E1D', alpha=0.9))
-
-plt.tight_layout()
-
-# Save the figure
-output_chart = f'output_files/december_2025_predictions_chart_{timestamp}.png'
-plt.savefig(output_chart, dpi=100, bbox_inches='tight')
-print(f"[OK] Chart saved to: {output_chart}")
-
-plt.close()
-
-print("\n" + "="*80)
-print("PREDICTION COMPLETE!")
-print("="*80)
-print(f"\nFiles created:")
-print(f"  1. {output_file} - Detailed predictions by date and channel")
-print(f"  2. {output_chart} - Line chart visualization")
-print("\n" + "="*80)
+        log("\n[2/5] Random Forest for VAS_Sold loaded (no rows appended since the last run)")
+        log("  [OK] Random Forest loaded")
+        log("\n[3/5] Linear Regression for Speed_Upgrades loaded")
+        log("  [OK] Linear Regression loaded")
+
+    # Load December test data
+    log("\n[4/5] Loading December 2025 test data...")
+    df_test = read_dataset_csv('test_dataset_dec_2025.csv', usecols=INPUT_COLUMNS)
+
+    # Feature engineering on test data using the same fitted pipeline
+    X_test = pipeline.transform(df_test)
+
+    log(f"  Test records: {len(df_test)}")
+    log(f"  Date range: {df_test['Date'].min().strftime('%m/%d/%Y')} to {df_test['Date'].max().strftime('%m/%d/%Y')}")
+
+    # Make predictions
+    log("\n[5/5] Generating predictions...")
+    # Compiled forest for batches this size; identical to RandomForestRegressor.predict
+    df_test['VAS_Sold_Predicted'] = artifacts.predict_vas(X_test)
+    df_test['Speed_Upgrades_Predicted'] = model_upgrades.predict(X_test)
+
+    # Round predictions to nearest integer (can't sell fractional items)
+    df_test['VAS_Sold_Predicted'] = df_test['VAS_Sold_Predicted'].round().astype(int)
+    df_test['Speed_Upgrades_Predicted'] = df_test['Speed_Upgrades_Predicted'].round().astype(int)
+
+    log("  [OK] Predictions complete")
+
+    # Aggregate daily totals
+    daily_predictions = df_test.groupby('Date').agg({
+        'VAS_Sold_Predicted': 'sum',
+        'Speed_Upgrades_Predicted': 'sum',
+        'Emails_Sent': 'sum',
+        'Push_Notifications_Sent': 'sum'
+    }).reset_index()
+
+    # Calculate cumulative sums for visualization
+    daily_predictions['VAS_Sold_Cumulative'] = daily_predictions['VAS_Sold_Predicted'].cumsum()
+    daily_predictions['Speed_Upgrades_Cumulative'] = daily_predictions['Speed_Upgrades_Predicted'].cumsum()
+
+    # Summary statistics
+    log("\n" + "="*80)
+    log("DECEMBER 2025 PREDICTIONS SUMMARY")
+    log("="*80)
+
+    total_vas = daily_predictions['VAS_Sold_Predicted'].sum()
+    total_upgrades = daily_predictions['Speed_Upgrades_Predicted'].sum()
+    avg_vas = daily_predictions['VAS_Sold_Predicted'].mean()
+    avg_upgrades = daily_predictions['Speed_Upgrades_Predicted'].mean()
+
+    log(f"\nVAS_Sold:")
+    log(f"  Total for December: {total_vas:,}")
+    log(f"  Daily Average: {avg_vas:.1f}")
+    log(f"  Min Daily: {daily_predictions['VAS_Sold_Predicted'].min()}")
+    log(f"  Max Daily: {daily_predictions['VAS_Sold_Predicted'].max()}")
+
+    log(f"\nSpeed_Upgrades:")
+    log(f"  Total for December: {total_upgrades:,}")
+    log(f"  Daily Average: {avg_upgrades:.1f}")
+    log(f"  Min Daily: {daily_predictions['Speed_Upgrades_Predicted'].min()}")
+    log(f"  Max Daily: {daily_predictions['Speed_Upgrades_Predicted'].max()}")
+
+    # Top 5 days for each metric
+    log("\n" + "-"*80)
+    log("TOP 5 DAYS BY VAS_SOLD:")
+    top_vas = daily_predictions.nlargest(5, 'VAS_Sold_Predicted')[['Date', 'VAS_Sold_Predicted', 'Push_Notifications_Sent']]
+    for idx, row in top_vas.iterrows():
+        log(f"  {row['Date'].strftime('%m/%d/%Y')}: {row['VAS_Sold_Predicted']:,} VAS (Push: {row['Push_Notifications_Sent']:,})")
+
+    log("\nTOP 5 DAYS BY SPEED_UPGRADES:")
+    top_upgrades = daily_predictions.nlargest(5, 'Speed_Upgrades_Predicted')[['Date', 'Speed_Upgrades_Predicted', 'Emails_Sent']]
+    for idx, row in top_upgrades.iterrows():
+        log(f"  {row['Date'].strftime('%m/%d/%Y')}: {row['Speed_Upgrades_Predicted']:,} Upgrades (Emails: {row['Emails_Sent']:,})")
+
+    # Save predictions to CSV
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.utcnow().isoformat(timespec='milliseconds').replace(':', '-').replace('.', '-') + 'Z'
+    output_file = os.path.join(output_dir, f'december_2025_predictions_{timestamp}.csv')
+    df_test_output = df_test[['Date', 'Channel', 'VAS_Sold_Predicted', 'Speed_Upgrades_Predicted',
+                              'Emails_Sent', 'Push_Notifications_Sent']].copy()
+    df_test_output['Date'] = df_test_output['Date'].dt.strftime('%m/%d/%Y')
+    df_test_output.to_csv(output_file, index=False)
+    log(f"\n[OK] Detailed predictions saved to: {output_file}")
+
+    # Create visualization
+    log("\n" + "="*80)
+    log("GENERATING VISUALIZATION")
+    log("="*80)
+
+    fig, axes = plt.subplots(2, 1, figsize=(16, 12))
+    fig.suptitle('December 2025 Sales Predictions - Cumulative Day-Over-Day\nHybrid Model: Random Forest (VAS) + Linear Regression (Upgrades)',
+                 fontsize=16, fontweight='bold', y=0.995)
+
+    # Plot 1: VAS_Sold Cumulative
+    ax1 = axes[0]
+    ax1.plot(daily_predictions['Date'], daily_predictions['VAS_Sold_Cumulative'],
+             marker='o', linestyle='-', linewidth=3, markersize=8,
+             color='#2E86AB', label='VAS Sold (Cumulative)', alpha=0.9)
+
+    # Fill area under the curve
+    ax1.fill_between(daily_predictions['Date'], 0, daily_predictions['VAS_Sold_Cumulative'],
+                     alpha=0.2, color='#2E86AB')
+
+    # Highlight marketing campaign days on the cumulative line
+    campaign_days = daily_predictions[daily_predictions['Push_Notifications_Sent'] > 0]
+    ax1.scatter(campaign_days['Date'], campaign_days['VAS_Sold_Cumulative'],
+               s=200, color='#F18F01', marker='*', label='Campaign Day (Push Notifications)',
+               zorder=5, edgecolors='black', linewidths=1.5)
+
+    ax1.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Cumulative VAS Sold', fontsize=12, fontweight='bold')
+    ax1.set_title(f'VAS Sold (Cumulative) - Month Total: {total_vas:,} | Daily Avg: {avg_vas:.1f}',
+                 fontsize=14, fontweight='bold', pad=15)
+    ax1.legend(loc='upper left', fontsize=11, framealpha=0.95)
+    ax1.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
+
+    # Format x-axis
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax1.xaxis.set_major_locator(mdates.DayLocator(interval=2))
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+    # Add milestone labels (every 5 days)
+    for i in range(0, len(daily_predictions), 5):
+        row = daily_predictions.iloc[i]
+        ax1.annotate(f'{int(row["VAS_Sold_Cumulative"]):,}',
+                    xy=(row['Date'], row['VAS_Sold_Cumulative']),
+                    xytext=(0, 10), textcoords='offset points',
+                    ha='center', fontsize=9, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='lightblue', alpha=0.7))
+
+    # Add final total at the end
+    final_row = daily_predictions.iloc[-1]
+    ax1.annotate(f'Final: {int(final_row["VAS_Sold_Cumulative"]):,}',
+                xy=(final_row['Date'], final_row['VAS_Sold_Cumulative']),
+                xytext=(10, 10), textcoords='offset points',
+                ha='left', fontsize=11, fontweight='bold',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='#F18F01', alpha=0.9))
+
+    # Plot 2: Speed_Upgrades Cumulative
+    ax2 = axes[1]
+    ax2.plot(daily_predictions['Date'], daily_predictions['Speed_Upgrades_Cumulative'],
+             marker='s', linestyle='-', linewidth=3, markersize=8,
+             color='#A23B72', label='Speed Upgrades (Cumulative)', alpha=0.9)
+
+    # Fill area under the curve
+    ax2.fill_between(daily_predictions['Date'], 0, daily_predictions['Speed_Upgrades_Cumulative'],
+                     alpha=0.2, color='#A23B72')
+
+    # Highlight marketing campaign days on the cumulative line
+    campaign_days_email = daily_predictions[daily_predictions['Emails_Sent'] > 0]
+    ax2.scatter(campaign_days_email['Date'], campaign_days_email['Speed_Upgrades_Cumulative'],
+               s=200, color='#C73E1D', marker='*', label='Campaign Day (Emails)',
+               zorder=5, edgecolors='black', linewidths=1.5)
+
+    ax2.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Cumulative Speed Upgrades', fontsize=12, fontweight='bold')
+    ax2.set_title(f'Speed Upgrades (Cumulative) - Month Total: {total_upgrades:,} | Daily Avg: {avg_upgrades:.1f}',
+                 fontsize=14, fontweight='bold', pad=15)
+    ax2.legend(loc='upper left', fontsize=11, framealpha=0.95)
+    ax2.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
+
+    # Format x-axis
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax2.xaxis.set_major_locator(mdates.DayLocator(interval=2))
+    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+    # Add milestone labels (every 5 days)
+    for i in range(0, len(daily_predictions), 5):
+        row = daily_predictions.iloc[i]
+        ax2.annotate(f'{int(row["Speed_Upgrades_Cumulative"]):,}',
+                    xy=(row['Date'], row['Speed_Upgrades_Cumulative']),
+                    xytext=(0, 10), textcoords='offset points',
+                    ha='center', fontsize=9, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='lightpink', alpha=0.7))
+
+    # Add final total at the end
+    final_row = daily_predictions.iloc[-1]
+    ax2.annotate(f'Final: {int(final_row["Speed_Upgrades_Cumulative"]):,}',
+                xy=(final_row['Date'], final_row['Speed_Upgrades_Cumulative']),
+                xytext=(10, 10), textcoords='offset points',
+                ha='left', fontsize=11, fontweight='bold',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='#C73E1D', alpha=0.9))
+
+    plt.tight_layout()
+
+    # Save the figure
+    output_chart = os.path.join(output_dir, f'december_2025_predictions_chart_{timestamp}.png')
+    plt.savefig(output_chart, dpi=100, bbox_inches='tight')
+    log(f"[OK] Chart saved to: {output_chart}")
+
+    plt.close()
+
+    log("\n" + "="*80)
+    log("PREDICTION COMPLETE!")
+    log("="*80)
+    log(f"\nFiles created:")
+    log(f"  1. {output_file} - Detailed predictions by date and channel")
+    log(f"  2. {output_chart} - Line chart visualization")
+    log("\n" + "="*80)
+
+    return build_summary(daily_predictions, artifacts, trained, output_file, output_chart)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Predict December 2025 sales with the hybrid models')
+    parser.add_argument('--quiet', action='store_true', help='Skip the console report')
+    parser.add_argument('--json', action='store_true', help='Print the result as a JSON object')
+    parser.add_argument('--output-dir', default='output_files', help='Directory for the predictions CSV and chart PNG')
+    parser.add_argument('--pruned', action='store_true',
+                        help='Use the pruned forest from forest_pruning.py if it matches the training data')
+    args = parser.parse_args()
+
+    summary = main(quiet=args.quiet, output_dir=args.output_dir, pruned=args.pruned)
+    if args.json:
+        print(json.dumps(summary, indent=2))
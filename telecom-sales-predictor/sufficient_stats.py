@@ -0,0 +1,350 @@
+"""
+Sufficient statistics for ordinary least squares.
+
+An OLS fit with an intercept depends on the training rows only through their
+count, the column means of [X | y] and the centered cross-product matrix
+Zᵀ Z of Z = [X | y] - mean. LinearSufficientStats keeps the count, the means
+and the upper-triangular factor R of Z (Zᵀ Z = Rᵀ R), so rows can be added in
+batches, statistics of separate partitions merged, and a partition's rows
+subtracted again for sliding-window refits, all without keeping the rows.
+
+fit_partitions() computes the statistics of each partition (a byte range of
+a CSV, a month file, ...) in a process pool, merges them and leaves a single
+small solve. Fitting is linear in the number of rows, and memory is one
+partition per worker. fit_csv() does this for byte ranges of a telecom CSV,
+one per worker by default. The training scripts (model_store,
+analyze_data_hybrid, incremental_training) already hold their rows and build
+the statistics in-process with from_data() or update() instead.
+
+Keeping R rather than Zᵀ Z avoids squaring the condition number: the centered
+feature matrix of the telecom history has singular values from 5.5e6 down to
+3.8, and LinearRegression drops those below tol * the largest (tol=1e-6).
+Solving from R reproduces that truncation, and with it LinearRegression's
+coefficients, to machine precision, which the normal equations cannot.
+
+Usage:
+    python sufficient_stats.py --workers 4 --before 2025-08-01
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import linalg
+from sklearn.linear_model import LinearRegression
+
+from data_loader import DATE_COLUMN, csv_byte_ranges, read_dataset_csv, read_dataset_csv_range
+from feature_pipeline import FeaturePipeline
+
+# LinearRegression's default cutoff for small singular values, relative to the largest
+DEFAULT_TOL = 1e-6
+
+
+class LinearSufficientStats:
+    """
+    Count, means and triangular factor of the centered [X | y] rows.
+
+    Attributes:
+        n_features: Number of columns in X
+        count: Number of rows accumulated
+        mean: (n_features + 1,) column means of [X | y]
+        r_factor: (n_features + 1, n_features + 1) upper-triangular R with
+            Rᵀ R equal to the centered cross-product matrix of [X | y]
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.count = 0
+        self.mean = np.zeros(n_features + 1)
+        self.r_factor = np.zeros((n_features + 1, n_features + 1))
+
+    @classmethod
+    def from_data(cls, X, y):
+        """Compute the statistics of one batch of rows."""
+        X = np.asarray(X, dtype=np.float64)
+        stats = cls(X.shape[1])
+        stats.update(X, y)
+        return stats
+
+    @property
+    def crossproducts(self):
+        """Centered cross-product matrix of [X | y] (Rᵀ R)."""
+        return self.r_factor.T @ self.r_factor
+
+    def update(self, X, y):
+        """
+        Add a batch of rows.
+
+        Args:
+            X: (rows, n_features) feature matrix
+            y: (rows,) target values
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features or len(y) != len(X):
+            raise ValueError(f"Expected X with {self.n_features} columns and one y value per row, "
+                             f"got X {X.shape} and y {y.shape}")
+        if len(X) == 0:
+            return self
+        Z = np.column_stack([X, y])
+        batch_mean = Z.mean(axis=0)
+        return self._combine(len(Z), batch_mean, _triangular_factor(Z - batch_mean))
+
+    def merge(self, other):
+        """Add the rows summarized by another LinearSufficientStats; returns self."""
+        if other.n_features != self.n_features:
+            raise ValueError(f"Cannot merge statistics for {other.n_features} features "
+                             f"into statistics for {self.n_features}")
+        if other.count == 0:
+            return self
+        return self._combine(other.count, other.mean, other.r_factor)
+
+    def subtract(self, other):
+        """
+        Remove the rows summarized by another LinearSufficientStats; returns self.
+
+        other must describe a subset of the rows accumulated here, e.g. the
+        oldest month of a sliding window. R is downdated one row at a time
+        with hyperbolic rotations, which is accurate while the remaining rows
+        still determine every coefficient.
+
+        Raises:
+            ValueError: If other has more rows than self, or the remaining
+                rows would leave the system singular (refit from the rows instead)
+        """
+        if other.n_features != self.n_features:
+            raise ValueError(f"Cannot subtract statistics for {other.n_features} features "
+                             f"from statistics for {self.n_features}")
+        if other.count == 0:
+            return self
+        if other.count > self.count:
+            raise ValueError(f"Cannot subtract {other.count} rows from {self.count}")
+        if other.count == self.count:
+            self.count = 0
+            self.mean = np.zeros(self.n_features + 1)
+            self.r_factor = np.zeros((self.n_features + 1, self.n_features + 1))
+            return self
+        remaining = self.count - other.count
+        mean = (self.mean * self.count - other.mean * other.count) / remaining
+        shift = (other.mean - mean) * np.sqrt(remaining * other.count / self.count)
+        r_factor = self.r_factor.copy()
+        for row in np.vstack([other.r_factor, shift]):
+            _downdate(r_factor, row)
+        self.r_factor = r_factor
+        self.mean = mean
+        self.count = remaining
+        return self
+
+    def _combine(self, count, mean, r_factor):
+        # Pairwise update: the union's centered cross-products are the two parts'
+        # plus a rank-one term for the shift between their means
+        total = self.count + count
+        delta = mean - self.mean
+        shift = delta * np.sqrt(self.count * count / total)
+        self.r_factor = _triangular_factor(np.vstack([self.r_factor, r_factor, shift]))
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+        return self
+
+    def solve(self, tol=DEFAULT_TOL):
+        """
+        Solve for the OLS coefficients, as LinearRegression(tol=tol) does.
+
+        Singular values below tol times the largest are treated as zero, and
+        the minimum-norm solution of the rest is returned.
+
+        Returns:
+            tuple: (coef, intercept, rank, singular_values)
+
+        Raises:
+            ValueError: If no rows have been accumulated
+        """
+        if self.count == 0:
+            raise ValueError("Cannot solve without any rows")
+        p = self.n_features
+        coef, _, rank, singular = linalg.lstsq(self.r_factor[:p, :p], self.r_factor[:p, p], cond=tol)
+        intercept = self.mean[p] - self.mean[:p] @ coef
+        return coef, float(intercept), int(rank), singular
+
+    def to_model(self, tol=DEFAULT_TOL):
+        """Return a fitted LinearRegression with the solved coefficients."""
+        coef, intercept, rank, singular = self.solve(tol)
+        model = LinearRegression(tol=tol)
+        model.coef_ = coef
+        model.intercept_ = intercept
+        model.rank_ = rank
+        model.singular_ = singular
+        model.n_features_in_ = self.n_features
+        return model
+
+    def to_dict(self):
+        """Return the statistics as a JSON-serializable dict."""
+        return {
+            'n_features': self.n_features,
+            'count': self.count,
+            'mean': self.mean.tolist(),
+            'r_factor': self.r_factor.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild statistics from to_dict() output."""
+        stats = cls(state['n_features'])
+        stats.count = state['count']
+        stats.mean = np.array(state['mean'], dtype=np.float64)
+        stats.r_factor = np.array(state['r_factor'], dtype=np.float64)
+        return stats
+
+
+def _downdate(r_factor, row):
+    """Replace upper-triangular R in place by R' with R'ᵀ R' = Rᵀ R - row rowᵀ."""
+    row = row.copy()
+    # Rows with a negative diagonal are flipped; Rᵀ R is unchanged
+    r_factor *= np.where(np.diag(r_factor) < 0, -1.0, 1.0)[:, None]
+    scale = np.abs(r_factor).max(initial=0.0)
+    for k in range(len(row)):
+        diagonal = r_factor[k, k]
+        if row[k] == 0:
+            continue
+        remaining = diagonal * diagonal - row[k] * row[k]
+        if diagonal == 0 or remaining <= (np.finfo(float).eps * scale) ** 2:
+            raise ValueError("Subtracting these rows leaves a singular system")
+        reduced = np.sqrt(remaining)
+        cosine, sine = reduced / diagonal, row[k] / diagonal
+        r_factor[k, k] = reduced
+        r_factor[k, k + 1:] = (r_factor[k, k + 1:] - sine * row[k + 1:]) / cosine
+        row[k + 1:] = cosine * row[k + 1:] - sine * r_factor[k, k + 1:]
+
+
+def fit_partitions(compute, partitions, max_workers=None):
+    """
+    Compute the statistics of each partition in a process pool and merge them.
+
+    Args:
+        compute: Picklable callable returning the LinearSufficientStats of one
+            partition (a module-level function or a functools.partial of one)
+        partitions: Partition descriptions passed to compute, e.g. byte ranges
+        max_workers: Worker processes (default: one per CPU). With 1, or a
+            single partition, everything runs in this process.
+
+    Returns:
+        LinearSufficientStats of all partitions, merged in order
+    """
+    partitions = list(partitions)
+    if max_workers == 1 or len(partitions) <= 1:
+        results = map(compute, partitions)
+        return functools.reduce(LinearSufficientStats.merge, results)
+    with ProcessPoolExecutor(max_workers=min(max_workers or len(partitions), len(partitions))) as pool:
+        return functools.reduce(LinearSufficientStats.merge, pool.map(compute, partitions))
+
+
+def csv_partition_stats(byte_range, csv_path, pipeline_state, target, before=None):
+    """
+    Compute the statistics of the rows in one byte range of a telecom CSV.
+
+    Module-level so it can run in a worker process (see fit_partitions).
+
+    Args:
+        byte_range: (start, end) from data_loader.csv_byte_ranges()
+        csv_path: Telecom CSV
+        pipeline_state: FeaturePipeline.to_dict() of a fitted pipeline
+        target: Target column, e.g. 'Speed_Upgrades'
+        before: Only use rows dated before this date (default: all rows)
+
+    Returns:
+        LinearSufficientStats
+    """
+    df = read_dataset_csv_range(csv_path, *byte_range)
+    if before is not None:
+        df = df[df[DATE_COLUMN] < pd.Timestamp(before)].reset_index(drop=True)
+    pipeline = FeaturePipeline.from_dict(pipeline_state)
+    stats = LinearSufficientStats(len(pipeline.feature_columns))
+    if len(df):
+        stats.update(pipeline.transform(df), df[target])
+    return stats
+
+
+def fit_csv(csv_path, target, pipeline, partitions=None, max_workers=None, before=None):
+    """
+    Fit the linear model for one target of a telecom CSV, partition by partition.
+
+    The file is split into byte ranges of whole rows, and each worker parses,
+    transforms and summarizes its range.
+
+    Args:
+        csv_path: Telecom CSV
+        target: Target column, e.g. 'Speed_Upgrades'
+        pipeline: Fitted FeaturePipeline
+        partitions: Byte-range partitions (default: one per worker)
+        max_workers: Worker processes (default: one per CPU)
+        before: Only use rows dated before this date (default: all rows)
+
+    Returns:
+        LinearSufficientStats of the whole file
+    """
+    if partitions is None:
+        partitions = max_workers or os.cpu_count() or 1
+    compute = functools.partial(csv_partition_stats, csv_path=str(csv_path),
+                                pipeline_state=pipeline.to_dict(), target=target, before=before)
+    return fit_partitions(compute, csv_byte_ranges(csv_path, partitions), max_workers)
+
+
+def _triangular_factor(rows):
+    """Return the square upper-triangular R of a QR factorization of rows."""
+    width = rows.shape[1]
+    if len(rows) < width:
+        rows = np.vstack([rows, np.zeros((width - len(rows), width))])
+    return linalg.qr(rows, mode='r', check_finite=False)[0][:width]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fit the Speed_Upgrades linear model from per-partition sufficient statistics'
+    )
+    parser.add_argument('csv_file', nargs='?', default='final_dataset.csv',
+                        help='Telecom CSV (default: final_dataset.csv)')
+    parser.add_argument('--target', default='Speed_Upgrades', help='Target column (default: Speed_Upgrades)')
+    parser.add_argument('--partitions', type=int, default=None,
+                        help='Byte-range partitions (default: one per worker)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--before', default=None, help='Only use rows dated before this date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    try:
+        channels = read_dataset_csv(args.csv_file, usecols=['Channel'])
+        pipeline = FeaturePipeline().fit(channels)
+
+        partitions = args.partitions or args.workers or os.cpu_count() or 1
+        start = time.perf_counter()
+        stats = fit_csv(args.csv_file, args.target, pipeline, partitions, args.workers, args.before)
+        partitioned_ms = (time.perf_counter() - start) * 1000
+        model = stats.to_model()
+
+        df = read_dataset_csv(args.csv_file)
+        if args.before is not None:
+            df = df[df[DATE_COLUMN] < pd.Timestamp(args.before)].reset_index(drop=True)
+        reference = LinearRegression().fit(pipeline.transform(df), df[args.target])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.target}: {stats.count} records in {partitions} partitions, "
+          f"fitted in {partitioned_ms:.1f} ms")
+    print(f"  Rank: {model.rank_} of {stats.n_features}")
+    print(f"  Intercept: {model.intercept_:.6f}")
+    for feature, coef in zip(pipeline.feature_columns, model.coef_):
+        print(f"  {feature}: {coef:.6g}")
+    difference = np.max(np.abs(model.coef_ - reference.coef_) / np.maximum(np.abs(reference.coef_), 1e-300))
+    print(f"  Max relative difference from LinearRegression: {difference:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Test script for the feature engineering modules.
+
+Checks the claims the modules make against the code they replaced:
+- holiday_features.py: the vectorized features equal the old row-wise
+  get_holiday_features on the old hard-coded 2024-2025 holiday lists
+- holiday_calendar.py: the rule-based calendar reproduces the hard-coded
+  lists and known 2023 and 2026 dates, and the cached per-year tables equal
+  the features computed directly, across year boundaries
+- feature_pipeline.py: the feature matrix equals the old inline feature
+  engineering, and a saved pipeline transforms exactly like the fitted one
+- data_loader.py: the memory-mapped Feather copy loads the same records as
+  the CSV, and is rebuilt when the CSV changes or the copy is corrupt;
+  records that do not match the schema raise ValueError instead of being inferred
+- feature_store.py: the matrices built chunk by chunk equal the whole-file
+  features, and split_by_date splits exactly where a date comparison would
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = Path(__file__).resolve().parent
+TRAINING_DATA = PROJECT_DIR / 'final_dataset.csv'
+DECEMBER_DATA = PROJECT_DIR / 'test_dataset_dec_2025.csv'
+
+# The holiday lists that analyze_data_hybrid.py and predict_december_2025.py used to hard-code
+HARDCODED_HOLIDAYS = {
+    2024: ['2024-01-01', '2024-01-15', '2024-02-19', '2024-05-27', '2024-06-19', '2024-07-04',
+           '2024-09-02', '2024-10-14', '2024-11-11', '2024-11-28', '2024-12-25'],
+    2025: ['2025-01-01', '2025-01-20', '2025-02-17', '2025-05-26', '2025-06-19', '2025-07-04',
+           '2025-09-01', '2025-10-13', '2025-11-11', '2025-11-27', '2025-12-25'],
+}
+
+
+def rowwise_holiday_features(date, holidays):
+    """The old per-row get_holiday_features: (is_holiday, days_to_holiday, days_from_holiday)."""
+    is_holiday = 1 if date in holidays else 0
+    days_diff = [(holiday - date).days for holiday in holidays]
+    future_days = [d for d in days_diff if d >= 0]
+    past_days = [abs(d) for d in days_diff if d < 0]
+    return is_holiday, min(future_days) if future_days else 365, min(past_days) if past_days else 365
+
+
+def raises_value_error(call):
+    """Return True if call() raises ValueError."""
+    try:
+        call()
+    except ValueError:
+        return True
+    return False
+
+
+def holiday_features_tests():
+    """
+    Compare compute_holiday_features with the old row-wise function.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from holiday_features import HOLIDAY_FEATURE_COLUMNS, compute_holiday_features
+
+    holidays = [pd.Timestamp(day) for year in sorted(HARDCODED_HOLIDAYS) for day in HARDCODED_HOLIDAYS[year]]
+    # Every day the old lists covered, plus a margin on both sides for the 365 sentinel
+    dates = pd.Series(pd.date_range('2023-12-01', '2026-01-31', freq='D'), index=np.arange(1000, 1793))
+
+    features = compute_holiday_features(dates, holidays)
+    expected = np.array([rowwise_holiday_features(date, holidays) for date in dates])
+    results = [
+        ("Is_Holiday, Days_To_Holiday, Days_From_Holiday equal the row-wise function",
+         np.array_equal(features[['Is_Holiday', 'Days_To_Holiday', 'Days_From_Holiday']].to_numpy(), expected)),
+        ("Near_Holiday is within one day of a holiday",
+         np.array_equal(features['Near_Holiday'].to_numpy(),
+                        ((expected[:, 1] <= 1) | (expected[:, 2] <= 1)).astype(np.int64))),
+        ("Result keeps the input index and columns",
+         features.index.equals(dates.index) and list(features.columns) == HOLIDAY_FEATURE_COLUMNS),
+    ]
+
+    # Unsorted, duplicated holidays and dates outside the list
+    shuffled = holidays[::-1] + holidays[:3]
+    results.append(("Holiday order and duplicates do not matter",
+                    compute_holiday_features(dates, shuffled).equals(features)))
+    empty = compute_holiday_features(dates, [])
+    results.append(("No holidays gives the 365 sentinel everywhere",
+                    (empty['Days_To_Holiday'] == 365).all() and (empty['Days_From_Holiday'] == 365).all()
+                    and (empty['Is_Holiday'] == 0).all()))
+
+    return results
+
+
+def holiday_calendar_tests():
+    """
+    Check the rule-based calendar and its cached lookup tables.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from holiday_calendar import (
+        CALENDAR_VERSION, federal_holidays, federal_holidays_between, lookup_holiday_features, year_table,
+    )
+    from holiday_features import compute_holiday_features
+
+    def as_strings(holidays):
+        return [day.strftime('%Y-%m-%d') for day in holidays]
+
+    results = [(f"{year} holidays equal the hard-coded list", as_strings(federal_holidays(year)) == days)
+               for year, days in sorted(HARDCODED_HOLIDAYS.items())]
+    # MLK, Presidents', Memorial, Labor, Columbus and Thanksgiving move with the weekday
+    results.append(("2023 and 2026 holidays follow the weekday rules",
+                    as_strings(federal_holidays(2023)) == [
+                        '2023-01-01', '2023-01-16', '2023-02-20', '2023-05-29', '2023-06-19', '2023-07-04',
+                        '2023-09-04', '2023-10-09', '2023-11-11', '2023-11-23', '2023-12-25']
+                    and as_strings(federal_holidays(2026)) == [
+                        '2026-01-01', '2026-01-19', '2026-02-16', '2026-05-25', '2026-06-19', '2026-07-04',
+                        '2026-09-07', '2026-10-12', '2026-11-11', '2026-11-26', '2026-12-25']))
+    results.append(("Juneteenth only from 2021",
+                    '2020-06-19' not in as_strings(federal_holidays(2020))
+                    and '2021-06-19' in as_strings(federal_holidays(2021))))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        dates = pd.Series(pd.date_range('2023-01-01', '2026-12-31', freq='D'))
+        looked_up = lookup_holiday_features(dates, tmp_dir)
+        expected = compute_holiday_features(dates, federal_holidays_between(2022, 2027))
+        results.append(("Cached tables equal the directly computed features for 2023-2026",
+                        looked_up.equals(expected)))
+
+        late_december = lookup_holiday_features(pd.Series(pd.to_datetime(['2025-12-28'])), tmp_dir)
+        results.append(("Dates after Christmas 2025 count down to New Year 2026",
+                        late_december['Days_To_Holiday'].iloc[0] == 4))
+
+        table_path = Path(tmp_dir) / f'federal_2025_v{CALENDAR_VERSION}.npy'
+        cached = table_path.exists()
+        table_path.write_bytes(b'not a table')
+        year_table.cache_clear()
+        rebuilt = year_table(2025, tmp_dir)
+        results.append(("Tables are cached on disk and a corrupt table is rebuilt",
+                        cached and rebuilt.shape == (365, 3) and np.array_equal(np.load(table_path), rebuilt)))
+    finally:
+        year_table.cache_clear()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def feature_pipeline_tests():
+    """
+    Check FeaturePipeline against the old inline features and its save/load round trip.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    from data_loader import INPUT_COLUMNS, read_dataset_csv
+    from feature_pipeline import FEATURE_COLUMNS, PIPELINE_VERSION, FeaturePipeline
+
+    df = read_dataset_csv(TRAINING_DATA)
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(df.copy())
+    results = [("Matrix is C-contiguous float64 with one column per feature",
+                X.flags['C_CONTIGUOUS'] and X.dtype == np.float64 and X.shape == (len(df), len(FEATURE_COLUMNS)))]
+
+    # The inline feature engineering the scripts used before the pipeline
+    holidays = [pd.Timestamp(day) for year in sorted(HARDCODED_HOLIDAYS) for day in HARDCODED_HOLIDAYS[year]]
+    old = df.copy()
+    old['Day_of_Year'] = old['Date'].dt.dayofyear
+    old['Day_of_Week'] = old['Date'].dt.dayofweek
+    old['Month'] = old['Date'].dt.month
+    rowwise = np.array([rowwise_holiday_features(date, holidays) for date in old['Date']])
+    old['Is_Holiday'], old['Days_To_Holiday'], old['Days_From_Holiday'] = rowwise.T
+    old['Near_Holiday'] = ((old['Days_To_Holiday'] <= 1) | (old['Days_From_Holiday'] <= 1)).astype(int)
+    old['Channel_Encoded'] = LabelEncoder().fit_transform(old['Channel'].astype(str))
+    results.append(("Features equal the old inline feature engineering",
+                    np.array_equal(X, old[FEATURE_COLUMNS].to_numpy(dtype=np.float64))))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        loaded = FeaturePipeline.load(pipeline.save(Path(tmp_dir) / 'feature_pipeline.json'))
+        december = read_dataset_csv(DECEMBER_DATA, usecols=INPUT_COLUMNS)
+        results.append(("Saved pipeline transforms like the fitted one",
+                        loaded.to_dict() == pipeline.to_dict()
+                        and np.array_equal(loaded.transform(december.copy()), pipeline.transform(december.copy()))))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    raw = pd.DataFrame({'Date': ['12/01/2025', '12/02/2025'], 'Channel': ['App', 'Web'],
+                        'Emails_Sent': [0, 10], 'Push_Notifications_Sent': [5, 0]})
+    parsed = raw.assign(Date=pd.to_datetime(raw['Date'], format='%m/%d/%Y'))
+    results.append(("Date strings are parsed with the dataset format",
+                    np.array_equal(pipeline.transform(raw), pipeline.transform(parsed))
+                    and list(raw['Channel_Encoded']) == [0, 1]))
+
+    results.append(("Unseen Channel raises ValueError",
+                    raises_value_error(lambda: pipeline.transform(raw.assign(Channel='Store')))))
+    results.append(("Transform before fit raises ValueError",
+                    raises_value_error(lambda: FeaturePipeline().transform(raw.copy()))))
+    results.append(("Saved state from another version is rejected",
+                    raises_value_error(lambda: FeaturePipeline.from_dict(
+                        dict(pipeline.to_dict(), version=PIPELINE_VERSION + 1)))))
+
+    return results
+
+
+def columnar_cache_tests():
+    """
+    Check load_dataset's Feather copy against the CSV and its invalidation.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import columnar_path, load_dataset, read_dataset_csv
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = Path(tmp_dir) / 'final_dataset.csv'
+        shutil.copyfile(TRAINING_DATA, csv_path)
+        cache_dir = Path(tmp_dir) / 'columnar'
+        feather_path = columnar_path(csv_path, cache_dir)
+
+        df = load_dataset(csv_path, cache_dir)
+        results = [
+            ("First load writes the Feather copy and equals the CSV",
+             feather_path.exists() and df.equals(read_dataset_csv(csv_path))),
+            ("Columns have the fixed types",
+             pd.api.types.is_datetime64_any_dtype(df['Date'])
+             and isinstance(df['Channel'].dtype, pd.CategoricalDtype)
+             and all(df[column].dtype == np.int32 for column in
+                     ['VAS_Sold', 'Speed_Upgrades', 'Emails_Sent', 'Push_Notifications_Sent'])),
+        ]
+
+        written = feather_path.stat().st_mtime_ns
+        results.append(("Unchanged CSV reuses the Feather copy",
+                        load_dataset(csv_path, cache_dir).equals(df) and feather_path.stat().st_mtime_ns == written))
+        results.append(("Feather path loads directly", load_dataset(feather_path).equals(df)))
+
+        with open(csv_path, 'a') as f:
+            f.write('11/1/2025,App,100,200,0,0\n')
+        appended = load_dataset(csv_path, cache_dir)
+        results.append(("Appending to the CSV rebuilds the copy",
+                        len(appended) == len(df) + 1 and appended['Date'].iloc[-1] == pd.Timestamp('2025-11-01')
+                        and feather_path.stat().st_mtime_ns != written))
+
+        # Replace rather than overwrite: earlier DataFrames still map the old file
+        corrupt_path = Path(tmp_dir) / 'corrupt.feather'
+        corrupt_path.write_bytes(b'not a feather file')
+        os.replace(corrupt_path, feather_path)
+        results.append(("Corrupt Feather copy is rebuilt",
+                        load_dataset(csv_path, cache_dir).equals(appended)
+                        and load_dataset(feather_path).equals(appended)))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def schema_tests():
+    """
+    Check that read_dataset_csv and apply_schema enforce the dataset schema.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import INPUT_COLUMNS, apply_schema, read_dataset_csv
+
+    header = 'Date,Channel,VAS_Sold,Speed_Upgrades,Emails_Sent,Push_Notifications_Sent\n'
+
+    def read(rows, usecols=None):
+        return read_dataset_csv(io.StringIO(header + rows), usecols=usecols)
+
+    padded = read('09/01/2024,App,106,165,0,0\n12/01/2025,Web,30,72,1,0\n')
+    unpadded = read('9/1/2024,App,106,165,0,0\n12/1/2025,Web,30,72,1,0\n')
+    results = [
+        ("9/1/2024 and 09/01/2024 parse the same",
+         padded.equals(unpadded)
+         and list(padded['Date']) == [pd.Timestamp('2024-09-01'), pd.Timestamp('2025-12-01')]),
+        ("ISO dates raise ValueError",
+         raises_value_error(lambda: read('2024-09-01,App,106,165,0,0\n'))),
+        ("Non-integer count raises ValueError",
+         raises_value_error(lambda: read('9/1/2024,App,10.5,165,0,0\n'))),
+        ("Missing column raises ValueError",
+         raises_value_error(lambda: read_dataset_csv(io.StringIO('Date,Channel\n9/1/2024,App\n')))),
+    ]
+
+    inputs = read('9/1/2024,App,106,165,3,2\n', usecols=INPUT_COLUMNS)
+    results.append(("usecols reads only the prediction inputs",
+                    list(inputs.columns) == INPUT_COLUMNS and inputs['Emails_Sent'].dtype == np.int32))
+
+    records = apply_schema(pd.DataFrame({
+        'Date': ['9/1/2024', '12/01/2025'],
+        'Channel': ['App', 'Web'],
+        'VAS_Sold': [106, 30],
+        'Speed_Upgrades': [165, 72],
+        'Emails_Sent': [0, 1],
+        'Push_Notifications_Sent': [0, 0],
+    }))
+    results.append(("apply_schema gives in-memory records the CSV types",
+                    (records.dtypes == padded.dtypes).all() and records.equals(padded)))
+    return results
+
+
+def feature_store_tests():
+    """
+    Check the chunked feature store against the whole-file features and split_by_date.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import read_dataset_csv
+    from feature_pipeline import TARGET_COLUMNS, FeaturePipeline
+    from feature_store import build_feature_store, split_by_date
+
+    df = read_dataset_csv(TRAINING_DATA)
+    pipeline = FeaturePipeline().fit(df)
+    whole = pipeline.transform(df)
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = Path(tmp_dir) / 'final_dataset.csv'
+        shutil.copyfile(TRAINING_DATA, csv_path)
+
+        # 97 rows per chunk: chunks end mid-month and mid-year, not on a channel pair
+        store = build_feature_store(csv_path, Path(tmp_dir) / 'chunked', chunksize=97)
+        single = build_feature_store(csv_path, Path(tmp_dir) / 'single', chunksize=len(df))
+        results = [
+            ("Chunked feature matrix equals the whole-file features",
+             len(store) == len(df) and np.array_equal(store.features, whole)),
+            ("One chunk gives the same matrices",
+             np.array_equal(single.features, store.features)
+             and np.array_equal(single.targets, store.targets)),
+            ("Targets and dates match the CSV",
+             np.array_equal(store.targets, df[TARGET_COLUMNS].to_numpy())
+             and np.array_equal(store.dates, df['Date'].to_numpy().astype('datetime64[D]'))),
+            ("Store pipeline equals one fitted on the whole file",
+             store.pipeline.to_dict() == pipeline.to_dict()),
+        ]
+
+        manifest_mtime = (store.store_dir / 'manifest.json').stat().st_mtime_ns
+        reused = build_feature_store(csv_path, store.store_dir, chunksize=97)
+        results.append(("Unchanged CSV reuses the store",
+                        (reused.store_dir / 'manifest.json').stat().st_mtime_ns == manifest_mtime))
+
+        with open(csv_path, 'a') as f:
+            f.write('11/1/2025,App,100,200,0,0\n')
+        rebuilt = build_feature_store(csv_path, store.store_dir, chunksize=97)
+        results.append(("Appending to the CSV rebuilds the store",
+                        len(rebuilt) == len(df) + 1
+                        and rebuilt.dates[-1] == np.datetime64('2025-11-01')
+                        and np.array_equal(rebuilt.features[:len(df)], whole)))
+
+        train_index, test_index = store.split_by_date('2025-08-01')
+        august = df['Date'] < pd.Timestamp('2025-08-01')
+        results.append(("Sorted dates split into slices at the first day",
+                        isinstance(train_index, slice) and isinstance(test_index, slice)
+                        and train_index.stop == test_index.start == int(august.sum())
+                        and np.array_equal(store.features[test_index], whole[~august.to_numpy()])))
+        results.append(("Sliced memmap rows are views, not copies",
+                        np.shares_memory(store.features[train_index], store.features)))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    shuffled = df['Date'].sample(frac=1, random_state=0)
+    train_mask, test_mask = split_by_date(shuffled, '2025-08-01')
+    results.append(("Unsorted dates split with boolean masks",
+                    train_mask.dtype == bool
+                    and np.array_equal(train_mask, (shuffled < pd.Timestamp('2025-08-01')).to_numpy())
+                    and np.array_equal(test_mask, ~train_mask)))
+
+    edges = pd.to_datetime(pd.Series(['2025-07-31', '2025-08-01', '2025-08-01', '2025-08-02']))
+    results.append(("Split date is the first day of the second part",
+                    split_by_date(edges, '2025-08-01') == (slice(0, 1), slice(1, 4))
+                    and split_by_date(edges, '2026-01-01') == (slice(0, 4), slice(4, 4))))
+    return results
+
+
+def main():
+    print("=" * 60)
+    print("Testing feature engineering")
+    print("=" * 60)
+    print()
+
+    passed = 0
+    failed = 0
+
+    for title, tests in [
+        ("Holiday Feature Tests:", holiday_features_tests),
+        ("Holiday Calendar Tests:", holiday_calendar_tests),
+        ("Feature Pipeline Tests:", feature_pipeline_tests),
+        ("Columnar Cache Tests:", columnar_cache_tests),
+        ("Schema Tests:", schema_tests),
+        ("Feature Store Tests:", feature_store_tests),
+    ]:
+        print(title)
+        print("-" * 60)
+        for name, check in tests():
+            if check:
+                print(f"✅ {name}: PASSED")
+                passed += 1
+            else:
+                print(f"❌ {name}: FAILED")
+                failed += 1
+        print()
+
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    if failed == 0:
+        print("✅ All tests passed!")
+        sys.exit(0)
+    else:
+        print(f"❌ {failed} test(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
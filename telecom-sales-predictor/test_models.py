@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Test script for the model training and scoring modules.
+
+Checks the claims the modules make against a direct refit on the same rows:
+- model_store.py: artifact keys are stable, artifacts round-trip through
+  save/load, corrupt artifacts are retrained and old ones are pruned
+- sufficient_stats.py: merged, subtracted and partitioned statistics give
+  the coefficients of LinearRegression fitted on the same rows
+- incremental_training.py: coefficients after an update equal a full refit,
+  a day split across two appends is ingested in full, serving reuses the
+  state until rows are appended, and a rewritten training file falls back
+  to a full fit
+- compiled_forest.py: predictions equal RandomForestRegressor.predict
+  exactly, before and after a save/load round trip
+- forest_pruning.py: trees are selected on out-of-bag rows only, the saved
+  model is trained on the full history, and it is only served for the data
+  it was trained on
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+PROJECT_DIR = Path(__file__).resolve().parent
+TRAINING_DATA = PROJECT_DIR / 'final_dataset.csv'
+
+
+def relative_difference(actual, expected):
+    """Largest difference between two arrays, relative to the largest expected value."""
+    actual, expected = np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64)
+    return float(np.max(np.abs(actual - expected)) / max(np.max(np.abs(expected)), 1e-300))
+
+
+def split_history(tmp_dir, held_back):
+    """
+    Write final_dataset.csv without its last held_back rows.
+
+    Returns:
+        tuple: (path of the shortened CSV, list of held-back lines)
+    """
+    header, *rows = TRAINING_DATA.read_text().splitlines(keepends=True)
+    csv_path = Path(tmp_dir) / 'final_dataset.csv'
+    csv_path.write_text(header + ''.join(rows[:-held_back]))
+    return csv_path, rows[-held_back:]
+
+
+def matches_refit(stats, X, y):
+    """Whether statistics solve to the coefficients of LinearRegression on X, y."""
+    reference = LinearRegression().fit(X, y)
+    coef, intercept, _, _ = stats.solve()
+    return (relative_difference(coef, reference.coef_) < 1e-9
+            and abs(intercept - reference.intercept_) < 1e-9 * abs(reference.intercept_))
+
+
+def model_store_tests():
+    """
+    Exercise model_store's keys, save/load, corrupt-artifact recovery and retention.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import INPUT_COLUMNS, read_dataset_csv
+    from model_store import (
+        VAS_FOREST_PARAMS, VAS_MODEL_FILE, HybridModelArtifacts, artifact_key, hash_file, load_or_train,
+    )
+
+    # A small forest keeps the repeated training fast
+    vas_params = dict(VAS_FOREST_PARAMS, n_estimators=10)
+    data_hash = hash_file(TRAINING_DATA)
+    results = [("Artifact key is stable for the same data and parameters",
+                artifact_key(data_hash, vas_params) == artifact_key(data_hash, dict(vas_params)))]
+    results.append(("Artifact key changes with the data and the parameters",
+                    len({artifact_key(data_hash, vas_params), artifact_key('0' * 64, vas_params),
+                         artifact_key(data_hash, dict(vas_params, max_depth=10))}) == 3))
+
+    df_test = read_dataset_csv(PROJECT_DIR / 'test_dataset_dec_2025.csv', usecols=INPUT_COLUMNS)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        store_dir = Path(tmp_dir) / 'models'
+        artifacts, trained = load_or_train(TRAINING_DATA, store_dir, vas_params)
+        loaded, trained_again = load_or_train(TRAINING_DATA, store_dir, vas_params)
+        expected = artifacts.predict(df_test.copy())
+        actual = loaded.predict(df_test.copy())
+        results.append(("Saved artifact loads with identical predictions",
+                        trained and not trained_again and loaded.key == artifacts.key
+                        and all(np.array_equal(a, e) for a, e in zip(actual, expected))))
+
+        # Truncate the forest pickle, as an interrupted copy would
+        model_path = store_dir / artifacts.key / VAS_MODEL_FILE
+        model_path.write_bytes(model_path.read_bytes()[:1000])
+        _, trained = load_or_train(TRAINING_DATA, store_dir, vas_params)
+        reloaded = HybridModelArtifacts.load(artifacts.key, store_dir)
+        results.append(("Corrupt artifact is retrained and replaced",
+                        trained and np.array_equal(reloaded.predict(df_test.copy())[0], expected[0])))
+
+        # Three more configurations: only the two most recent artifacts stay
+        for depth in (6, 8, 10):
+            latest, _ = load_or_train(TRAINING_DATA, store_dir, dict(vas_params, max_depth=depth))
+        remaining = sorted(path.name for path in store_dir.iterdir())
+        previous_key = artifact_key(data_hash, dict(vas_params, max_depth=8))
+        results.append(("Only the two most recent artifacts are kept",
+                        remaining == sorted([latest.key, previous_key])))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def sufficient_stats_tests():
+    """
+    Compare sufficient_stats fits with LinearRegression on the same rows.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import read_dataset_csv
+    from feature_pipeline import FeaturePipeline
+    from sufficient_stats import LinearSufficientStats, fit_csv
+
+    df = read_dataset_csv(TRAINING_DATA)
+    pipeline = FeaturePipeline().fit(df)
+    X = pipeline.transform(df.copy())
+    y = df['Speed_Upgrades'].to_numpy()
+    months = df['Date'].dt.to_period('M').to_numpy()
+    first_month = months == months[0]
+
+    results = [("from_data equals LinearRegression", matches_refit(LinearSufficientStats.from_data(X, y), X, y))]
+
+    # One batch per month, merged in order
+    merged = LinearSufficientStats(X.shape[1])
+    for month in np.unique(months):
+        merged.merge(LinearSufficientStats.from_data(X[months == month], y[months == month]))
+    results.append(("Merged monthly statistics equal a full refit",
+                    merged.count == len(X) and matches_refit(merged, X, y)))
+
+    # Sliding window: drop the oldest month again
+    window = LinearSufficientStats.from_data(X, y).subtract(
+        LinearSufficientStats.from_data(X[first_month], y[first_month]))
+    results.append(("Subtracting a month equals a refit on the remaining rows",
+                    window.count == int((~first_month).sum())
+                    and matches_refit(window, X[~first_month], y[~first_month])))
+
+    try:
+        LinearSufficientStats.from_data(X[:5], y[:5]).subtract(LinearSufficientStats.from_data(X, y))
+        results.append(("Subtracting more rows than accumulated raises ValueError", False))
+    except ValueError:
+        results.append(("Subtracting more rows than accumulated raises ValueError", True))
+
+    train = (df['Date'] < '2025-08-01').to_numpy()
+    partitioned = fit_csv(TRAINING_DATA, 'Speed_Upgrades', pipeline, partitions=4, max_workers=1,
+                          before='2025-08-01')
+    results.append(("fit_csv over 4 byte ranges equals a refit on the training period",
+                    partitioned.count == int(train.sum()) and matches_refit(partitioned, X[train], y[train])))
+
+    return results
+
+
+def incremental_tests():
+    """
+    Exercise incremental_training.refresh against full refits.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from data_loader import read_dataset_csv
+    from incremental_training import file_position, load_or_refresh, refresh
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        state_dir = Path(tmp_dir) / 'state'
+        csv_path, held_back = split_history(tmp_dir, 20)
+
+        model, summary = refresh(csv_path, state_dir)
+        results = [("First refresh is a full fit", summary['mode'] == 'full')]
+
+        # Eight nightly appends of one day (two channels) each; the eighth
+        # passes the 50-tree cap, so windowed trees are being replaced
+        for day in range(8):
+            with open(csv_path, 'a') as f:
+                f.write(''.join(held_back[2 * day:2 * day + 2]))
+            model, summary = refresh(csv_path, state_dir)
+        results.append(("Appended rows update incrementally",
+                        summary['mode'] == 'incremental' and summary['rows_ingested'] == 2))
+
+        # The last day's two channel rows arrive in separate appends
+        for line in held_back[16:18]:
+            with open(csv_path, 'a') as f:
+                f.write(line)
+            model, summary = refresh(csv_path, state_dir)
+        results.append(("Second append of a day is ingested",
+                        summary['rows_ingested'] == 1
+                        and model.manifest['training_records'] == len(read_dataset_csv(csv_path))))
+
+        df = read_dataset_csv(csv_path)
+        X = model.pipeline.transform(df.copy())
+        reference = LinearRegression().fit(X, df['Speed_Upgrades'])
+        coef, intercept, _, _ = model.linear_stats.solve()
+        results.append(("Coefficients after updates equal a full refit",
+                        relative_difference(coef, reference.coef_) < 1e-9
+                        and abs(intercept - reference.intercept_) < 1e-9 * abs(reference.intercept_)))
+
+        windowed = model.forest.estimators_[model.base_trees:]
+        seeds = [tree.random_state for tree in windowed]
+        results.append(("Replacement trees get new seeds", len(windowed) == 50 and len(set(seeds)) == 50))
+
+        _, summary = refresh(csv_path, state_dir)
+        results.append(("No new rows leaves the state unchanged", summary['mode'] == 'unchanged'))
+
+        # Serving reuses the state while the file is unchanged and updates it on append
+        artifacts, summary = load_or_refresh(csv_path, state_dir)
+        served_position = file_position(csv_path)
+        results.append(("Serving loads the saved state without refitting",
+                        summary['mode'] == 'unchanged' and artifacts.key == model.key
+                        and served_position == (model.manifest['offset'], model.manifest['tail_sha256'])))
+        with open(csv_path, 'a') as f:
+            f.write(''.join(held_back[18:]))
+        artifacts, summary = load_or_refresh(csv_path, state_dir)
+        results.append(("Serving folds appended rows in incrementally",
+                        summary['mode'] == 'incremental' and file_position(csv_path) != served_position
+                        and artifacts.key.startswith(summary['watermark']) and artifacts.key != model.key))
+
+        # Correcting the last ingested day changes the bytes before the saved offset
+        text = csv_path.read_text()
+        csv_path.write_text(text[:-2] + '9\n')
+        model, summary = refresh(csv_path, state_dir)
+        results.append(("Rewritten file falls back to a full fit",
+                        summary['mode'] == 'full' and 'rewritten' in summary['reason']
+                        and model.manifest['training_records'] == len(df) + 2))
+
+        # A shorter file cannot be an append either
+        csv_path.write_text(''.join(text.splitlines(keepends=True)[:-4]))
+        model, summary = refresh(csv_path, state_dir)
+        results.append(("Truncated file falls back to a full fit",
+                        summary['mode'] == 'full' and model.manifest['training_records'] == len(df) - 2))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def compiled_forest_tests():
+    """
+    Compare CompiledForest predictions with RandomForestRegressor.predict.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    from compiled_forest import DEFAULT_BLOCK_ROWS, CompiledForest, scenario_grid
+    from data_loader import read_dataset_csv
+    from feature_pipeline import FeaturePipeline
+    from model_store import VAS_FOREST_PARAMS
+
+    df = read_dataset_csv(TRAINING_DATA)
+    pipeline = FeaturePipeline()
+    X = pipeline.fit_transform(df)
+    forest = RandomForestRegressor(**VAS_FOREST_PARAMS).fit(X, df['VAS_Sold'])
+    compiled = CompiledForest.from_forest(forest)
+
+    results = []
+    # One row, a forecast month, a scenario grid and more than one traversal block
+    for rows in (1, 62, 1000, DEFAULT_BLOCK_ROWS + 500):
+        grid = scenario_grid(X, rows)
+        results.append((f"{rows:,}-row batch equals RandomForestRegressor.predict",
+                        np.array_equal(compiled.predict(grid), forest.predict(grid))))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        loaded = CompiledForest.load(compiled.save(Path(tmp_dir) / 'vas_sold_forest.npz'))
+        results.append(("Save/load round trip keeps the predictions",
+                        loaded.depth == compiled.depth
+                        and np.array_equal(loaded.predict(X), forest.predict(X))))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    try:
+        compiled.predict(X[:, :-1])
+        results.append(("Wrong number of features raises ValueError", False))
+    except ValueError:
+        results.append(("Wrong number of features raises ValueError", True))
+
+    return results
+
+
+def pruning_tests():
+    """
+    Check forest_pruning's out-of-bag selection and the artifact it saves.
+
+    Returns:
+        list: (name, passed) tuples
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    from data_loader import read_dataset_csv
+    from forest_pruning import (
+        load_pruned, out_of_bag_mask, out_of_bag_metrics, prune_forest, save_pruned, train_evaluation_models,
+        train_production_models, tree_predictions,
+    )
+    from model_store import VAS_FOREST_PARAMS, HybridModelArtifacts
+
+    artifacts, X_train, y_train, X_test, y_test = train_evaluation_models(TRAINING_DATA)
+    forest = artifacts.vas_model
+    per_tree = tree_predictions(forest, X_train)
+    oob = out_of_bag_mask(forest, len(y_train))
+
+    reference = RandomForestRegressor(**VAS_FOREST_PARAMS, oob_score=True).fit(X_train, y_train)
+    full = out_of_bag_metrics(per_tree, oob, y_train, np.arange(len(per_tree)))
+    results = [("Out-of-bag R² matches scikit-learn's oob_score_",
+                full['oob_rows'] == len(y_train) and abs(full['oob_r2'] - reference.oob_score_) < 1e-9)]
+
+    pruned, report = prune_forest(forest, X_train, y_train, X_test, y_test)
+    _, without_test = prune_forest(forest, X_train, y_train)
+    results.append(("Selection does not depend on the test rows",
+                    report['tree_indices'] == without_test['tree_indices']
+                    and report['pruned']['trees'] < report['full']['trees']))
+    results.append(("Held-out test scores are reported",
+                    all('test_r2' in report[name] and 'test_rmse' in report[name] for name in ('full', 'pruned'))))
+
+    chosen = tree_predictions(forest, X_test)[report['tree_indices']]
+    results.append(("Pruned forest predicts the mean of its chosen trees",
+                    np.allclose(pruned.predict(X_test), chosen.mean(axis=0), rtol=1e-12, atol=0)))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        production, X, y = train_production_models(TRAINING_DATA)
+        production_pruned, production_report = prune_forest(production.vas_model, X, y)
+        artifact_dir = save_pruned(production, production_pruned, production_report, tmp_dir)
+        loaded = HybridModelArtifacts.load(artifact_dir.name, tmp_dir)
+        results.append(("Saved pruned model is trained on the full history",
+                        loaded.manifest['training_records'] == len(read_dataset_csv(TRAINING_DATA))
+                        and len(loaded.vas_model.estimators_) == production_report['pruned']['trees']
+                        and np.array_equal(loaded.predict_vas(X), production_pruned.predict(X))))
+
+        # Serving picks the pruned model only for the data it was trained on
+        served = load_pruned(TRAINING_DATA, tmp_dir)
+        shortened, _ = split_history(tmp_dir, 2)
+        results.append(("Pruned model is served only for its training data",
+                        served is not None and served.key == artifact_dir.name
+                        and load_pruned(shortened, tmp_dir) is None))
+
+        # With three trees some rows are in every bootstrap sample and get no out-of-bag prediction
+        small = RandomForestRegressor(**dict(VAS_FOREST_PARAMS, n_estimators=3)).fit(X, y)
+        small_pruned, small_report = prune_forest(small, X, y)
+        small_dir = save_pruned(HybridModelArtifacts(production.pipeline, small, production.upgrades_model),
+                                small_pruned, small_report, Path(tmp_dir) / 'small')
+        manifest = HybridModelArtifacts.load(small_dir.name, small_dir.parent).manifest
+        results.append(("Recorded training rows include rows without out-of-bag predictions",
+                        small_report['full']['oob_rows'] < len(y) and manifest['training_records'] == len(y)))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def main():
+    print("=" * 60)
+    print("Testing model training and scoring")
+    print("=" * 60)
+    print()
+
+    passed = 0
+    failed = 0
+
+    for title, tests in [
+        ("Model Store Tests:", model_store_tests),
+        ("Sufficient Statistics Tests:", sufficient_stats_tests),
+        ("Incremental Training Tests:", incremental_tests),
+        ("Compiled Forest Tests:", compiled_forest_tests),
+        ("Forest Pruning Tests:", pruning_tests),
+    ]:
+        print(title)
+        print("-" * 60)
+        for name, check in tests():
+            if check:
+                print(f"✅ {name}: PASSED")
+                passed += 1
+            else:
+                print(f"❌ {name}: FAILED")
+                failed += 1
+        print()
+
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    if failed == 0:
+        print("✅ All tests passed!")
+        sys.exit(0)
+    else:
+        print(f"❌ {failed} test(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for worker_pool.py
+"""
+
+import asyncio
+import sys
+import time
+
+from worker_pool import WorkerCrashed, WorkerError, WorkerPool
+
+
+def check(name, passed, detail=""):
+    """Print a test result and return whether it passed."""
+    if passed:
+        print(f"✅ {name}: PASSED")
+    else:
+        print(f"❌ {name}: FAILED {detail}")
+    return passed
+
+
+def main():
+    print("=" * 60)
+    print("Testing worker_pool.py")
+    print("=" * 60)
+    print()
+
+    results = []
+
+    # Standard library functions stand in for CLI modules
+    with WorkerPool("operator:add", size=2) as pool:
+        results.append(check("Call returns result", pool.call(2, 3) == 5))
+        results.append(check("JSON list arguments", pool.call([1], [2]) == [1, 2]))
+        results.append(check("Async call", asyncio.run(pool.acall(10, 5)) == 15))
+
+    with WorkerPool("os:getpid", size=1, max_jobs=3) as pool:
+        pids = [pool.call() for _ in range(4)]
+        results.append(check("Worker reused between jobs", pids[0] == pids[1] == pids[2], pids))
+        results.append(check("Worker recycled after max_jobs", pids[3] != pids[2], pids))
+
+    with WorkerPool("math:sqrt", size=1) as pool:
+        try:
+            pool.call(-1)
+            results.append(check("Remote exception raised", False))
+        except WorkerError as e:
+            results.append(check("Remote exception raised", e.error_type == "ValueError", e.error_type))
+        results.append(check("Worker survives remote exception", pool.call(9) == 3.0))
+
+    with WorkerPool("time:sleep", size=1) as pool:
+        start = time.time()
+        try:
+            pool.call(5, timeout=0.5)
+            results.append(check("Timeout kills worker", False))
+        except WorkerCrashed as e:
+            results.append(check("Timeout kills worker", time.time() - start < 3 and e.error_type == "TimeoutError"))
+        results.append(check("Pool recovers after timeout", pool.call(0) is None))
+
+        # The caller sees EOF while the timer thread is still inside kill()
+        error_types = []
+        for _ in range(10):
+            try:
+                pool.call(5, timeout=0.05)
+            except WorkerCrashed as e:
+                error_types.append(e.error_type)
+        results.append(check("Every timeout reported as TimeoutError",
+                             error_types == ["TimeoutError"] * 10, error_types))
+
+    with WorkerPool("os:_exit", size=1) as pool:
+        try:
+            pool.call(1)
+            results.append(check("Crash reported", False))
+        except WorkerCrashed:
+            results.append(check("Crash reported", True))
+
+    # Preforking: a warm call should be far cheaper than interpreter startup
+    with WorkerPool("operator:mul", size=1) as pool:
+        pool.call(1, 1)
+        start = time.perf_counter()
+        for i in range(200):
+            pool.call(i, 2)
+        per_call_ms = (time.perf_counter() - start) / 200 * 1000
+        print(f"   Average warm call: {per_call_ms:.3f} ms")
+        results.append(check("Warm calls avoid interpreter startup", per_call_ms < 10))
+
+    passed = sum(results)
+    failed = len(results) - passed
+    print()
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    if failed == 0:
+        print("✅ All tests passed!")
+        sys.exit(0)
+    else:
+        print(f"❌ {failed} test(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Prefork worker pool for servers that wrap Python CLI scripts.
+
+Instead of starting a fresh interpreter for every request, the pool keeps N
+worker processes that have already imported the target module. Each request
+is sent to an idle worker over its stdin pipe and the reply is read from its
+stdout pipe. Both directions use length-prefixed frames:
+
+    4-byte big-endian payload length | UTF-8 JSON payload
+
+    request:  {"args": [...], "kwargs": {...}}
+    response: {"ok": true, "result": ...}
+              {"ok": false, "error_type": "ValueError", "error": "message"}
+
+Workers keep the CLI's process isolation (a crash or leak only affects one
+worker) and are recycled after a fixed number of jobs.
+
+Usage:
+    pool = WorkerPool("calculator:calculate", size=2, max_jobs=1000, cwd=SCRIPT_DIR)
+    pool.start()
+    pool.call("add", 1, 2)          # 3.0
+    await pool.acall("add", 1, 2)   # from async handlers
+"""
+
+import asyncio
+import functools
+import importlib
+import json
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+HEADER = struct.Struct(">I")
+# Refuse frames larger than this, so a corrupt header cannot trigger a huge read
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class WorkerError(Exception):
+    """
+    A job failed in a worker.
+
+    Attributes:
+        error_type: Name of the exception class raised in the worker
+    """
+
+    def __init__(self, message, error_type="WorkerError"):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class WorkerCrashed(WorkerError):
+    """The worker process exited (or was killed) before replying."""
+
+
+def write_frame(stream, payload):
+    """Write one length-prefixed JSON frame and flush."""
+    data = json.dumps(payload).encode("utf-8")
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def _read_exact(stream, size):
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream):
+    """
+    Read one length-prefixed JSON frame.
+
+    Returns:
+        The decoded payload, or None at end of stream
+
+    Raises:
+        ValueError: If the frame is larger than MAX_FRAME_BYTES
+    """
+    header = _read_exact(stream, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+    data = _read_exact(stream, size)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def resolve_target(target):
+    """Import and return the function named by a "module:function" string."""
+    module_name, _, function_name = target.partition(":")
+    if not function_name:
+        raise ValueError(f"Target must look like 'module:function', got {target!r}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def serve(target):
+    """
+    Worker process entry point: answer frames on stdin until it closes.
+
+    Args:
+        target: "module:function" to import once and call for every request
+    """
+    protocol_in = sys.stdin.buffer
+    protocol_out = sys.stdout.buffer
+    # Anything the target prints must not corrupt the protocol stream
+    sys.stdout = sys.stderr
+
+    sys.path.insert(0, os.getcwd())
+    function = resolve_target(target)
+
+    while True:
+        request = read_frame(protocol_in)
+        if request is None:
+            break
+        try:
+            result = function(*request.get("args", []), **request.get("kwargs", {}))
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error_type": type(e).__name__, "error": str(e)}
+        write_frame(protocol_out, response)
+
+
+class _Worker:
+    """One preforked worker process and its job count."""
+
+    def __init__(self, target, cwd, python):
+        self.process = subprocess.Popen(
+            [python, str(Path(__file__).resolve()), target],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd,
+        )
+        self.jobs = 0
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def kill(self):
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
+    def close(self):
+        """Ask the worker to exit by closing its stdin, killing it if it lingers."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of preforked Python workers.
+
+    Args:
+        target: "module:function" the workers import once and call per request
+        size: Number of worker processes
+        max_jobs: Jobs a worker runs before it is replaced with a fresh one
+        cwd: Working directory of the workers (also put on their sys.path)
+        python: Interpreter used for the workers
+    """
+
+    def __init__(self, target, size=2, max_jobs=1000, cwd=None, python=sys.executable):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.target = target
+        self.size = size
+        self.max_jobs = max_jobs
+        self.cwd = str(cwd) if cwd is not None else None
+        self.python = python
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _spawn(self):
+        return _Worker(self.target, self.cwd, self.python)
+
+    def start(self):
+        """Prefork the workers. Called automatically by the first call()."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+            self._started = True
+
+    def call(self, *args, timeout=None, **kwargs):
+        """
+        Run the target function in an idle worker.
+
+        Blocks until a worker is free. Arguments and the result must be
+        JSON-serializable.
+
+        Args:
+            *args, **kwargs: Passed to the target function
+            timeout: Seconds before the worker is killed and the call fails
+
+        Returns:
+            The target function's return value
+
+        Raises:
+            WorkerError: If the target raised (error_type names the exception)
+            WorkerCrashed: If the worker died or was killed on timeout
+        """
+        self.start()
+        worker = self._idle.get()
+        timer = None
+        timed_out = threading.Event()
+        try:
+            if not worker.alive():
+                worker = self._spawn()
+            if timeout is not None:
+                timer = threading.Timer(timeout, self._expire, (worker, timed_out))
+                timer.start()
+            try:
+                write_frame(worker.process.stdin, {"args": list(args), "kwargs": kwargs})
+                response = read_frame(worker.process.stdout)
+            except (OSError, ValueError):
+                response = None
+            worker.jobs += 1
+
+            if response is None:
+                worker.kill()
+                if timed_out.is_set():
+                    raise WorkerCrashed(f"Worker timed out after {timeout} seconds", "TimeoutError")
+                raise WorkerCrashed("Worker exited before replying")
+            if not response.get("ok"):
+                raise WorkerError(response.get("error", ""), response.get("error_type", "WorkerError"))
+            return response.get("result")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._release(worker)
+
+    @staticmethod
+    def _expire(worker, timed_out):
+        """Timer callback: flag the call as timed out before killing its worker."""
+        # Set first, so the caller sees the flag as soon as the kill closes the pipe
+        timed_out.set()
+        worker.kill()
+
+    def _release(self, worker):
+        """Return a worker to the idle queue, replacing it if it died or reached max_jobs."""
+        with self._lock:
+            if not self._started:
+                # The pool was closed while this job ran
+                worker.close()
+                return
+            if not worker.alive():
+                worker = self._spawn()
+            elif self.max_jobs and worker.jobs >= self.max_jobs:
+                worker.close()
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    async def acall(self, *args, timeout=None, **kwargs):
+        """Awaitable call() that runs the blocking pipe I/O in a thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.call, *args, timeout=timeout, **kwargs)
+        )
+
+    def close(self):
+        """Stop all workers. Workers busy with a call are stopped when it finishes."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: worker_pool.py module:function", file=sys.stderr)
+        sys.exit(2)
+    serve(sys.argv[1])